@@ -1,6 +1,14 @@
+"""
+Streamlit front end – a thin client of the research service:
 
+    python -m web_research_agent.service &      # loads the models once
+    streamlit run app.py                        # SERVICE_URL points at it
+"""
+import json
+
+import requests
 import streamlit as st
-from web_research_agent.orchestrator import run_research_pipeline
+from web_research_agent.config import SERVICE_URL
 
 st.set_page_config(page_title="Web Research Agent", layout="wide")
 
@@ -15,13 +23,56 @@ query = st.text_input("Your question:", placeholder="e.g. Economic impact of ele
 do_news = st.checkbox("Include recent news feeds", value=True)
 
 if st.button("Run research") and query.strip():
-    with st.spinner("Working… this may take ~30 s on first run (model download)."):
-        result = run_research_pipeline(query.strip(), use_news=do_news)
+    status = st.empty()
+    st.subheader("📑 Sources")
+    sources = st.container()
+    result = None
+    # render each stage as the service streams it
+    try:
+        resp = requests.get(f"{SERVICE_URL}/stream", params={"q": query.strip(), "news": int(do_news)},
+                            stream=True, timeout=(5, 300))
+    except requests.ConnectionError:
+        st.error(f"Research service not reachable at {SERVICE_URL}.")
+        st.stop()
+    if resp.status_code in (429, 503):
+        st.warning(f"The service is busy ({resp.json()['error']}); try again in "
+                   f"{resp.headers.get('Retry-After', 'a few')} seconds.")
+        st.stop()
+    resp.raise_for_status()
+    for line in resp.iter_lines():
+        if not line:
+            continue
+        event = json.loads(line)
+        kind, data = event["kind"], event["data"]
+        if kind == "plan":
+            status.info(f"Intent: {data['intent']} · searching {len(data['sub_queries'])} sub-queries…")
+        elif kind == "hits":
+            status.info(f"Reading {len(data['hits'])} sources…")
+        elif kind == "summary":
+            # citation numbers are assigned in the final report, so none here
+            sources.markdown(f"**[{data['title']}]({data['url']})**  \n{data['summary']}")
+        elif kind == "contradictions":
+            status.info("Writing report…")
+        elif kind == "report":
+            result = data
+        elif kind == "error":
+            st.error(f"Research failed: {data['error']}")
+            st.stop()
+    status.empty()
+    if result is None:
+        st.error("The service closed the stream before the report arrived.")
+        st.stop()
+
     st.subheader("📄 Report")
     st.write(result["report"])
+    synth = result.get("synth_stats") or {}
+    st.caption(
+        f"{result['latency_ms'] / 1000:.1f} s end-to-end"
+        + (f" · synthesis {synth['ms'] / 1000:.1f} s at {synth['tok_per_s']} tok/s" if synth else "")
+    )
     st.download_button(
         label="Download execution trace (JSON)",
-        data=open(result["trace_path"], "rb").read(),
+        data=json.dumps(result["trace"], indent=2),
         file_name="execution_trace.json",
         mime="application/json"
     )
@@ -0,0 +1,123 @@
+"""
+Numeric-claim conflicts over a fixture corpus: old summary regex vs `ClaimIndex`.
+
+    python benchmarks/bench_claims.py [--n 50 200 800] [--facts 40] [--chars 8000]
+
+Each fixture article is filler text with figures planted from a fixed pool of
+facts ("<subject> was <value> <unit> in <year>"); a quarter of the sources
+misstate some of them.  Reported per corpus size: the old scan (3+-digit
+numbers repeated across the three-sentence summaries), extraction over full
+text, the keyed conflict pass against an all-pairs comparison of the same
+claims, a second pass over the same texts (session reuse), and how many of
+the planted disagreements were found.
+"""
+import argparse, random, re, sys, time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from web_research_agent.agents.claims import ClaimIndex, _agree, _label, extract  # noqa: E402
+
+_FILLER = ("economy energy market growth policy electric vehicle battery europe china price demand supply "
+           "analyst report rose fell quarter government industry consumer network output").split()
+_SUBJECTS = ("solar capacity", "battery price", "wind output", "grid investment", "heat pump sales",
+             "charging points", "coal imports", "hydrogen demand", "nuclear share", "carbon price")
+_UNITS = ("%", " gigawatts", " million tonnes", " billion dollars", " units")
+
+
+def _facts(rng: random.Random, n: int) -> List[Tuple[str, float, str, int]]:
+    return [(f"{rng.choice(_SUBJECTS)} {rng.choice(('europe', 'china', 'india', 'brazil', 'japan'))}",
+             round(rng.uniform(2, 900), 1), rng.choice(_UNITS), rng.randint(2015, 2024)) for _ in range(n)]
+
+
+def _article(rng: random.Random, facts, chars: int, liar: bool) -> Tuple[str, Set[int]]:
+    out, n, wrong = [], 0, set()
+    while n < chars:
+        words = [rng.choice(_FILLER) for _ in range(rng.randint(6, 20))]
+        if rng.random() < 0.35:
+            k = rng.randrange(len(facts))
+            subject, value, unit, year = facts[k]
+            if liar and rng.random() < 0.3:
+                value, wrong = round(value * rng.choice((0.7, 1.4)), 1), wrong | {k}
+            words.append(f"while {subject.split()[1]} {subject.split()[0]} was {value}{unit} in {year}")
+        s = " ".join(words).capitalize() + ". "
+        out.append(s)
+        n += len(s)
+    return "".join(out), wrong
+
+
+def _old(summaries: List[str]) -> Dict[str, List[int]]:
+    seen = defaultdict(list)
+    for i, s in enumerate(summaries):
+        for num in re.findall(r"\b\d{3,}\b", s):
+            seen[num].append(i)
+    return {k: v for k, v in seen.items() if len(v) > 1}
+
+
+def _pairwise(per_source: List[list], tolerance: float) -> int:
+    """Every claim against every claim of every other source – the quadratic baseline."""
+    keys = set()
+    for i, a_claims in enumerate(per_source):
+        for b_claims in per_source[i + 1:]:
+            for a in a_claims:
+                for b in b_claims:
+                    if a.key == b.key and not _agree(a.value, b.value, tolerance):
+                        keys.add(a.key)
+    return len(keys)
+
+
+def run(n: int, n_facts: int, chars: int, seed: int = 0):
+    rng = random.Random(seed)
+    facts = _facts(rng, n_facts)
+    docs = [_article(rng, facts, chars, liar=rng.random() < 0.25) for _ in range(n)]
+    texts = [t for t, _ in docs]
+    planted = set().union(*(w for _, w in docs))
+
+    t0 = time.perf_counter()
+    _old([t[:400] for t in texts])                  # roughly a three-sentence summary
+    old_ms = (time.perf_counter() - t0) * 1000
+
+    idx = ClaimIndex()
+    t0 = time.perf_counter()
+    per_source = [idx.claims(t) for t in texts]
+    extract_ms = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    found = idx.conflicts((str(i), str(i), t) for i, t in enumerate(texts))
+    keyed_ms = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    idx.conflicts((str(i), str(i), t) for i, t in enumerate(texts))
+    again_ms = (time.perf_counter() - t0) * 1000
+
+    pair_ms = None
+    if n <= 400:                                    # beyond that the baseline takes minutes
+        t0 = time.perf_counter()
+        pairs = _pairwise(per_source, idx.tolerance)
+        pair_ms = (time.perf_counter() - t0) * 1000
+        assert pairs >= len(found)
+
+    # a planted misstatement is caught when its fact's key is reported
+    want = {_label(extract(f"{s.split()[1]} {s.split()[0]} was {v}{u} in {y}.")[0].key)
+            for k, (s, v, u, y) in enumerate(facts) if k in planted}
+    got = want & found.keys()
+    claims = sum(map(len, per_source))
+    print(f"{n:>5} sources {claims:>7} claims   old {old_ms:6.1f} ms   extract {extract_ms:8.1f} ms   "
+          f"keyed {keyed_ms:7.1f} ms   reuse {again_ms:6.1f} ms   "
+          + (f"pairwise {pair_ms:9.1f} ms   " if pair_ms is not None else "pairwise        –      ")
+          + f"planted {len(want)}  caught {len(got)}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, nargs="+", default=[50, 200, 800])
+    ap.add_argument("--facts", type=int, default=40, help="distinct planted figures")
+    ap.add_argument("--chars", type=int, default=8_000, help="characters per article")
+    args = ap.parse_args()
+    extract("warm up 1.5% regex caches in 2020.")
+    for n in args.n:
+        run(n, args.facts, args.chars)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Streaming vs full-tree article extraction.
+
+    python benchmarks/bench_extract.py [--mb 4]
+
+Each mode runs in its own subprocess so peak RSS is not shared.
+"""
+import argparse, json, resource, subprocess, sys, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _page(mb: float) -> str:
+    para = "<p>" + "Lorem ipsum dolor sit amet, <b>consectetur</b> adipiscing elit. " * 6 + "</p>\n"
+    noise = "<div class='ad'><span>sponsored</span><a href='#'>link</a></div>\n"
+    block = para + noise
+    return "<html><body>" + block * int(mb * 1024 * 1024 / len(block)) + "</body></html>"
+
+
+def _child(mode: str, mb: float):
+    from web_research_agent.config import MAX_CHARS
+    from web_research_agent.tools.scraper_tool import _ParagraphParser, extract_paragraphs
+
+    html = _page(mb)
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    if mode == "bs4":
+        out = extract_paragraphs(html)
+    else:
+        parser = _ParagraphParser(MAX_CHARS)
+        for i in range(0, len(html), 16_384):
+            parser.feed(html[i:i + 16_384])
+            if parser.full:
+                break
+        out = parser.finish()
+    secs = time.perf_counter() - t0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"mode": mode, "ms": round(secs * 1000, 2),
+                      "peak_rss_delta_kb": peak - base, "chars": len(out)}))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--mb", type=float, default=4.0)
+    ap.add_argument("--child")
+    args = ap.parse_args()
+    if args.child:
+        return _child(args.child, args.mb)
+
+    rows = []
+    for mode in ("bs4", "stream"):
+        out = subprocess.run([sys.executable, __file__, "--child", mode, "--mb", str(args.mb)],
+                             capture_output=True, text=True, check=True).stdout
+        rows.append(json.loads(out))
+    for r in rows:
+        print(f"{r['mode']:>6}: {r['ms']:>9.2f} ms   peak RSS +{r['peak_rss_delta_kb']:>7} KB   {r['chars']} chars")
+    print(f"speed-up ×{rows[0]['ms'] / rows[1]['ms']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Cold-start cost: `python -X importtime` per entry point, plus one cold query.
+
+    python benchmarks/bench_import.py [--repeat 5] [--modules web_research_agent.orchestrator …]
+        [--no-query] [--out results.json] [--compare previous.json]
+
+Each module is imported in a fresh interpreter `--repeat` times; the median
+total import time is reported with the heaviest top-level packages and which
+heavy dependencies (spaCy, torch, transformers, duckduckgo_search,
+feedparser, bs4) were pulled in.  The cold query runs one short
+`use_news=False` question against the local stand-in in a fresh process and
+reports its wall time and the heavy modules it loaded (torch and transformers
+must not be among them).
+"""
+import argparse, json, os, statistics, subprocess, sys, tempfile, time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY = ("spacy", "torch", "transformers", "duckduckgo_search", "feedparser", "bs4", "numpy", "requests")
+MODULES = ("web_research_agent", "web_research_agent.orchestrator", "web_research_agent.service",
+           "web_research_agent.__main__")
+
+_COLD_QUERY = """
+import json, os, sys, time
+sys.path.insert(0, {root!r})
+from benchmarks.standin import StandIn
+si = StandIn().start()
+os.environ.update(si.env())
+os.environ.update({{"CACHE_DIR": {tmp!r}, "TRACE_DIR": {tmp!r}, "REPORT_CACHE": "0"}})
+t0 = time.perf_counter()
+from web_research_agent.orchestrator import run_research_pipeline
+t1 = time.perf_counter()
+res = run_research_pipeline("how do heat pumps work", use_news=False, max_summaries=1)
+t2 = time.perf_counter()
+si.stop()
+print(json.dumps({{"import_ms": (t1 - t0) * 1000, "query_ms": (t2 - t1) * 1000,
+                  "report_chars": len(res["report"]),
+                  "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def importtime(module: str) -> dict:
+    """One fresh `-X importtime` run: total ms, ms per top-level package, heavy modules seen."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, cwd=ROOT, env={**os.environ, "PYTHONPATH": str(ROOT)})
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    total, per_pkg, seen = 0, {}, set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        mod = name.strip()
+        seen.add(mod.split(".")[0])
+        if "." not in mod and mod != "web_research_agent":
+            per_pkg[mod] = int(cumulative) / 1000          # a package's own cost, wherever it was imported
+        if not name.startswith("  "):                      # nested lines are in their parent's cumulative
+            total += int(cumulative)
+    return {"total_ms": total / 1000, "packages_ms": per_pkg, "heavy": [m for m in HEAVY if m in seen]}
+
+
+def cold_query(env: dict = None) -> dict:
+    with tempfile.TemporaryDirectory(prefix="bench_import_") as tmp:
+        code = _COLD_QUERY.format(root=str(ROOT), tmp=tmp, heavy=HEAVY)
+        proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT,
+                              env={**os.environ, **(env or {})})
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(args) -> dict:
+    modules = {}
+    for mod in args.modules:
+        runs = [importtime(mod) for _ in range(args.repeat)]
+        pkgs = defaultdict(list)
+        for r in runs:
+            for k, v in r["packages_ms"].items():
+                pkgs[k].append(v)
+        top = sorted(((k, statistics.median(v)) for k, v in pkgs.items()), key=lambda kv: -kv[1])[:args.top]
+        modules[mod] = {"median_ms": round(statistics.median(r["total_ms"] for r in runs), 1),
+                        "min_ms": round(min(r["total_ms"] for r in runs), 1),
+                        "top": [{"package": k, "ms": round(v, 1)} for k, v in top],
+                        "heavy": runs[0]["heavy"]}
+    return {
+        "meta": {"when": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0],
+                 "repeat": args.repeat},
+        "modules": modules,
+        "cold_query": None if args.no_query else cold_query(),
+    }
+
+
+def _print(res: dict, old: dict = None):
+    olds = (old or {}).get("modules", {})
+    for mod, m in res["modules"].items():
+        was = olds.get(mod, {}).get("median_ms")
+        print(f"{mod:<34} {m['median_ms']:8.1f} ms" + (f" ({(m['median_ms'] - was) / was * 100:+.0f}%)" if was else "")
+              + f"   heavy: {', '.join(m['heavy']) or '-'}")
+        print("    " + "  ".join(f"{t['package']} {t['ms']:.0f}" for t in m["top"]))
+    q = res["cold_query"]
+    if q:
+        print(f"cold query: import {q['import_ms']:.0f} ms + first report {q['query_ms']:.0f} ms   "
+              f"heavy: {', '.join(q['heavy'])}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module")
+    ap.add_argument("--modules", nargs="+", default=list(MODULES))
+    ap.add_argument("--top", type=int, default=6, help="heaviest packages listed per module")
+    ap.add_argument("--no-query", action="store_true", help="skip the cold stand-in query")
+    ap.add_argument("--out", default=f"bench_import_{time.strftime('%Y%m%d-%H%M%S')}.json")
+    ap.add_argument("--compare", help="earlier results JSON to diff against")
+    args = ap.parse_args()
+
+    res = run(args)
+    Path(args.out).write_text(json.dumps(res, indent=2))
+    _print(res, json.loads(Path(args.compare).read_text()) if args.compare else None)
+    print(f"results → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
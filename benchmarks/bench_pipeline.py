@@ -0,0 +1,151 @@
+"""
+End-to-end pipeline benchmark against the local stand-in (no internet).
+
+    python benchmarks/bench_pipeline.py [--runs 2] [--concurrency 1 4 8]
+        [--latency-ms 60] [--error-rate 0.02] [--model] [--cache]
+        [--out results.json] [--compare previous.json]
+
+Reports per-stage p50/p95 (from the trace spans), end-to-end p50/p95,
+queries per second at each concurrency level and peak RSS, and writes
+everything as JSON so runs can be diffed over time.  Without --model the
+T5 fusion step is replaced by plain concatenation, so the numbers cover
+everything but the model (which needs its weights downloaded).
+"""
+import argparse, json, logging, os, platform, resource, subprocess, sys, tempfile, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.standin import QUERIES, StandIn  # noqa: E402
+
+KINDS = ("search", "wiki", "rss", "article")
+
+
+def _pcts(values):
+    from web_research_agent.tracing import percentile
+    vals = sorted(values)
+    return {"n": len(vals), "p50_ms": percentile(vals, 0.50), "p95_ms": percentile(vals, 0.95), "max_ms": vals[-1]}
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent).stdout.strip()
+    except OSError:
+        return ""
+
+
+def _rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss     # KB on Linux
+
+
+class _Concat:
+    """Stand-in for the T5 engine: fuse by concatenation."""
+
+    def summarise(self, pieces, stats=None):
+        return " ".join(pieces)
+
+
+def run(args) -> dict:
+    si = StandIn(latency_ms=dict.fromkeys(KINDS, args.latency_ms),
+                 error_rate=dict.fromkeys(KINDS, args.error_rate), seed=args.seed).start()
+    tmp = tempfile.mkdtemp(prefix="bench_pipeline_")
+    # config is read at import time, so the overrides go in before the package is imported
+    os.environ.update(si.env())
+    os.environ.update({"TRACE_DIR": tmp, "TRACE_SAMPLE": "0", "CACHE_DIR": tmp,
+                       "HTTP_CACHE": "1" if args.cache else "0",
+                       # every run must do the work: no answers from the report cache or corpus
+                       "REPORT_CACHE": "0", "CORPUS": "0",
+                       # every stand-in page shares one host; don't let the per-host cap serialise them
+                       "FETCH_PER_HOST": os.environ.get("FETCH_PER_HOST", os.environ.get("FETCH_WORKERS", "8"))})
+    from web_research_agent import orchestrator, tracing
+    from web_research_agent.agents import synthesizer
+
+    if not args.model:
+        synthesizer._engine = _Concat()
+    # concurrent queries all hit one host, well past the per-host pool size
+    logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
+    rss_base = _rss_kb()
+
+    def one(q):
+        t0 = time.perf_counter()
+        orchestrator.run_research_pipeline(q, use_news=not args.no_news)
+        return (time.perf_counter() - t0) * 1000
+
+    one(QUERIES[0])                                  # warm-up: models, pools, news index
+    tracing._sink = tracing.JsonlSink(Path(tmp) / "sequential")
+    e2e = [one(q) for _ in range(args.runs) for q in QUERIES]
+    stages = tracing.stage_latency(tracing.load_traces(tracing.get_sink().files()))
+    stages.pop("total", None)
+
+    conc = []
+    for workers in args.concurrency:
+        n = max(len(QUERIES), workers * 2) * args.runs
+        qs = [QUERIES[i % len(QUERIES)] for i in range(n)]
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            lat = list(pool.map(one, qs))
+        wall = time.perf_counter() - t0
+        conc.append({"workers": workers, "queries": n, "qps": round(n / wall, 3), **_pcts(lat)})
+    si.stop()
+
+    return {
+        "meta": {"when": time.strftime("%Y-%m-%dT%H:%M:%S"), "git": _git_rev(),
+                 "python": platform.python_version(), "machine": platform.machine(),
+                 "queries": len(QUERIES), **{k: v for k, v in vars(args).items() if k not in ("out", "compare")}},
+        "end_to_end": _pcts(e2e),
+        "stages": stages,
+        "concurrency": conc,
+        "peak_rss_kb": _rss_kb(),
+        "rss_growth_kb": _rss_kb() - rss_base,
+        "standin": {"requests": dict(si.hits), "errors": dict(si.errors)},
+    }
+
+
+def _print(res: dict, old: dict = None):
+    def delta(new, key, path):
+        if not old:
+            return ""
+        ref = old
+        for p in path:
+            ref = ref.get(p, {}) if isinstance(ref, dict) else {}
+        was = ref.get(key) if isinstance(ref, dict) else None
+        return f" ({(new - was) / was * 100:+.0f}%)" if was else ""
+
+    e = res["end_to_end"]
+    print(f"end-to-end  p50 {e['p50_ms']:8.1f} ms{delta(e['p50_ms'], 'p50_ms', ['end_to_end'])}"
+          f"   p95 {e['p95_ms']:8.1f} ms{delta(e['p95_ms'], 'p95_ms', ['end_to_end'])}")
+    for name, s in sorted(res["stages"].items(), key=lambda kv: -kv[1]["p50_ms"]):
+        print(f"  {name:<15} n={s['count']:<4} p50 {s['p50_ms']:8.1f} ms{delta(s['p50_ms'], 'p50_ms', ['stages', name])}"
+              f"   p95 {s['p95_ms']:8.1f} ms")
+    olds = {c["workers"]: c for c in (old or {}).get("concurrency", [])}
+    for c in res["concurrency"]:
+        was = olds.get(c["workers"], {}).get("qps")
+        print(f"workers {c['workers']:>3}: {c['qps']:6.2f} q/s" + (f" ({(c['qps'] - was) / was * 100:+.0f}%)" if was else "")
+              + f"   p50 {c['p50_ms']:8.1f} ms   p95 {c['p95_ms']:8.1f} ms")
+    print(f"peak RSS {res['peak_rss_kb'] / 1024:.0f} MB   stand-in {res['standin']}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=2, help="passes over the query set")
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    ap.add_argument("--latency-ms", type=float, default=60.0, help="mean injected latency per request")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fraction of stand-in requests failed")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--model", action="store_true", help="run the real T5 fusion step")
+    ap.add_argument("--cache", action="store_true", help="keep the HTTP cache on")
+    ap.add_argument("--no-news", action="store_true")
+    ap.add_argument("--out", default=f"bench_pipeline_{time.strftime('%Y%m%d-%H%M%S')}.json")
+    ap.add_argument("--compare", help="earlier results JSON to diff against")
+    args = ap.parse_args()
+
+    res = run(args)
+    Path(args.out).write_text(json.dumps(res, indent=2))
+    _print(res, json.loads(Path(args.compare).read_text()) if args.compare else None)
+    print(f"results → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
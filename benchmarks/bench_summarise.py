@@ -0,0 +1,57 @@
+"""
+Per-article `summarise` loop (original algorithm) vs batched `summarise_many`.
+
+    python benchmarks/bench_summarise.py [--n 10 50 100] [--procs 1]
+"""
+import argparse, random, sys, time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from web_research_agent.agents import analyzer  # noqa: E402
+
+
+def _original(text: str, max_sentences: int = 3) -> str:
+    doc = analyzer._nlp(text)
+    sents = [s.text for s in doc.sents]
+    if len(sents) <= max_sentences:
+        return text
+    freq = Counter(tok.text.lower() for tok in doc if tok.is_alpha and not tok.is_stop)
+    scored = [(sum(freq.get(w.lower(), 0) for w in sent.split()), sent) for sent in sents]
+    top = sorted(scored, key=lambda x: x[0], reverse=True)[:max_sentences]
+    return " ".join(sent for _, sent in sorted(top, key=lambda x: sents.index(x[1])))
+
+
+def _article(rng: random.Random, chars: int = 8_000) -> str:
+    words = ("economy energy market growth policy electric vehicle battery europe china price "
+             "demand supply analyst report percent rose fell year quarter government").split()
+    out, n = [], 0
+    while n < chars:
+        s = " ".join(rng.choice(words) for _ in range(rng.randint(6, 22))).capitalize() + ". "
+        out.append(s)
+        n += len(s)
+    return "".join(out)[:chars]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, nargs="+", default=[10, 50, 100])
+    ap.add_argument("--procs", type=int, default=1)
+    args = ap.parse_args()
+    rng = random.Random(0)
+    analyzer.summarise_many([_article(rng)])          # warm spaCy caches
+    for n in args.n:
+        texts = [_article(rng) for _ in range(n)]
+        t0 = time.perf_counter()
+        old = [_original(t) for t in texts]
+        t1 = time.perf_counter()
+        new = analyzer.summarise_many(texts, n_process=args.procs)
+        t2 = time.perf_counter()
+        assert old == new
+        print(f"{n:>4} articles: loop {1000 * (t1 - t0):8.1f} ms   batch {1000 * (t2 - t1):8.1f} ms   "
+              f"×{(t1 - t0) / (t2 - t1):.2f}")
+
+
+if __name__ == "__main__":
+    main()
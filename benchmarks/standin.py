@@ -0,0 +1,232 @@
+"""
+Local stand-in for the web the agent talks to, for offline benchmarks/tests.
+
+    /html/?q=…            DuckDuckGo HTML results   (fixtures/ddg*.html)
+    /w/api.php?srsearch=… Wikipedia search JSON     (fixtures/wiki_search.json)
+    /wiki/<title>         Wikipedia-style article
+    /rss/<name>.xml       RSS 2.0 feed              (fixtures/feed*.xml)
+    /a/<slug>, /news/<slug>  article pages          (fixtures/article.html)
+
+Responses are rendered from the recorded fixtures; article text is generated
+deterministically from the URL, so every run sees the same bytes.  Each kind
+(search / wiki / rss / article) has its own injected latency and error rate.
+`StandIn.env()` gives the config overrides that point the tools at it.
+
+    python benchmarks/standin.py --port 8765 --latency-ms 80 --error-rate 0.05
+"""
+import argparse, html, json, random, re, sys, threading, time, urllib.parse, zlib
+from collections import Counter
+from email.utils import formatdate
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from string import Template
+from typing import Dict, List, Optional
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+QUERIES: List[str] = json.loads((FIXTURES / "queries.json").read_text())
+FEEDS = ("world", "business", "technology")
+
+_T = {name: Template((FIXTURES / name).read_text()) for name in
+      ("ddg.html", "ddg_result.html", "feed.xml", "feed_item.xml", "article.html")}
+_WIKI = json.loads((FIXTURES / "wiki_search.json").read_text())
+
+_STATUS = {"search": 429, "wiki": 503, "rss": 500, "article": 503}
+_VOCAB = ("analysts report market growth policy government industry costs prices demand supply "
+          "research study data survey experts percent increase decline year decade region countries "
+          "companies consumers investment technology energy production impact change trend record "
+          "according early later since while however although because overall estimated").split()
+_ASPECTS = ("overview", "analysis", "explained", "latest figures", "timeline", "key facts",
+            "what experts say", "in numbers", "a closer look", "questions answered")
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def _slug(text: str) -> str:
+    return "-".join(_words(text))
+
+
+def article_text(slug: str, paragraphs: int = 9) -> List[str]:
+    """Deterministic paragraphs about the words in `slug`."""
+    rng = random.Random(zlib.crc32(slug.encode()))
+    topic = [w for w in _words(slug) if len(w) > 3 and not w.isdigit()] or ["topic"]
+    out = []
+    for _ in range(paragraphs):
+        sents = []
+        for _ in range(rng.randint(3, 5)):
+            n = rng.randint(8, 24)
+            ws = [rng.choice(topic) if rng.random() < 0.25 else rng.choice(_VOCAB) for _ in range(n)]
+            if rng.random() < 0.3:
+                ws.insert(rng.randrange(n), str(rng.choice((rng.randint(1990, 2024), rng.randint(100, 9999)))))
+            sents.append(" ".join(ws).capitalize() + ".")
+        out.append(" ".join(sents))
+    return out
+
+
+class StandIn:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency_ms: Optional[Dict[str, float]] = None, error_rate: Optional[Dict[str, float]] = None,
+                 results: int = 10, seed: int = 0):
+        self.latency_ms = {"search": 0.0, "wiki": 0.0, "rss": 0.0, "article": 0.0, **(latency_ms or {})}
+        self.error_rate = {"search": 0.0, "wiki": 0.0, "rss": 0.0, "article": 0.0, **(error_rate or {})}
+        self.results = results
+        self.hits: Counter = Counter()
+        self.errors: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.server = _Server((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.standin = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """Config overrides (see config.py) that send search / news / scraping here."""
+        return {
+            "DDG_HTML_URL": f"{self.url}/html/",
+            "WIKI_API_URL": f"{self.url}/w/api.php",
+            "WIKI_PAGE_URL": f"{self.url}/wiki/",
+            "NEWS_FEEDS": ",".join(f"{self.url}/rss/{f}.xml" for f in FEEDS),
+            "SEARCH_BACKENDS": "ddg_html,wikipedia",        # the ddgs library cannot be redirected
+        }
+
+    def start(self) -> "StandIn":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ── injection ───────────────────────────────────────────────────
+    def _delay_and_fail(self, kind: str) -> bool:
+        with self._lock:
+            self.hits[kind] += 1
+            delay = self.latency_ms[kind] / 1000 * (0.5 + self._rng.random())   # mean = latency_ms
+            fail = self._rng.random() < self.error_rate[kind]
+            if fail:
+                self.errors[kind] += 1
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    # ── pages ───────────────────────────────────────────────────────
+    def ddg(self, q: str) -> str:
+        blocks = []
+        for k in range(self.results):
+            # the third result repeats the first with tracking params, as engines often do
+            dup = k == 2
+            page = 0 if dup else k
+            target = f"{self.url}/a/{_slug(q)}-{page}" + ("?utm_source=ddg" if dup else "")
+            blocks.append(_T["ddg_result.html"].substitute(
+                uddg=urllib.parse.quote(target, safe=""), rut=f"{zlib.crc32(target.encode()):x}",
+                host=self.server.server_address[0], display=html.escape(target.split("://", 1)[1]),
+                title=html.escape(f"{q.title()} – {_ASPECTS[page % len(_ASPECTS)]}"),
+                snippet=html.escape(article_text(f"{_slug(q)}-{page}", 1)[0][:180])))
+        return _T["ddg.html"].substitute(query=html.escape(q), results="\n".join(blocks))
+
+    def wiki(self, q: str, n: int) -> str:
+        out = json.loads(json.dumps(_WIKI))
+        terms = set(_words(q))
+        items = []
+        for k in range(n):
+            title = f"{q.title()} ({_ASPECTS[k % len(_ASPECTS)]})"
+            words = article_text(_slug(title), 1)[0].split()[:24]
+            snippet = " ".join(f'<span class="searchmatch">{w}</span>' if w.lower() in terms else w for w in words)
+            items.append({**out["query"]["search"][0], "title": title, "pageid": zlib.crc32(title.encode()),
+                          "snippet": snippet})
+        out["query"]["search"] = items
+        out["query"]["searchinfo"]["totalhits"] = n
+        return json.dumps(out)
+
+    def feed(self, name: str) -> str:
+        items = []
+        now = time.time()
+        for k, q in enumerate(QUERIES * 2):
+            title = f"{q.title()} – {_ASPECTS[(k + len(name)) % len(_ASPECTS)]}"
+            link = f"{self.url}/news/{name}-{_slug(title)}"
+            items.append(_T["feed_item.xml"].substitute(
+                title=title, link=link, snippet=article_text(_slug(title), 1)[0][:200],
+                date=formatdate(now - 3600 * k, usegmt=True)))
+        return _T["feed.xml"].substitute(name=name, base=self.url, now=formatdate(now, usegmt=True),
+                                         items="\n".join(items))
+
+    def article(self, slug: str) -> str:
+        title = slug.replace("-", " ").capitalize()
+        paras = "\n".join(f"<p>{html.escape(p)}</p>" for p in article_text(slug))
+        return _T["article.html"].substitute(title=html.escape(title), date="2024-05-01", paragraphs=paras)
+
+
+class _Server(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # clients hang up mid-response whenever a fetch is cancelled; that is not an error here
+        if not isinstance(sys.exc_info()[1], (ConnectionError, TimeoutError)):
+            super().handle_error(request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"                   # keep-alive, like the real sites
+
+    def do_GET(self):
+        si: StandIn = self.server.standin
+        parts = urllib.parse.urlsplit(self.path)
+        qs = dict(urllib.parse.parse_qsl(parts.query))
+        path = urllib.parse.unquote(parts.path)
+        if path in ("/html", "/html/"):
+            kind, ctype, render = "search", "text/html; charset=utf-8", lambda: si.ddg(qs.get("q", ""))
+        elif path == "/w/api.php":
+            kind, ctype = "wiki", "application/json; charset=utf-8"
+            render = lambda: si.wiki(qs.get("srsearch", ""), int(qs.get("srlimit", 10)))
+        elif path.startswith("/rss/"):
+            kind, ctype, render = "rss", "application/rss+xml", lambda: si.feed(Path(path).stem)
+        elif path.startswith(("/a/", "/news/", "/wiki/")):
+            kind, ctype = "article", "text/html; charset=utf-8"
+            render = lambda: si.article(_slug(path.split("/", 2)[2]))
+        else:
+            return self._send(404, "text/plain", b"not found")
+        if si._delay_and_fail(kind):
+            return self._send(_STATUS[kind], "text/plain", b"injected error")
+        self._send(200, ctype, render().encode())
+
+    def _send(self, status: int, ctype: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="mean latency for every kind")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failed")
+    args = ap.parse_args()
+    kinds = ("search", "wiki", "rss", "article")
+    si = StandIn(port=args.port, latency_ms=dict.fromkeys(kinds, args.latency_ms),
+                 error_rate=dict.fromkeys(kinds, args.error_rate))
+    for k, v in si.env().items():
+        print(f"export {k}='{v}'")
+    try:
+        si.server.serve_forever()
+    except KeyboardInterrupt:
+        si.stop()
+
+
+if __name__ == "__main__":
+    main()
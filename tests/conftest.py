@@ -0,0 +1,127 @@
+"""Shared fixtures: a local stand-in HTTP server for offline tests."""
+import asyncio, threading, time, urllib.parse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from benchmarks.standin import StandIn
+from web_research_agent import corpus, orchestrator, report_cache, tracing
+from web_research_agent.service import ResearchService
+from web_research_agent.tools import http_cache, news_tool, search_tool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    GET /page?delay=0.5&p=3   → HTML with `p` paragraphs after `delay` s
+    Anything registered in `server.routes[path]` wins:
+        (status, headers-dict, body-bytes)
+    """
+
+    def do_GET(self):
+        parts = urllib.parse.urlsplit(self.path)
+        qs = dict(urllib.parse.parse_qsl(parts.query))
+        self.server.hits.append(self.path)
+        time.sleep(float(qs.get("delay", 0)))
+
+        route = self.server.routes.get(parts.path)
+        if callable(route):
+            route = route(self)
+        if route is not None:
+            status, headers, body = route
+        else:
+            n = int(qs.get("p", 3))
+            paras = "".join(f"<p>Paragraph {i} about {parts.path.strip('/')}.</p>" for i in range(n))
+            status, headers = 200, {"Content-Type": "text/html; charset=utf-8"}
+            body = f"<html><body>{paras}</body></html>".encode()
+
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.daemon_threads = True
+    srv.routes, srv.hits = {}, []
+    srv.url = f"http://127.0.0.1:{srv.server_address[1]}"
+    th = threading.Thread(target=srv.serve_forever, daemon=True)
+    th.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_http_cache(tmp_path, monkeypatch):
+    """Keep every test's HTTP cache in its own temp dir."""
+    monkeypatch.setattr(http_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(http_cache, "_cache", None)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_report_cache(tmp_path, monkeypatch):
+    """Report cache off unless a test turns it on, and kept under the test's temp dir."""
+    monkeypatch.setattr(orchestrator, "REPORT_CACHE", False)
+    monkeypatch.setattr(report_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(report_cache, "_cache", None)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_corpus(tmp_path, monkeypatch):
+    """Article corpus off unless a test turns it on, and kept under the test's temp dir."""
+    monkeypatch.setattr(orchestrator, "CORPUS", False)
+    monkeypatch.setattr(corpus, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(corpus, "_corpus", None)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_traces(tmp_path, monkeypatch):
+    """Append pipeline traces under the test's temp dir."""
+    monkeypatch.setattr(tracing, "_sink", tracing.JsonlSink(tmp_path / "traces"))
+
+
+def _urls(summaries):
+    return "\n".join(a["url"] for a in summaries)
+
+
+@pytest.fixture
+def web_standin(monkeypatch):
+    """benchmarks/standin.py with search, news and scraping pointed at it; reports list source URLs."""
+    with StandIn(latency_ms={"article": 20}) as si:
+        env = si.env()
+        monkeypatch.setattr(search_tool, "DDG_HTML_URL", env["DDG_HTML_URL"])
+        monkeypatch.setattr(search_tool, "WIKI_API_URL", env["WIKI_API_URL"])
+        monkeypatch.setattr(search_tool, "WIKI_PAGE_URL", env["WIKI_PAGE_URL"])
+        monkeypatch.setattr(search_tool, "BACKENDS", [("ddg_html", search_tool._html_search),
+                                                      ("wikipedia", search_tool._wiki_search)])
+        monkeypatch.setattr(search_tool, "_breakers", {})
+        monkeypatch.setattr(news_tool, "_index", news_tool.NewsIndex(env["NEWS_FEEDS"].split(",")))
+        monkeypatch.setattr(orchestrator, "synthesise", lambda s, q, **kw: _urls(s))
+        monkeypatch.setattr(orchestrator, "synthesise_many", lambda b, **kw: [_urls(s) for s in b])
+        yield si
+
+
+@pytest.fixture
+def serve():
+    """Start `ResearchService(warm=False, **kw)` on a free port, on its own loop thread."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    started = []
+
+    def _start(**kw):
+        svc = ResearchService(warm=False, **kw)
+        asyncio.run_coroutine_threadsafe(svc.start("127.0.0.1", 0), loop).result(5)
+        started.append(svc)
+        return svc, f"http://127.0.0.1:{svc.port}"
+
+    yield _start
+    for svc in started:
+        asyncio.run_coroutine_threadsafe(svc.stop(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,52 @@
+import random
+from collections import Counter
+from pathlib import Path
+
+from web_research_agent.agents import analyzer
+from web_research_agent.agents.analyzer import _sentence_starts, summarise, summarise_many
+from web_research_agent.tools.scraper_tool import extract_paragraphs
+
+
+def _reference(text: str, max_sentences: int = 3) -> str:
+    """The original per-article implementation, kept as an oracle."""
+    doc = analyzer._nlp(text)
+    sents = [s.text for s in doc.sents]
+    if len(sents) <= max_sentences:
+        return text
+    words = [tok.text.lower() for tok in doc if tok.is_alpha and not tok.is_stop]
+    freq = Counter(words)
+    scored = [(sum(freq.get(w.lower(), 0) for w in sent.split()), sent) for sent in sents]
+    top = sorted(scored, key=lambda x: x[0], reverse=True)[:max_sentences]
+    return " ".join(sent for _, sent in sorted(top, key=lambda x: sents.index(x[1])))
+
+
+def _corpus():
+    rng = random.Random(7)
+    vocab = "the mountain Everest is tallest peak Nepal China climbers oxygen base camp 8,849 metres " \
+            "Tesla Ford profits revenue 2024 electric car sales Europe grew quickly and".split()
+    texts = []
+    for _ in range(20):
+        sents = [" ".join(rng.choice(vocab) for _ in range(rng.randint(3, 18))).capitalize() + rng.choice(".!?")
+                 for _ in range(rng.randint(1, 25))]
+        sents += sents[:2]                                     # duplicate sentences
+        texts.append(" ".join(sents))
+    for path in sorted((Path(__file__).parent / "fixtures" / "articles").glob("*.html")):
+        texts.append(extract_paragraphs(path.read_text(encoding="utf-8")))
+    texts += ["", "One sentence only.", "No punctuation at all just words",
+              'He said "stop." Then left... Really?! (Yes.) ok; fine.   Trailing  ',
+              "... leading dots. Mr. Smith paid $3.50 for 2.5 kg! Was it 10%? Sure."]
+    return texts
+
+
+def test_batch_matches_reference():
+    texts = _corpus()
+    assert summarise_many(texts) == [_reference(t) for t in texts]
+    assert [summarise(t) for t in texts] == [_reference(t) for t in texts]
+
+
+def test_sentence_starts_match_sentencizer():
+    from spacy.attrs import ORTH, IS_PUNCT
+    for text in _corpus():
+        doc = analyzer._nlp(text)
+        arr = doc.to_array([ORTH, IS_PUNCT])
+        assert _sentence_starts(arr[:, 0], arr[:, 1]).tolist() == [s.start for s in doc.sents]
@@ -0,0 +1,66 @@
+import json
+
+from web_research_agent import orchestrator
+from web_research_agent.__main__ import main
+
+QUERIES = ["how do heat pumps work", "solar panel efficiency trends", "how do heat pumps work"]
+
+
+def test_batch_matches_single_runs_and_fetches_each_url_once(web_standin):
+    res = orchestrator.run_research_batch(QUERIES, workers=1)
+    assert [r["query"] for r in res] == QUERIES
+    batch = next(e["data"] for e in res[0]["trace"]["events"] if e["type"] == "batch")
+    assert web_standin.hits["article"] == batch["fetched"] < batch["urls"]
+    assert batch["summarised"] == batch["fetched"]
+    retrieve = next(e["data"] for e in res[0]["trace"]["events"] if e["type"] == "retrieve")
+    assert retrieve["shared"] == 3 and retrieve["passages"] > 0
+    assert web_standin.hits["search"] == 2                   # the repeated query is searched once
+    record = next(r for r in map(json.loads, open(res[0]["trace_path"])) if r["id"] == res[0]["trace"]["id"])
+    spans = {s["name"]: s for s in record["spans"]}
+    assert spans["scrape"]["shared"] == 3 and spans["plan"].get("shared") is None
+
+    single = [orchestrator.run_research_pipeline(q)["report"] for q in QUERIES[:2]]
+    assert [r["report"] for r in res] == single + single[:1]
+
+
+def test_batch_of_nothing():
+    assert orchestrator.run_research_batch([]) == []
+
+
+def test_cli_jsonl_in_and_out(web_standin, tmp_path):
+    src = tmp_path / "q.jsonl"
+    src.write_text('{"id": "a", "query": "how do heat pumps work"}\n'
+                   '"solar panel efficiency trends"\n'
+                   'not json\n'
+                   '{"id": "d", "query": "heat pumps", "use_news": false}\n')
+    out = tmp_path / "out.jsonl"
+    assert main(["-i", str(src), "-o", str(out), "--workers", "1", "--batch-size", "3"]) == 0
+    rows = [json.loads(l) for l in out.read_text().splitlines()]
+    assert [r["id"] for r in rows] == ["a", 2, 3, "d"]
+    assert "invalid JSON" in rows[2]["error"]
+    assert rows[0]["report"].startswith(web_standin.url) and rows[0]["trace"]["id"] == rows[0]["trace_id"]
+    assert "/news/" not in rows[3]["report"] and "/news/" in rows[0]["report"]
+
+
+def test_cli_rejects_bad_fields_and_survives_a_failing_batch(tmp_path, monkeypatch):
+    def fake_batch(queries, use_news=True, workers=None):
+        if "boom" in queries:
+            raise RuntimeError("backend down")
+        return [{"report": f"{q}|{use_news}", "latency_ms": 1, "trace": {"id": q}} for q in queries]
+
+    monkeypatch.setattr(orchestrator, "run_research_batch", fake_batch)
+    src = tmp_path / "q.jsonl"
+    src.write_text('{"id": "n", "query": 123}\n'
+                   '{"id": "s", "query": "tides", "use_news": "false"}\n'
+                   '{"id": "x", "query": "tides", "use_news": "maybe"}\n'
+                   '"boom"\n'
+                   '"after"\n')
+    out = tmp_path / "out.jsonl"
+    assert main(["-i", str(src), "-o", str(out), "--batch-size", "4"]) == 0
+    rows = {r["id"]: r for r in map(json.loads, out.read_text().splitlines())}
+    assert list(rows) == ["n", "s", "x", 4, 5]
+    assert rows["n"]["error"] == "query must be a string"
+    assert rows["s"]["report"] == "tides|False"
+    assert "use_news" in rows["x"]["error"]
+    assert "backend down" in rows[4]["error"]
+    assert rows[5]["report"] == "after|True"                 # later batches still run
@@ -0,0 +1,75 @@
+from web_research_agent import orchestrator
+from web_research_agent.agents import claims
+from web_research_agent.agents.claims import ClaimIndex, extract
+
+
+def _figures(text):
+    return [(c.subject, c.value, c.unit, c.year, c.text) for c in extract(text)]
+
+
+def test_extracts_decimals_percentages_currencies_and_scales():
+    text = ("In 2023, Tesla sold 1.8 million cars worldwide. Revenue hit $96.8 billion in 2023. "
+            "The unemployment rate was 4.2 percent; the plant employs 12,000 workers.")
+    assert _figures(text) == [
+        ("tesla", 1.8e6, "car", "2023", "1.8 million cars"),
+        ("revenue", 96.8e9, "$", "2023", "$96.8 billion"),
+        ("rate unemployment", 4.2, "%", "", "4.2 percent"),
+        ("employ plant", 12000, "worker", "", "12,000 workers"),
+    ]
+
+
+def test_years_give_context_and_bare_figures_share_the_previous_subject():
+    got = _figures("Prices rose from 10% in 2022 to 12% in 2023. It was founded in 1998.")
+    assert got == [("price", 10, "%", "2022", "10%"), ("price", 12, "%", "2023", "12%")]
+    assert extract("Page 3 of 7") and not extract("1999 2000 2001")
+
+
+def test_conflicts_need_two_sources_disagreeing_on_one_key():
+    idx = ClaimIndex(tolerance=0.02)
+    found = idx.conflicts((s, s, t) for s, t in [
+        ("A", "Tesla delivered 1.81 million cars in 2023. The unemployment rate was 4.2% in 2024."),
+        ("B", "In 2023 Tesla sold about 2.1 million cars, and the unemployment rate reached 4.2% in 2024."),
+        ("C", "Tesla sold 1.8 million cars in 2023."),
+        ("D", "Tesla sold 1.3 million cars in 2022. Prices rose from 10% to 12%."),
+        ("E", "Prices rose 11%."),
+    ])
+    assert found == {"tesla [car, 2023]": ["1.8 million cars (C)", "1.81 million cars (A)", "2.1 million cars (B)"]}
+
+
+def test_qualifiers_stay_in_the_subject_and_names_are_not_figures():
+    assert ClaimIndex().conflicts([
+        ("u1", "A", "Paris has a population of 2.1 million."),
+        ("u2", "B", "Greater Paris has a population of 12 million."),
+    ]) == {}
+    assert _figures("iPhone 15 costs $799.") == [("15 iphone", 799, "$", "", "$799")]
+    assert _figures("Chapter 3 covers the history.") == []
+    assert all(c.unit not in ("cost", "cover") for c in extract("The Model 3 costs 40 dollars."))
+
+
+def test_sources_are_told_apart_by_url_not_title():
+    found = ClaimIndex().conflicts([
+        ("https://a.example/", "Home", "Tesla sold 1.8 million cars in 2023."),
+        ("https://b.example/", "Home", "Tesla sold 2.1 million cars in 2023."),
+    ])
+    assert found == {"tesla [car, 2023]": ["1.8 million cars (Home)", "2.1 million cars (Home)"]}
+
+
+def test_extraction_runs_once_per_text():
+    idx = ClaimIndex(max_articles=2)
+    for text in ("GDP grew 3%.", "GDP grew 3%.", "Inflation was 4%.", "Wages rose 5%.", "GDP grew 3%."):
+        idx.claims(text)
+    assert (idx.stats["extracted"], idx.stats["reused"]) == (4, 1)
+    assert idx.summary()["articles"] == 2
+
+
+def test_contradictions_come_from_full_text_not_summaries(monkeypatch):
+    monkeypatch.setattr(claims, "_index", ClaimIndex())
+    arts = [{"url": "u1", "title": "One", "summary": "Heat pumps are efficient."},
+            {"url": "u2", "title": "Two", "summary": "Heat pumps are efficient."},
+            {"url": "u3", "title": "Three", "summary": "Sales were 100 units."}]
+    texts = {"u1": "Heat pumps are efficient. Heat pump sales rose 11% in 2023.",
+             "u2": "Heat pumps are efficient. Heat pump sales rose 19% in 2023."}
+    got = orchestrator._detect_contradictions(arts, texts)
+    assert got == {"heat pump sale [%, 2023]": ["11% (One)", "19% (Two)"]}
+    assert "• heat pump sale [%, 2023]: 11% (One); 19% (Two)" in orchestrator._finish(
+        orchestrator.Trace("q"), "report", got, {}, {})["report"]
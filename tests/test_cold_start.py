@@ -0,0 +1,55 @@
+import os, subprocess, sys
+
+import pytest
+
+from benchmarks.bench_import import cold_query, importtime
+
+LAZY = ("spacy", "torch", "transformers", "duckduckgo_search", "feedparser", "bs4")
+
+
+@pytest.fixture
+def torch_on_path(tmp_path):
+    """A stand-in `torch` package, so the checks below hold whether or not torch is installed."""
+    (tmp_path / "torch").mkdir()
+    (tmp_path / "torch" / "__init__.py").write_text("import threading\nBY = threading.current_thread().name\n")
+    return {"PYTHONPATH": os.pathsep.join(filter(None, [str(tmp_path), os.environ.get("PYTHONPATH")]))}
+
+
+def test_entry_points_import_no_heavy_dependencies():
+    for module in ("web_research_agent.orchestrator", "web_research_agent.service", "web_research_agent.__main__"):
+        assert not set(importtime(module)["heavy"]) & set(LAZY), module
+
+
+def test_short_query_without_news_never_imports_torch(torch_on_path):
+    res = cold_query(torch_on_path)
+    assert res["report_chars"] > 0
+    assert "spacy" in res["heavy"]
+    assert not {"torch", "transformers", "feedparser"} & set(res["heavy"])
+
+
+def test_torch_is_hidden_from_the_spacy_import_only(torch_on_path):
+    code = ("import sys, threading\n"
+            "from web_research_agent.agents import analyzer\n"
+            "analyzer.load()\n"
+            "assert 'torch' not in sys.modules and analyzer.summarise('One. Two. Three. Four.', 3)\n"
+            "with analyzer._without_torch():\n"                 # other threads still get torch meanwhile
+            "    t = threading.Thread(target=lambda: __import__('torch'), name='other')\n"
+            "    t.start(); t.join()\n"
+            "import torch\n"                                     # and so does this one afterwards (T5)
+            "print(torch.BY)\n")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         env={**os.environ, **torch_on_path}).stdout
+    assert out.strip() == "other"
+
+
+def test_preloader_warms_spacy_in_the_background():
+    code = ("import sys\n"
+            "from web_research_agent import preload\n"
+            "from web_research_agent.agents import analyzer\n"
+            "assert 'spacy' not in sys.modules and not preload.wait(0)\n"
+            "preload.start(t5=False)\n"
+            "assert preload.wait(60) and analyzer._blank is not None\n"
+            "assert analyzer.summarise('One. Two. Three. Four.', 3)\n"
+            "print('torch' in sys.modules)\n")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "False"
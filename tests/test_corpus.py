@@ -0,0 +1,114 @@
+import time
+
+from web_research_agent import corpus, orchestrator
+from web_research_agent.corpus import Corpus
+
+_HEAT = "Heat pumps work by moving heat from cold outdoor air into the house using a refrigerant cycle."
+_SOLAR = "Solar panels turn sunlight into electricity; efficiency has risen every year."
+
+
+def _events(res, kind):
+    return [e["data"] for e in res["trace"]["events"] if e["type"] == kind]
+
+
+def test_add_is_incremental_and_duplicates_become_aliases(tmp_path):
+    c = Corpus(str(tmp_path / "c.sqlite"))
+    assert c.add("https://a.example/heat?utm_source=x", "Heat", _HEAT) == "new"
+    assert c.add("https://a.example/heat", "Heat", _HEAT) == "refreshed"
+    assert c.add("https://mirror.example/copy", "Copy", "  " + _HEAT.upper()) == "duplicate"
+    assert len(c) == 1
+    assert c.get("https://mirror.example/copy") == _HEAT
+    assert c.add("https://a.example/heat", "Heat", _HEAT + " Updated.") == "changed"
+    assert c.get("https://a.example/heat").endswith("Updated.")
+    assert c.get("https://nowhere.example/") is None
+    assert (c.stats["hit"], c.stats["miss"]) == (2, 1)
+
+
+def test_ttl_and_offline_reads(tmp_path):
+    c = Corpus(str(tmp_path / "c.sqlite"), ttl=60)
+    c.add("https://a.example/heat", "Heat", _HEAT)
+    c._db.execute("UPDATE articles SET fetched_at = fetched_at - 120")
+    assert c.get("https://a.example/heat") is None and c.search("heat pumps") == []
+    assert c.get("https://a.example/heat", any_age=True) == _HEAT
+    assert c.search("heat pumps", any_age=True)[0]["href"] == "https://a.example/heat"
+
+
+def test_search_ranks_full_matches_first(tmp_path):
+    c = Corpus(str(tmp_path / "c.sqlite"))
+    c.add("https://a.example/heat", "Heat pumps explained", _HEAT)
+    c.add("https://a.example/solar", "Solar", _SOLAR)
+    c.add("https://a.example/pumps", "Water", "Water pumps lift water from wells.")
+    hits = c.search("how do heat pumps work?")
+    assert [h["href"] for h in hits] == ["https://a.example/heat", "https://a.example/pumps"]
+    assert [h["all_terms"] for h in hits] == [True, False] and all(h["local"] for h in hits)
+    assert "refrigerant" in hits[0]["body"]
+    assert c.search("volcanoes") == [] and c.search("the of and") == []
+
+
+def test_least_recently_used_articles_are_evicted(tmp_path):
+    c = Corpus(str(tmp_path / "c.sqlite"), max_bytes=len(_HEAT) * 2 + 20)
+    for i in range(2):
+        c.add(f"https://a.example/{i}", str(i), f"{_HEAT} Part {i}.")
+        c._db.execute("UPDATE articles SET accessed_at = ? WHERE url LIKE ?", (i, f"%/{i}"))
+    c.get("https://a.example/0")                                   # touched: now the most recent
+    c.add("https://a.example/2", "2", f"{_HEAT} Part 2.")
+    assert len(c) == 2 and c.stats["evicted"] == 1
+    assert c.get("https://a.example/0") and c.get("https://a.example/2")
+    assert c.get("https://a.example/1") is None
+    c.add("https://a.example/2", "2", f"{_HEAT} Part 2, revised.")             # "changed" adjusts the total
+    c.add("https://mirror.example/0", "0", f"{_HEAT} Part 2, revised.")         # duplicate of an existing row
+    assert c.summary()["bytes"] == c._db.execute("SELECT SUM(size) FROM articles").fetchone()[0]
+
+
+def test_second_run_answers_from_the_corpus_without_the_web(web_standin, monkeypatch):
+    monkeypatch.setattr(orchestrator, "CORPUS", True)
+    first = orchestrator.run_research_pipeline("how do heat pumps work", use_news=False)
+    assert _events(first, "corpus")[0]["new"] > 0
+    hits = dict(web_standin.hits)
+
+    again = orchestrator.run_research_pipeline("how do heat pumps work", use_news=False)
+    assert _events(again, "search_web")[0]["skipped"] == "corpus"
+    assert dict(web_standin.hits) == hits                       # no search, no article fetch
+    assert again["report"] and set(again["report"].split("\n")) <= set(first["report"].split("\n"))
+    assert _events(again, "corpus")[0]["hit"] > 0 and "search" not in again["stages_ms"]
+
+
+def test_offline_mode_uses_stale_articles_and_no_network(web_standin, monkeypatch):
+    orchestrator.run_research_pipeline("how do heat pumps work", use_news=False, offline=False)
+    assert len(corpus.get_corpus()) == 0                        # CORPUS off: nothing stored
+    monkeypatch.setattr(orchestrator, "CORPUS", True)
+    orchestrator.run_research_batch(["how do heat pumps work", "solar panel efficiency"], use_news=False)
+    corpus.get_corpus()._db.execute("UPDATE articles SET fetched_at = 0")
+    hits = dict(web_standin.hits)
+
+    res = orchestrator.run_research_batch(["heat pumps", "solar panel efficiency"], offline=True)
+    assert dict(web_standin.hits) == hits
+    assert all(r["report"] for r in res)
+    assert _events(res[0], "search_web")[0]["skipped"] == "offline" and not _events(res[0], "news_rss")
+
+
+def test_recent_questions_need_articles_fresh_for_their_intent(web_standin, monkeypatch):
+    monkeypatch.setattr(orchestrator, "CORPUS", True)
+    orchestrator.run_research_pipeline("latest heat pumps", use_news=False)
+    corpus.get_corpus()._db.execute("UPDATE articles SET fetched_at = fetched_at - 3600")   # older than RECENT's TTL
+
+    recent = orchestrator.run_research_pipeline("latest heat pumps", use_news=False)
+    assert "skipped" not in _events(recent, "search_web")[0] and "search" in recent["stages_ms"]
+    fact = orchestrator.run_research_pipeline("heat pumps", use_news=False)
+    assert _events(fact, "search_web")[0]["skipped"] == "corpus"
+
+
+def test_offline_runs_neither_refresh_nor_fill_the_report_cache(web_standin, monkeypatch):
+    monkeypatch.setattr(orchestrator, "CORPUS", True)
+    monkeypatch.setattr(orchestrator, "REPORT_CACHE", True)
+    orchestrator.run_research_pipeline("how do heat pumps work", use_news=False)
+    cache = orchestrator.get_report_cache()
+    cache._db.execute("UPDATE reports SET created_at = created_at - ?", (cache.ttl["OTHER"] * 1.5,))
+    hits = dict(web_standin.hits)
+
+    stale = orchestrator.run_research_pipeline("how do heat pumps work", use_news=False, offline=True)
+    assert stale["cached"]["stale"] and not orchestrator._refreshing
+    res = orchestrator.run_research_pipeline("solar panel efficiency", use_news=False, offline=True)
+    assert "cached" not in res and cache.stats["stored"] == 1
+    time.sleep(0.2)
+    assert dict(web_standin.hits) == hits
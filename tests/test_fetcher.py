@@ -0,0 +1,46 @@
+import time
+
+from web_research_agent import orchestrator
+from web_research_agent.tools.fetcher import fetch_many
+
+
+def test_wall_clock_tracks_slowest_fetch(http_server):
+    delays = [0.6, 0.2, 0.4, 0.3, 0.5]
+    urls = [f"{http_server.url}/a{i}?delay={d}" for i, d in enumerate(delays)]
+    t0 = time.monotonic()
+    got = {i: text for i, text, _ in fetch_many(urls, per_host=len(urls))}
+    elapsed = time.monotonic() - t0
+    assert sorted(got) == list(range(len(urls)))
+    assert all("Paragraph 0" in t for t in got.values())
+    assert elapsed < max(delays) + 0.4 < sum(delays)
+
+
+def test_per_host_limit_serialises(http_server):
+    urls = [f"{http_server.url}/b{i}?delay=0.2" for i in range(3)]
+    t0 = time.monotonic()
+    list(fetch_many(urls, per_host=1))
+    assert time.monotonic() - t0 >= 0.6
+
+
+def test_deadline_drops_late_pages(http_server):
+    urls = [f"{http_server.url}/fast", f"{http_server.url}/slow?delay=2"]
+    t0 = time.monotonic()
+    got = {i: text for i, text, _ in fetch_many(urls, per_host=2, deadline=0.5)}
+    assert time.monotonic() - t0 < 1.0
+    assert list(got) == [0]
+
+
+def test_pipeline_keeps_ranking_order(http_server, monkeypatch, tmp_path):
+    # first-ranked page is the slowest: it must still come first
+    hits = [
+        {"title": f"T{i}", "href": f"{http_server.url}/r{i}?delay={d}", "body": "mountain " * (3 - i)}
+        for i, d in enumerate([0.4, 0.1, 0.2])
+    ]
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(orchestrator, "search_many", lambda qs, limit: [hits])
+    monkeypatch.setattr(orchestrator, "synthesise", lambda s, q, **kw: "\n".join(a["url"] for a in s))
+    res = orchestrator.run_research_pipeline("mountain", use_news=False)
+    assert res["report"].split("\n") == [h["href"] for h in hits]
+    events = res["trace"]["events"]
+    fetched = [e["data"]["url"] for e in events if e["type"] == "fetch_article"]
+    assert fetched == [h["href"] for h in hits]
@@ -0,0 +1,86 @@
+import threading
+from collections import Counter
+
+from web_research_agent.tools import http_cache
+from web_research_agent.tools.http_cache import HTTPCache
+
+
+def _etag_route(handler):
+    if handler.headers.get("If-None-Match") == '"v1"':
+        return 304, {}, b""
+    return 200, {"Content-Type": "text/html", "ETag": '"v1"'}, b"<p>fresh body</p>"
+
+
+def test_fresh_entries_skip_network(http_server, tmp_path):
+    cache = HTTPCache(str(tmp_path / "c.sqlite"))
+    url = f"{http_server.url}/page"
+    first = cache.get(url, "article")
+    second = cache.get(url, "article")
+    assert first.text == second.text and second.from_cache
+    assert len(http_server.hits) == 1
+    assert cache.stats["hit"] == 1 and cache.stats["miss"] == 1
+
+
+def test_stale_entry_revalidates_with_etag(http_server, tmp_path, monkeypatch):
+    monkeypatch.setitem(http_cache.HTTP_CACHE_TTL, "rss", 0)
+    http_server.routes["/feed"] = _etag_route
+    cache = HTTPCache(str(tmp_path / "c.sqlite"))
+    cache.get(f"{http_server.url}/feed", "rss")
+    again = cache.get(f"{http_server.url}/feed", "rss")
+    assert again.content == b"<p>fresh body</p>"
+    assert cache.stats["revalidated"] == 1
+    assert len(http_server.hits) == 2
+
+
+def test_lowercase_validators_still_revalidate(http_server, tmp_path, monkeypatch):
+    def route(handler):
+        if handler.headers.get("If-None-Match") == '"v1"' and handler.headers.get("If-Modified-Since"):
+            return 304, {}, b""
+        return 200, {"content-type": "text/html", "etag": '"v1"',
+                     "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, b"<p>fresh body</p>"
+
+    monkeypatch.setitem(http_cache.HTTP_CACHE_TTL, "rss", 0)
+    http_server.routes["/lower"] = route
+    cache = HTTPCache(str(tmp_path / "c.sqlite"))
+    for _ in range(2):
+        assert cache.get(f"{http_server.url}/lower", "rss").content == b"<p>fresh body</p>"
+        body = []
+        cache.stream(f"{http_server.url}/lower", "rss", accept=lambda h: True, sink=lambda b: body.append(b) or True)
+        assert b"".join(body) == b"<p>fresh body</p>"
+    assert cache.stats == Counter(miss=2, revalidated=2)
+
+
+def test_lru_eviction_bounds_size(http_server, tmp_path):
+    cache = HTTPCache(str(tmp_path / "c.sqlite"), max_bytes=400)
+    for i in range(5):
+        cache.get(f"{http_server.url}/p{i}?p=4", "article")
+    cache.get(f"{http_server.url}/p4?p=4", "article")
+    assert cache.stats["evicted"] >= 1
+    assert cache.get(f"{http_server.url}/p4?p=4", "article").from_cache
+    size = cache._db.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+    assert cache._bytes == size <= 400
+
+
+def test_run_counters_only_see_their_own_lookups(http_server, tmp_path):
+    cache = HTTPCache(str(tmp_path / "c.sqlite"))
+    runs = [Counter(), Counter()]
+
+    def run(i: int):
+        fetch = http_cache.counted(lambda url: cache.get(url, "article"), runs[i])
+        for _ in range(3):
+            fetch(f"{http_server.url}/run{i}")
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(2)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert runs == [Counter(miss=1, hit=2)] * 2
+    assert (cache.stats["hit"], cache.stats["miss"]) == (4, 2)
+
+
+def test_bypass_switch(http_server, monkeypatch):
+    monkeypatch.setattr(http_cache, "HTTP_CACHE", False)
+    for _ in range(2):
+        http_cache.cached_get(f"{http_server.url}/nocache", "article")
+    assert len(http_server.hits) == 2
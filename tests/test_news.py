@@ -0,0 +1,74 @@
+import time
+from email.utils import formatdate
+
+from web_research_agent.tools import http_cache
+from web_research_agent.tools.news_tool import NewsIndex
+
+
+def _rss(items):
+    body = "".join(
+        f"<item><title>{t}</title><link>{link}</link><description>{d}</description>"
+        f"<pubDate>{formatdate(ts)}</pubDate></item>"
+        for t, link, d, ts in items
+    )
+    xml = f'<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>{body}</channel></rss>'
+    return 200, {"Content-Type": "application/rss+xml"}, xml.encode()
+
+
+def _feeds(http_server):
+    now = time.time()
+    http_server.routes["/a.xml"] = _rss([
+        ("Electric car sales surge in Europe", "https://n/1", "Battery prices fell.", now - 7200),
+        ("Storm hits coast", "https://n/2", "Heavy rain.", now - 60),
+    ])
+    http_server.routes["/b.xml"] = _rss([
+        ("Electric car sales surge in Europe", "https://n/1", "Duplicate via syndication.", now - 7200),
+        ("Europe electric car makers cut prices", "https://n/3", "Price war.", now - 600),
+        ("Electric bikes", "https://n/4", "Not cars.", now - 30),
+    ])
+    return [f"{http_server.url}/a.xml?delay=0.3", f"{http_server.url}/b.xml?delay=0.3"]
+
+
+def test_multi_word_query_ranked_by_overlap_then_recency(http_server):
+    idx = NewsIndex(feeds=_feeds(http_server), ttl=60)
+    t0 = time.monotonic()
+    idx.ensure_fresh()
+    assert time.monotonic() - t0 < 0.55                       # feeds fetched in parallel
+    assert len(idx.entries) == 4                              # duplicate link dropped
+    hits = idx.search("latest news on electric cars in Europe")
+    assert [h["link"] for h in hits] == ["https://n/3", "https://n/1", "https://n/4"]
+
+
+def test_warm_index_never_waits_on_feeds(http_server, monkeypatch):
+    monkeypatch.setitem(http_cache.HTTP_CACHE_TTL, "rss", 0)   # make the refresh hit the wire
+    idx = NewsIndex(feeds=_feeds(http_server), ttl=0)
+    idx.ensure_fresh()
+    hits_before = len(http_server.hits)
+    t0 = time.monotonic()
+    assert idx.search("storm coast")                          # stale → served, refresh in background
+    idx.ensure_fresh()
+    assert time.monotonic() - t0 < 0.1
+    deadline = time.monotonic() + 2
+    while len(http_server.hits) == hits_before and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert len(http_server.hits) > hits_before                # refreshed behind the query
+
+
+def test_trim_unposts_terms_past_the_stored_summary():
+    idx = NewsIndex(feeds=[], max_entries=2)
+    now = time.time()
+    for i in range(4):
+        idx._add({"title": f"Story {i}", "link": f"https://n/{i}", "summary": "x " * 150 + "zebrafish",
+                  "published_parsed": time.gmtime(now - 3600 * (4 - i))})
+        idx._trim()
+    assert set(idx.entries) == {2, 3}
+    assert idx.postings["zebrafish"] == {2, 3}
+    assert {h["link"] for h in idx.search("zebrafish")} == {"https://n/2", "https://n/3"}
+
+
+def test_undated_entries_rank_as_old():
+    idx = NewsIndex(feeds=[])
+    idx._add({"title": "Comet seen", "link": "https://n/old", "summary": ""})
+    idx._add({"title": "Comet seen", "link": "https://n/new", "summary": "",
+              "published_parsed": time.gmtime(time.time() - 60)})
+    assert [h["link"] for h in idx.search("comet")] == ["https://n/new", "https://n/old"]
@@ -0,0 +1,70 @@
+from web_research_agent import orchestrator
+from web_research_agent.agents.ranker import (bm25_scores, canonical_url, dedupe_hits, fingerprint,
+                                              near_duplicate, rank_hits, tokenize)
+
+ARTICLE = ("Mount Everest is Earth's highest mountain above sea level, located in the Mahalangur Himal "
+           "sub-range of the Himalayas. The China–Nepal border runs across its summit point. Its elevation "
+           "of 8,848.86 m was most recently established in 2020 by the Chinese and Nepali authorities. "
+           "Everest attracts many climbers, including highly experienced mountaineers.")
+
+
+def test_tokens_are_whole_words():
+    assert bm25_scores(["art"], [tokenize("start restart"), tokenize("modern art museum")])[0] == 0.0
+
+
+def test_bm25_prefers_focused_snippet_over_long_one():
+    hits = [
+        {"title": "Filler", "href": "a", "body": "mountain " + "lorem ipsum dolor " * 60},
+        {"title": "Tallest mountain", "href": "b", "body": "Everest is the tallest mountain in the world."},
+        {"title": "Cooking", "href": "c", "body": "How to make pasta."},
+    ]
+    assert [h["href"] for h in rank_hits(hits, "Tallest mountain in the world", 3)] == ["b", "a", "c"]
+
+
+def test_canonical_url():
+    same = [
+        "https://www.example.com/news/story/?utm_source=x&id=7#comments",
+        "http://m.example.com/news/story?id=7&fbclid=abc",
+        "https://example.com/news/story?id=7",
+    ]
+    assert len({canonical_url(u) for u in same}) == 1
+    assert canonical_url("https://example.com/a?id=8") != canonical_url(same[0])
+
+
+def test_near_duplicate_articles():
+    mirror = ARTICLE.replace("many climbers", "many climbers every year") + " Share this article."
+    other = ("Tesla reported record quarterly profits driven by strong demand for the Model Y in Europe "
+             "and China, while Ford's electric vehicle division posted a multi-billion dollar loss as "
+             "price cuts squeezed margins across the industry and battery costs remained elevated.")
+    a, b, c = fingerprint(ARTICLE), fingerprint(mirror), fingerprint(other)
+    assert near_duplicate(a, b) and not near_duplicate(a, c)
+    assert fingerprint("too short to judge") is None
+
+
+def test_dedupe_counts_avoided_fetches():
+    hits = [
+        {"title": "Everest", "href": "https://en.wikipedia.org/wiki/Everest", "body": ARTICLE[:200]},
+        {"title": "Everest", "href": "https://en.m.wikipedia.org/wiki/Everest#History", "body": "x"},
+        {"title": "Everest", "href": "https://mirror.example/everest", "body": ARTICLE[:200]},
+        {"title": "K2", "href": "https://en.wikipedia.org/wiki/K2", "body": "K2 is the second-highest."},
+    ]
+    kept, dropped = dedupe_hits(hits)
+    assert [h["href"] for h in kept] == [hits[0]["href"], hits[3]["href"]]
+    assert dropped == {"dup_url": 1, "dup_snippet": 1}
+
+
+def test_pipeline_skips_duplicate_fetches_and_summaries(http_server, monkeypatch, tmp_path):
+    body = "".join(f"<p>{s}.</p>" for s in ARTICLE.split(". "))
+    http_server.routes["/orig"] = (200, {"Content-Type": "text/html"}, body.encode())
+    http_server.routes["/copy"] = (200, {"Content-Type": "text/html"}, (body + "<p>Share this.</p>").encode())
+    hits = [
+        {"title": "Everest", "href": f"{http_server.url}/orig", "body": "Everest highest mountain"},
+        {"title": "Everest", "href": f"{http_server.url}/orig?utm_source=feed", "body": "Everest again"},
+        {"title": "Everest mirror", "href": f"{http_server.url}/copy", "body": "Everest mountain copy"},
+    ]
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(orchestrator, "search_many", lambda qs, limit: [hits])
+    monkeypatch.setattr(orchestrator, "synthesise", lambda s, q, **kw: "\n".join(a["url"] for a in s))
+    res = orchestrator.run_research_pipeline("Everest highest mountain", use_news=False)
+    assert res["report"] == hits[0]["href"]
+    assert sorted(set(http_server.hits)) == ["/copy", "/orig"]
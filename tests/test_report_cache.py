@@ -0,0 +1,131 @@
+import threading
+import time
+
+import requests
+
+from web_research_agent import orchestrator
+from web_research_agent.report_cache import ReportCache, query_key
+
+
+def _result(report="answer", trace_id="t-1"):
+    return {"report": report, "trace": {"id": trace_id}, "latency_ms": 900, "stages_ms": {"search": 300.0}}
+
+
+def test_key_folds_case_stopwords_plurals_and_order():
+    assert query_key("What are the Tesla sales in 2024?")[0] == query_key("2024 sale of tesla")[0]
+    assert query_key("tesla sales 2024")[0] != query_key("tesla sales 2024", use_news=False)[0]
+    assert query_key("latest tesla sales")[1] == "RECENT" and "latest" in query_key("latest tesla sales")[2]
+
+
+def test_exact_and_near_duplicate_hits_but_not_other_numbers(tmp_path):
+    rc = ReportCache(str(tmp_path / "r.sqlite"))
+    rc.store("how do heat pumps work in cold climates", True, _result(trace_id="abc"))
+    hit = rc.lookup("Heat pumps: how do they work in COLD climates?")
+    assert hit["match"] == "exact" and hit["trace_id"] == "abc" and hit["result"]["report"] == "answer"
+    assert rc.lookup("how do heat pumps work in cold climate areas")["match"] == "near"
+    assert rc.lookup("how do solar panels work") is None
+
+    rc.store("uk inflation rate 2023", True, _result())
+    assert rc.lookup("uk inflation rate 2023")
+    assert rc.lookup("uk inflation rates 2024") is None        # close text, different year
+    s = rc.summary()
+    assert (s["hit"], s["near_hit"], s["miss"]) == (2, 1, 2) and s["hit_ratio"] == 0.6
+
+
+def test_ttl_follows_intent_and_stale_window(tmp_path):
+    rc = ReportCache(str(tmp_path / "r.sqlite"), ttl={"RECENT": 60, "FACT": 86400}, stale=1.0)
+    rc.store("latest ev sales figures", True, _result())
+    rc.store("who invented the telephone", True, _result())
+    rc._db.execute("UPDATE reports SET created_at = created_at - 90")
+    assert rc.lookup("latest ev sales figures")["stale"]                 # 90 s > 60 s, within 2 × TTL
+    assert not rc.lookup("who invented the telephone")["stale"]
+    rc._db.execute("UPDATE reports SET created_at = created_at - 60")
+    assert rc.lookup("latest ev sales figures") is None
+    assert rc.lookup("who invented the telephone")
+
+
+def test_pipeline_hit_is_fast_and_stale_hit_refreshes(web_standin, monkeypatch):
+    monkeypatch.setattr(orchestrator, "REPORT_CACHE", True)
+    first = orchestrator.run_research_pipeline("how do heat pumps work", use_news=False)
+    assert "cached" not in first
+    searches = web_standin.hits["search"]
+
+    t0 = time.perf_counter()
+    again = orchestrator.run_research_pipeline("How do HEAT PUMPS work?", use_news=False)
+    assert (time.perf_counter() - t0) < 0.1
+    assert again["report"] == first["report"] and again["cached"]["trace_id"] == first["trace_id"]
+    assert again["trace_id"] != first["trace_id"] and "cache" in again["stages_ms"]
+    assert web_standin.hits["search"] == searches
+
+    cache = orchestrator.get_report_cache()
+    cache._db.execute("UPDATE reports SET created_at = created_at - ?", (cache.ttl["OTHER"] * 1.5,))
+    stale = orchestrator.run_research_pipeline("how do heat pumps work", use_news=False)
+    assert stale["cached"]["stale"] and stale["report"] == first["report"]
+    for _ in range(100):                                                 # background refresh
+        if cache.stats["stored"] == 2:
+            break
+        time.sleep(0.05)
+    refreshed = orchestrator.run_research_pipeline("how do heat pumps work", use_news=False)["cached"]
+    assert not refreshed["stale"] and refreshed["trace_id"] not in (first["trace_id"], None)
+
+
+def test_batch_answers_from_cache_and_service_reports_hit_ratio(web_standin, monkeypatch, serve):
+    monkeypatch.setattr(orchestrator, "REPORT_CACHE", True)
+    orchestrator.run_research_pipeline("solar panel efficiency trends")
+    res = orchestrator.run_research_batch(["Solar panel efficiency trends", "how do heat pumps work"], workers=1)
+    assert res[0]["cached"]["match"] == "exact" and "cached" not in res[1]
+
+    _, url = serve(use_cache=True)
+    hit = requests.get(f"{url}/research", params={"q": "how do heat pumps work"}).json()
+    assert hit["cached"]["trace_id"] == res[1]["trace_id"]
+    m = requests.get(f"{url}/metrics").json()
+    assert m["cached"] == 1 and m["admitted"] == 0
+    assert m["report_cache"]["hit_ratio"] == round(2 / 4, 3)
+
+
+def test_service_refreshes_stale_hits_through_its_own_queue(web_standin, monkeypatch, serve):
+    monkeypatch.setattr(orchestrator, "REPORT_CACHE", True)
+    first = orchestrator.run_research_pipeline("how do heat pumps work", use_news=False)
+    cache = orchestrator.get_report_cache()
+    cache._db.execute("UPDATE reports SET created_at = created_at - ?", (cache.ttl["OTHER"] * 1.5,))
+
+    svc, url = serve(use_cache=True)
+    for _ in range(3):
+        hit = requests.get(f"{url}/research", params={"q": "how do heat pumps work", "news": 0}).json()
+        assert hit["cached"]["stale"] and hit["report"] == first["report"]
+    assert not any(t.name == "report-refresh" for t in threading.enumerate())   # no thread per stale hit
+    for _ in range(100):
+        if svc.stats["completed"]:
+            break
+        time.sleep(0.05)
+    m = requests.get(f"{url}/metrics").json()
+    assert (m["cached"], m["refreshed"], m["admitted"], m["completed"]) == (3, 1, 1, 1)
+    assert not cache.lookup("how do heat pumps work", use_news=False)["stale"]
+
+
+def test_eviction_prunes_the_near_index_and_every_candidate_is_checked(tmp_path):
+    rc = ReportCache(str(tmp_path / "r.sqlite"), max_rows=2)
+    for i, q in enumerate(("how do heat pumps work in cold climates", "solar panel efficiency",
+                           "wind turbine noise levels")):
+        rc.store(q, True, _result())
+        rc._db.execute("UPDATE reports SET accessed_at = ? WHERE query = ?", (i, q))
+    tags = {tag for bucket in rc._near.buckets.values() for _, tag in bucket}
+    assert len(tags) == 2 and not any("heat" in t for t in tags)
+
+    rc.store("how do heat pumps work in cold climates", False, _result(trace_id="other-news"))
+    rc.store("how do heat pumps work in cold climates", True, _result(trace_id="ok"))
+    near = query_key("how do heat pumps work in cold climate areas")[2]
+    assert len(list(rc._near.candidates(rc._signature(near)))) == 2
+    # the use_news=False twin is also a candidate; the right one must still be found
+    assert rc.lookup("how do heat pumps work in cold climate areas")["trace_id"] == "ok"
+
+
+def test_one_added_word_and_term_less_questions_are_not_shared(tmp_path):
+    rc = ReportCache(str(tmp_path / "r.sqlite"))
+    rc.store("who is the president of the united states", True, _result())
+    assert rc.lookup("who is the vice president of the united states") is None
+    assert rc.lookup("Who is the President of the United States?")["match"] == "exact"
+
+    rc.store("What is it?", True, _result(trace_id="empty"))
+    assert rc.lookup("Who are they?") is None and rc.lookup("What is it?") is None
+    assert rc._db.execute("SELECT COUNT(*) FROM reports").fetchone()[0] == 1
@@ -0,0 +1,51 @@
+from benchmarks.standin import article_text
+from web_research_agent import orchestrator
+from web_research_agent.agents.retriever import PassageIndex, split_passages
+
+_FILLER = "The weather was mild and the city council met on Tuesday to discuss parking."
+_ON_TOPIC = "Heat pumps move heat from cold outdoor air into the house using a refrigerant cycle."
+
+
+def _article(on_topic_at=(5,)):
+    paras = [" ".join([_ON_TOPIC if i in on_topic_at else _FILLER] * 6) for i in range(10)]
+    return "\n".join(paras)
+
+
+def test_passages_follow_paragraphs_and_split_long_ones():
+    text = "\n".join(article_text("heat-pumps", paragraphs=6))
+    passages = split_passages(text, words=80)
+    assert " ".join(passages).split() == text.split()                  # nothing lost or reordered
+    assert all(len(p.split()) <= 80 * 1.5 for p in passages)
+    assert split_passages("short one\n\nshort two") == ["short one short two"]
+    long = " ".join(["A sentence of exactly seven words here."] * 40)
+    assert len(split_passages(long, words=80)) > 1
+
+
+def test_select_keeps_relevant_passages_in_order_within_budget():
+    idx = PassageIndex()
+    out = idx.select(_article(on_topic_at=(2, 7)), ["how do heat pumps work"], budget=200, top_k=4)
+    kept = out.split("\n")
+    assert [p.startswith("Heat pumps") for p in kept] == [True, True]
+    assert sum(len(p.split()) for p in kept) <= 200
+    s = idx.summary()
+    assert s["kept"] == 2 and s["passages"] == 10 and s["chars_out"] < s["chars_in"]
+
+
+def test_select_matches_any_subquery_and_falls_back_to_the_lead():
+    idx = PassageIndex()
+    out = idx.select(_article(), ["solar panels", "heat pump"], budget=60)
+    assert out.startswith("Heat pumps")
+    lead = PassageIndex().select(_article(), ["volcanoes"], budget=60)
+    assert lead == _article().split("\n")[0]
+
+
+def test_short_articles_pass_through_untouched():
+    text = "Heat pumps are efficient.\nThey work in winter."
+    assert PassageIndex().select(text, ["heat pumps"], budget=300) == text
+    assert PassageIndex().select(_article(), ["heat pumps"], budget=0) == _article()
+
+
+def test_pipeline_summarises_only_selected_passages(web_standin):
+    res = orchestrator.run_research_pipeline("how do heat pumps work", use_news=False)
+    ev = next(e["data"] for e in res["trace"]["events"] if e["type"] == "retrieve")
+    assert 0 < ev["chars_out"] < ev["chars_in"] and ev["kept"] < ev["passages"]
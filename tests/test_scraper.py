@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+
+from web_research_agent.config import MAX_CHARS
+from web_research_agent.tools import scraper_tool
+from web_research_agent.tools.http_cache import cached_get
+from web_research_agent.tools.scraper_tool import _ParagraphParser, extract_paragraphs
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "articles").glob("*.html"))
+
+
+def _stream(html: str, chunk: int) -> str:
+    parser = _ParagraphParser(MAX_CHARS)
+    for i in range(0, len(html), chunk):
+        parser.feed(html[i:i + chunk])
+        if parser.full:
+            break
+    return parser.finish()
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda p: p.name)
+@pytest.mark.parametrize("chunk", [7, 4096])
+def test_stream_matches_bs4(path, chunk):
+    html = path.read_text(encoding="utf-8")
+    assert _stream(html, chunk) == extract_paragraphs(html)
+
+
+def test_stream_stops_early_on_long_page():
+    html = "<html><body>" + "<p>" + "word " * 200 + "</p>" + ("<p>" + "x" * 500 + "</p>") * 5000
+    parser = _ParagraphParser(MAX_CHARS)
+    fed = 0
+    for i in range(0, len(html), 4096):
+        parser.feed(html[i:i + 4096])
+        fed = i + 4096
+        if parser.full:
+            break
+    assert fed < len(html) // 50
+    assert parser.finish() == extract_paragraphs(html)
+
+
+def test_fetch_rejects_non_html(http_server):
+    http_server.routes["/doc.pdf"] = (200, {"Content-Type": "application/pdf"}, b"%PDF-1.7 <p>nope</p>")
+    assert scraper_tool.fetch_article_text(f"{http_server.url}/doc.pdf") is None
+
+
+def test_fetch_stream_and_cache_replay_agree(http_server, monkeypatch):
+    body = ("<p>" + "y" * 300 + "</p>") * 200
+    http_server.routes["/long"] = (200, {"Content-Type": "text/html; charset=utf-8"}, body.encode())
+    url = f"{http_server.url}/long"
+    first = scraper_tool.fetch_article_text(url)
+    second = scraper_tool.fetch_article_text(url)          # replayed from the cached prefix
+    assert len(http_server.hits) == 1
+    monkeypatch.setattr(scraper_tool, "SCRAPE_STREAM", False)
+    third = scraper_tool.fetch_article_text(url)           # BS4 path: never the streamed prefix
+    assert first == second == third == extract_paragraphs(body)
+    assert len(http_server.hits) == 2
+    assert cached_get(url, "article").content == body.encode()
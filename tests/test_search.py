@@ -0,0 +1,105 @@
+import threading, time
+
+import pytest
+
+from web_research_agent.tools import search_tool
+from web_research_agent.tools.http_cache import cached_get
+from web_research_agent.tools.search_tool import backend_health, search_many, search_web
+
+
+@pytest.fixture(autouse=True)
+def _fresh_breakers(monkeypatch):
+    monkeypatch.setattr(search_tool, "_breakers", {})
+
+
+def _healthy(tag):
+    return lambda q, n, timeout: [{"title": f"{tag}:{q}", "href": f"https://{tag}/{q}", "body": q}]
+
+
+def _slow(q, n, timeout):
+    time.sleep(1.5)                                          # ignores its timeout, like a hung socket
+    return [{"title": "slow", "href": "https://slow", "body": ""}]
+
+
+def _failing(q, n, timeout):
+    raise ConnectionError("backend down")
+
+
+def test_hedge_starts_next_backend_instead_of_waiting():
+    t0 = time.monotonic()
+    res = search_web("q", backends=[("slow", _slow), ("ok", _healthy("ok"))], hedge_ms=200)
+    assert res[0]["title"] == "ok:q"
+    assert time.monotonic() - t0 < 0.6
+
+
+def test_failure_moves_on_immediately():
+    t0 = time.monotonic()
+    res = search_web("q", backends=[("bad", _failing), ("ok", _healthy("ok"))], hedge_ms=5_000)
+    assert res[0]["title"] == "ok:q"
+    assert time.monotonic() - t0 < 0.3
+
+
+def test_global_deadline():
+    t0 = time.monotonic()
+    assert search_web("q", backends=[("slow", _slow), ("slow2", _slow)], deadline=0.5, hedge_ms=100) == []
+    assert time.monotonic() - t0 < 0.8
+
+
+def test_breaker_opens_after_repeated_failures_then_probes(monkeypatch):
+    backends = [("bad", _failing), ("ok", _healthy("ok"))]
+    for _ in range(3):
+        search_web("q", backends=backends)
+    assert backend_health()["bad"]["state"] == "open"
+    calls = []
+    spy = lambda q, n, timeout: calls.append(q) or []          # noqa: E731
+    search_web("q", backends=[("bad", spy), ("ok", _healthy("ok"))])
+    assert calls == [] and backend_health()["bad"]["skipped"] == 1
+
+    search_tool._breakers["bad"].opened_at -= search_tool._breakers["bad"].cooldown
+    search_web("q", backends=[("bad", _healthy("bad"))])       # half-open probe succeeds
+    assert backend_health()["bad"]["state"] == "closed"
+
+
+def test_429_opens_breaker_at_once(http_server):
+    http_server.routes["/search"] = (429, {"Content-Type": "text/html"}, b"slow down")
+
+    def ddg_standin(q, n, timeout):
+        resp = cached_get(f"{http_server.url}/search?q={q}", "search", timeout=timeout)
+        resp.raise_for_status()
+        return []
+
+    search_web("q", backends=[("ddg", ddg_standin), ("ok", _healthy("ok"))])
+    health = backend_health()["ddg"]
+    assert health["state"] == "open" and health["rate_limited"] == 1
+
+
+def test_sub_queries_run_concurrently():
+    def slowish(q, n, timeout):
+        time.sleep(0.3)
+        return _healthy("x")(q, n, timeout)
+
+    t0 = time.monotonic()
+    res = search_many(["a b", "c d", "e f"], backends=[("x", slowish)])
+    assert [r[0]["title"] for r in res] == ["x:a b", "x:c d", "x:e f"]
+    assert time.monotonic() - t0 < 0.6
+
+
+def test_hung_backend_cannot_take_over_the_pool(monkeypatch):
+    monkeypatch.setattr(search_tool, "SEARCH_INFLIGHT", 2)
+    gate = threading.Event()
+    hung = lambda q, n, timeout: gate.wait(5) and []            # noqa: E731  ignores its timeout
+    backends = [("hung", hung), ("ok", _healthy("ok"))]
+    for _ in range(2):
+        assert search_web("q", backends=backends, deadline=0.5, hedge_ms=50)
+    t0 = time.monotonic()
+    assert search_web("q", backends=backends, deadline=0.5, hedge_ms=5_000)[0]["title"] == "ok:q"
+    assert time.monotonic() - t0 < 0.2                          # hung backend skipped, not waited on
+    assert backend_health()["hung"]["inflight"] == 2
+
+    time.sleep(1.6)
+    gate.set()                                                  # they answer long past their timeout
+    deadline = time.monotonic() + 2
+    while backend_health()["hung"]["inflight"] and time.monotonic() < deadline:
+        time.sleep(0.02)
+    health = backend_health()["hung"]
+    assert health["inflight"] == 0 and health["failed"] == 2 and "TimeoutError" in health["last_error"]
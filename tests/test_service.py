@@ -0,0 +1,94 @@
+import json, socket, time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from web_research_agent import orchestrator
+from web_research_agent.orchestrator import Event
+
+
+@pytest.fixture
+def slow_pipeline(monkeypatch):
+    calls = []
+
+    def fake(query, use_news=True, **kw):
+        calls.append(query)
+        yield Event("plan", {"intent": "OTHER", "sub_queries": [query]})
+        time.sleep(0.4)
+        yield Event("report", {"report": f"about {query}", "latency_ms": 400, "stages_ms": {"search": 400.0}})
+
+    monkeypatch.setattr(orchestrator, "stream_research_pipeline", fake)
+    return calls
+
+
+def test_json_and_metrics_against_standin(web_standin, serve):
+    svc, url = serve()
+    res = requests.post(f"{url}/research", json={"query": "how do heat pumps work", "use_news": False}).json()
+    assert res["report"].startswith(web_standin.url) and res["trace"]["events"]
+    m = requests.get(f"{url}/metrics").json()
+    assert m["completed"] == 1 and m["queue_depth"] == 0 and "scrape" in m["stages"]
+    assert m["latency"]["count"] == 1 and "ddg_html" in m["backends"]
+
+
+def test_stream_yields_events_in_order(web_standin, serve):
+    _, url = serve()
+    with requests.get(f"{url}/stream", params={"q": "how do heat pumps work", "news": "0"}, stream=True) as r:
+        assert r.headers["Content-Type"] == "application/x-ndjson"
+        kinds = [json.loads(l)["kind"] for l in r.iter_lines() if l]
+    assert kinds[:2] == ["plan", "hits"] and kinds[-2:] == ["contradictions", "report"]
+    assert "summary" in kinds
+
+
+def test_identical_questions_share_one_run(serve, slow_pipeline):
+    svc, url = serve(workers=2)
+    with ThreadPoolExecutor(3) as pool:
+        a = pool.submit(requests.get, f"{url}/research", params={"q": "Ford vs Tesla?"})
+        time.sleep(0.1)
+        b = pool.submit(requests.get, f"{url}/research", params={"q": "tesla VS  ford"})
+        c = pool.submit(lambda: [json.loads(l)["kind"] for l in
+                                 requests.get(f"{url}/stream", params={"q": "ford vs tesla"}).iter_lines() if l])
+        reports = [a.result().json()["report"], b.result().json()["report"]]
+    assert slow_pipeline == ["Ford vs Tesla?"]
+    assert reports == ["about Ford vs Tesla?"] * 2
+    assert c.result() == ["plan", "report"]                 # joined late, plan replayed
+    assert requests.get(f"{url}/metrics").json()["coalesced"] == 2
+
+
+def test_overload_is_refused_not_queued(serve, slow_pipeline):
+    svc, url = serve(workers=1, queue=1, queue_timeout=10)
+    with ThreadPoolExecutor(3) as pool:
+        futs = [pool.submit(requests.get, f"{url}/research", params={"q": f"question number {i}"})
+                for i in range(3)]
+        codes = sorted(f.result().status_code for f in futs)
+    assert codes == [200, 200, 429]
+    rejected = [f.result() for f in futs if f.result().status_code == 429][0]
+    assert rejected.headers["Retry-After"] == "5"
+
+
+def test_queue_timeout_answers_503(serve, slow_pipeline):
+    svc, url = serve(workers=1, queue=4, queue_timeout=0.1)
+    with ThreadPoolExecutor(2) as pool:
+        first = pool.submit(requests.get, f"{url}/research", params={"q": "first question"})
+        time.sleep(0.05)
+        second = pool.submit(requests.get, f"{url}/stream", params={"q": "second question"})
+        assert first.result().status_code == 200
+        assert second.result().status_code == 503
+    m = requests.get(f"{url}/metrics").json()
+    assert m["rejected_503"] == 1 and m["inflight"] == 0
+
+
+def test_bad_requests(serve):
+    _, url = serve()
+    assert requests.get(f"{url}/research").status_code == 400
+    assert requests.post(f"{url}/research", data="[1]").status_code == 400
+    assert requests.get(f"{url}/nope").status_code == 404
+    assert requests.get(f"{url}/healthz").json() == {"ready": True}
+
+
+def test_oversized_body_is_refused_unread(serve):
+    svc, url = serve()
+    with socket.create_connection(("127.0.0.1", svc.port), timeout=5) as s:
+        s.sendall(b"POST /research HTTP/1.1\r\nHost: x\r\nContent-Length: 10000000000\r\n\r\n{")
+        head = s.recv(4096).split(b"\r\n", 1)[0]
+    assert head == b"HTTP/1.1 413 Payload Too Large"
@@ -0,0 +1,21 @@
+"""Whole pipeline against benchmarks/standin.py: real parsing, no internet."""
+from web_research_agent import orchestrator
+from web_research_agent.tools import search_tool
+
+
+def test_pipeline_offline(web_standin):
+    res = orchestrator.run_research_pipeline("how do heat pumps work", use_news=True)
+    urls = res["report"].split("\n\n")[0].split("\n")       # before any contradiction notes
+    assert len(urls) >= 5 and all(u.startswith(web_standin.url) for u in urls)
+    assert any("/news/" in u for u in urls)
+    dedupe = next(e["data"] for e in res["trace"]["events"] if e["type"] == "dedupe")
+    assert dedupe["dup_url"] >= 1                      # ?utm_source copy of the first hit
+    assert web_standin.hits["search"] and web_standin.hits["rss"] == 3 and not web_standin.hits["wiki"]
+
+
+def test_search_errors_fall_back_to_wikipedia(web_standin):
+    web_standin.error_rate["search"] = 1.0
+    res = orchestrator.run_research_pipeline("history of the printing press", use_news=False)
+    assert "/wiki/" in res["report"]
+    assert web_standin.errors["search"] >= 1 and web_standin.hits["wiki"] >= 1
+    assert search_tool.backend_health()["ddg_html"]["rate_limited"] >= 1
@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from web_research_agent import orchestrator
+from web_research_agent.orchestrator import stream_research_pipeline
+
+
+@pytest.fixture
+def standin(http_server, monkeypatch, tmp_path):
+    hits = [{"title": f"T{i}", "href": f"{http_server.url}/s{i}?delay={d}", "body": "topic words"}
+            for i, d in enumerate([1.5, 0.1, 1.0])]
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(orchestrator, "search_many", lambda qs, limit: [hits])
+    monkeypatch.setattr(orchestrator, "synthesise", lambda s, q, **kw: "\n".join(a["title"] for a in s))
+    return hits
+
+
+def test_events_arrive_incrementally(standin):
+    t0 = time.monotonic()
+    seen = []
+    for ev in stream_research_pipeline("topic words", use_news=False):
+        seen.append((ev.kind, time.monotonic() - t0, ev.data))
+    kinds = [k for k, _, _ in seen]
+    assert kinds[:2] == ["plan", "hits"] and kinds[-2:] == ["contradictions", "report"]
+    summaries = [(t, d["rank"]) for k, t, d in seen if k == "summary"]
+    assert [r for _, r in summaries] == [1, 2, 0]              # completion order
+    assert summaries[0][0] < 0.6                                # first output ≈ fastest fetch
+    assert seen[-1][2]["report"] == "T0\nT1\nT2"                # report in rank order
+
+
+def test_early_stop_after_enough_summaries(standin):
+    t0 = time.monotonic()
+    res = orchestrator.run_research_pipeline("topic words", use_news=False, max_summaries=1, use_cache=True)
+    assert time.monotonic() - t0 < 0.8
+    assert res["report"] == "T1"
+    events = res["trace"]["events"]
+    stop = [e["data"] for e in events if e["type"] == "early_stop"]
+    assert stop == [{"reason": "max_summaries", "fetched": 1, "of": 3}]
+    assert orchestrator.get_report_cache().lookup("topic words", use_news=False) is None   # partial: not cached
+
+
+def test_time_budget(standin):
+    res = orchestrator.run_research_pipeline("topic words", use_news=False, time_budget=0.5)
+    assert res["report"] == "T1"
@@ -0,0 +1,52 @@
+from web_research_agent.agents.synthesizer import SynthesisEngine, _pack, synthesise
+
+
+def test_pack_respects_budget_and_order():
+    pieces = [[1] * 3, [2] * 4, [3] * 2, [4] * 11, [5]]
+    chunks = _pack(pieces, budget=5)
+    assert all(len(c) <= 5 for c in chunks)
+    assert [t for c in chunks for t in c] == [t for p in pieces for t in p]
+    assert chunks[:2] == [[1, 1, 1], [2, 2, 2, 2]]
+
+
+def test_short_input_skips_model_and_keeps_legend():
+    items = [{"title": f"T{i}", "url": f"https://x/{i}", "summary": f"Fact {i}."} for i in range(3)]
+    rep = synthesise(items, "q")
+    assert rep.startswith("[1] Fact 0. [2] Fact 1. [3] Fact 2.")
+    assert rep.endswith("[1] T0 — https://x/0\n[2] T1 — https://x/1\n[3] T2 — https://x/2")
+
+
+class _Tokenizer:
+    """Whitespace-separated integers in, the same integers out."""
+    pad_token_id = 0
+
+    def __call__(self, texts, add_special_tokens=False):
+        return {"input_ids": [[int(w) for w in t.split()] for t in texts]}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(map(str, ids))
+
+
+def test_map_reduce_rounds_run_in_lockstep_without_the_model():
+    engine = SynthesisEngine(chunk_tokens=64, batch_size=8)
+    engine.model, engine.tokenizer, engine._prefix_ids, engine._eos = object(), _Tokenizer(), [], []
+    calls = []
+
+    def generate(chunks, max_len, min_len):          # the "model" keeps the first max_len tokens
+        calls.append((len(chunks), max_len, min_len))
+        return [c[:max_len] for c in chunks]
+
+    engine._generate = generate
+    pieces = [list(range(100 * i + 1, 100 * i + 31)) for i in range(6)]      # 6 × 30 tokens → 3 chunks
+    groups = [[" ".join(map(str, p)) for p in pieces], ["7 8 9"], ["5"]]
+    stats = [{}, {}, None]
+    out = engine.summarise_batch(groups, stats)
+
+    # round 1: the long group maps its 3 chunks at 64 // 3 tokens while both short
+    # groups finish in one shared call; round 2 reduces the long group to one answer
+    assert calls == [(3, 21, 10), (2, 200, 60), (1, 200, 60)]
+    assert out[0].split() == [str(t) for p in pieces[::2] for t in p[:21]]
+    assert out[1:] == ["7 8 9", "5"]
+    assert {k: stats[0][k] for k in ("tokens_in", "tokens_out", "rounds", "batched")} == \
+        {"tokens_in": 180, "tokens_out": 63 + 63, "rounds": 2, "batched": 3}
+    assert (stats[1]["tokens_in"], stats[1]["tokens_out"], stats[1]["rounds"]) == (3, 3, 1)
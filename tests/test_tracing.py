@@ -0,0 +1,73 @@
+import json, time
+
+from web_research_agent import orchestrator, tracing
+from web_research_agent.tracing import JsonlSink, Trace, load_traces, stage_latency
+
+
+def test_spans_nest_and_time_monotonically():
+    tr = Trace("q", profile="")
+    with tr.span("outer", n=1) as outer:
+        time.sleep(0.02)
+        with tr.span("inner") as inner:
+            inner.incr("bytes", 10)
+            inner.incr("bytes", 5)
+        tr.record_span("fetch", 12.5, chars=3)
+        with outer.paused():
+            time.sleep(0.05)                    # excluded
+    spans = {s["name"]: s for s in tr.record()["spans"]}
+    assert spans["inner"]["parent"] == spans["outer"]["id"] == spans["fetch"]["parent"]
+    assert spans["outer"]["parent"] is None and spans["inner"]["bytes"] == 15
+    assert 20 <= spans["outer"]["ms"] < 45 and spans["fetch"]["ms"] == 12.5
+    assert tr.stage_ms() == {"outer": spans["outer"]["ms"]}
+
+
+def test_mcp_export_keeps_old_format():
+    tr = Trace("q")
+    tr.log("user", "query", {"text": "q"})
+    out = tr.export_mcp()
+    assert set(out) == {"id", "query", "events"}
+    assert set(out["events"][0]) == {"ts", "role", "type", "data"}
+
+
+def test_sink_rotates_and_keeps_backups(tmp_path):
+    sink = JsonlSink(tmp_path, max_bytes=300, backups=2)
+    for i in range(20):
+        sink.write({"id": i, "ms": i, "pad": "x" * 100})
+    files = sink.files()
+    assert [p.name for p in files] == ["traces.2.jsonl", "traces.1.jsonl", "traces.jsonl"]
+    assert all(p.stat().st_size <= 300 for p in files)
+    ids = [r["id"] for r in load_traces(files)]
+    assert ids == sorted(ids) and ids[-1] == 19
+
+
+def test_stage_percentiles():
+    recs = [{"ms": 100 + i, "spans": [{"name": "fetch", "ms": float(i)}]} for i in range(1, 101)]
+    agg = stage_latency(recs)
+    assert agg["fetch"] == {"count": 100, "p50_ms": 50.0, "p95_ms": 95.0, "max_ms": 100.0}
+    assert agg["total"]["p50_ms"] == 150
+
+
+def test_sampled_profiles():
+    for kind, key in (("cprofile", "cprofile"), ("tracemalloc", "peak_kb")):
+        tr = Trace("q", profile=kind, sample=1.0)
+        with tr.span("work"):
+            with tr.span("child"):
+                sum(len(str(i)) for i in range(20_000))
+        spans = tr.record()["spans"]
+        assert key in spans[0]["profile"] and "profile" not in spans[1]
+    assert "profile" not in Trace("q", profile="cprofile", sample=0.0).record()
+
+
+def test_pipeline_appends_one_line_per_run(monkeypatch):
+    monkeypatch.setattr(orchestrator, "search_many", lambda qs, limit: [[]])
+    monkeypatch.setattr(orchestrator, "synthesise", lambda s, q, **kw: "none")
+    for _ in range(2):
+        res = orchestrator.run_research_pipeline("anything", use_news=False)
+    lines = open(res["trace_path"]).read().splitlines()
+    assert len(lines) == 2
+    rec = json.loads(lines[-1])
+    assert rec["id"] == res["trace"]["id"]
+    top = [s["name"] for s in rec["spans"] if s["parent"] is None]
+    assert top == ["plan", "search", "rank", "scrape", "contradictions", "synthesise"]
+    assert set(res["stages_ms"]) == set(top)
+    assert tracing.get_sink().path == tracing.get_sink().files()[-1]
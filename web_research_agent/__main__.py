@@ -0,0 +1,115 @@
+"""
+python -m web_research_agent – batch research from the command line.
+
+    python -m web_research_agent -i questions.jsonl -o reports.jsonl [--workers 8] [--batch-size 64]
+
+Input: one JSON object per line with a "query" (and optional "id" /
+"use_news"); a bare JSON string works too.  Output: one line per input line,
+in order – {"id", "query", "report", "latency_ms", "trace_id", "trace"} or
+{"id", "error"}.  Queries run through `run_research_batch`, `--batch-size`
+at a time; pages fetched by earlier batches come from the HTTP cache.
+"""
+import argparse, json, sys
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from .config import BATCH_WORKERS, BATCH_SIZE
+
+
+_TRUE, _FALSE = {"1", "true", "yes", "on"}, {"0", "false", "no", "off", ""}
+
+
+def _flag(value) -> Optional[bool]:
+    """JSON use_news → bool; None when it is neither a boolean nor a recognised spelling of one."""
+    if value is None:
+        return True
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in _TRUE | _FALSE:
+        return value.strip().lower() in _TRUE
+    return None
+
+
+def _read(fh: TextIO) -> Iterator[Dict]:
+    for n, line in enumerate(fh, 1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            yield {"id": n, "error": f"invalid JSON: {e}"}
+            continue
+        if isinstance(item, str):
+            item = {"query": item}
+        if not isinstance(item, dict):
+            yield {"id": n, "error": "missing query"}
+            continue
+        query = item.get("query")
+        if not isinstance(query, str) or not query.strip():
+            yield {"id": item.get("id", n), "error": "query must be a string" if query is not None and not isinstance(query, str) else "missing query"}
+            continue
+        news = _flag(item.get("use_news"))
+        if news is None:
+            yield {"id": item.get("id", n), "error": "use_news must be a boolean"}
+            continue
+        yield {"id": item.get("id", n), "query": query.strip(), "use_news": news}
+
+
+def _flush(items: List[Dict], out: TextIO, workers: int, use_news: bool):
+    from .orchestrator import run_research_batch
+
+    todo = [it for it in items if "error" not in it]
+    # queries that differ in use_news cannot share a batch call
+    results: Dict[int, Dict] = {}
+    for news in (True, False):
+        group = [it for it in todo if (it["use_news"] and use_news) == news]
+        if not group:
+            continue
+        try:
+            batch = run_research_batch([it["query"] for it in group], use_news=news, workers=workers)
+        except Exception as e:                  # one bad batch must not end the run
+            batch = [{"error": f"{type(e).__name__}: {e}"}] * len(group)
+        for it, res in zip(group, batch):
+            results[id(it)] = res
+    for it in items:
+        res = results.get(id(it), it)
+        if "error" in res:
+            rec = {"id": it["id"], "error": res["error"]}
+        else:
+            rec = {"id": it["id"], "query": it["query"], "report": res["report"],
+                   "latency_ms": res["latency_ms"], "trace_id": res["trace"]["id"], "trace": res["trace"]}
+        out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    out.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m web_research_agent", description=__doc__.split("\n\n")[0])
+    ap.add_argument("-i", "--input", default="-", help="queries JSONL (default stdin)")
+    ap.add_argument("-o", "--output", default="-", help="results JSONL (default stdout)")
+    ap.add_argument("--workers", type=int, default=BATCH_WORKERS, help="spaCy processes")
+    ap.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="queries per batch")
+    ap.add_argument("--no-news", action="store_true", help="skip RSS feeds for every query")
+    args = ap.parse_args(argv)
+
+    fin = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    fout = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        pending: List[Dict] = []
+        for item in _read(fin):
+            pending.append(item)
+            if len(pending) >= args.batch_size:
+                _flush(pending, fout, args.workers, not args.no_news)
+                pending = []
+        if pending:
+            _flush(pending, fout, args.workers, not args.no_news)
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+        if fout is not sys.stdout:
+            fout.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
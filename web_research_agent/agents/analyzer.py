@@ -1,25 +1,152 @@
 """
 Simple extractive summariser using word-frequency scoring.
 Lightweight: spaCy blank + sentencizer only (no large model).
+
+`summarise_many` streams a whole batch through `nlp.pipe` and scores
+sentences with NumPy over `Doc.to_array` columns instead of Token objects;
+`summarise` is the one-article form of the same code path.
+
+spaCy is imported on first use (`load()`), not with the package, and
+without torch: thinc probes for it on import although the blank pipeline
+never runs a torch layer (see `_without_torch`).
 """
-from typing import List
-from collections import Counter
-import spacy
+import sys, threading
+from contextlib import contextmanager
+from typing import Iterable, List
+import numpy as np
 
-_nlp = spacy.blank("en")
-_nlp.add_pipe("sentencizer")
+from ..config import ANALYZE_PROCESSES, ANALYZE_BATCH
 
-def summarise(text: str, max_sentences: int = 3) -> str:
-    doc = _nlp(text)
-    sents: List[str] = [s.text for s in doc.sents]
-    if len(sents) <= max_sentences:
+_blank = None                    # spacy.blank("en") + sentencizer, once loaded
+_PUNCT_CHARS = None
+_load_lock = threading.Lock()
+
+
+class _RefuseTorch:
+    """`sys.meta_path` finder refusing torch to one thread; every other thread imports it as usual."""
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+
+    def find_spec(self, name, path=None, target=None):
+        if name.partition(".")[0] == "torch" and threading.get_ident() == self.thread:
+            raise ModuleNotFoundError("torch is not loaded with spaCy", name=name)
+        return None
+
+
+@contextmanager
+def _without_torch():
+    """
+    Imports on this thread see no torch (unless it is already loaded).
+
+    Only the thread importing spaCy is affected, only for that import, and
+    nothing is left in `sys.modules`: torch imports normally afterwards
+    (T5).  thinc keeps `has_torch=False`, read only by its torch layers.
+    """
+    if "torch" in sys.modules:
+        yield
+        return
+    finder = _RefuseTorch()
+    sys.meta_path.insert(0, finder)
+    try:
+        yield
+    finally:
+        sys.meta_path.remove(finder)
+
+
+def load():
+    """Import spaCy and build the blank pipeline (once)."""
+    global _blank, _PUNCT_CHARS
+    if _blank is not None:
+        return _blank
+    with _load_lock:
+        if _blank is not None:
+            return _blank
+        with _without_torch():
+            import spacy
+        from spacy.strings import hash_string
+
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        # Sentence splitting below re-implements the sentencizer rule on token arrays
+        # (its own loop builds a Token object per word and dominated the runtime).
+        _PUNCT_CHARS = np.array([hash_string(c) for c in nlp.get_pipe("sentencizer").punct_chars],
+                                dtype=np.uint64)
+        _blank = nlp
+    return _blank
+
+
+def __getattr__(name):
+    # `analyzer._nlp` from outside loads spaCy like any other first use
+    if name == "_nlp":
+        return load()
+    raise AttributeError(name)
+
+
+def _sentence_starts(orth: np.ndarray, is_punct: np.ndarray) -> np.ndarray:
+    """Token indices that open a sentence – same result as spaCy's sentencizer."""
+    if not len(orth):
+        return np.array([], dtype=np.int64)
+    ends_sent = np.isin(orth, _PUNCT_CHARS)
+    words = np.flatnonzero(~ends_sent & (is_punct == 0))
+    seen = np.cumsum(ends_sent)[words]            # sentence-final marks before each word
+    prev = np.concatenate(([0], seen[:-1]))
+    return np.union1d([0], words[seen > prev])
+
+
+def _summarise_doc(doc, text: str, max_sentences: int) -> str:
+    from spacy.attrs import ORTH, LOWER, IS_ALPHA, IS_STOP, IS_PUNCT, IDX, LENGTH
+    from spacy.strings import hash_string
+
+    # one C-level pass over token attributes instead of Token objects
+    arr = doc.to_array([LOWER, IS_ALPHA, IS_STOP, ORTH, IS_PUNCT, IDX, LENGTH])
+    starts = _sentence_starts(arr[:, 3], arr[:, 4])
+    if len(starts) <= max_sentences:
         return text
+    ends = np.append(starts[1:], len(arr)) - 1
+    sent_from = arr[starts, 5]
+    sent_to = arr[ends, 5] + arr[ends, 6]
+    sents: List[str] = [text[a:b] for a, b in zip(sent_from.tolist(), sent_to.tolist())]
+
+    # document term frequencies (by lower-case hash), computed once
+    keep = (arr[:, 1] == 1) & (arr[:, 2] == 0)
+    term_ids, term_counts = np.unique(arr[keep, 0], return_counts=True)
 
-    words = [tok.text.lower() for tok in doc if tok.is_alpha and not tok.is_stop]
-    freq  = Counter(words)
+    # sentence × term counts as a flat (sentence-id, term) stream
+    words, owner = [], []
+    for i, sent in enumerate(sents):
+        toks = sent.lower().split()
+        words.extend(toks)
+        owner.extend([i] * len(toks))
+    if words and len(term_ids):
+        vocab, inverse = np.unique(np.array(words), return_inverse=True)
+        hashes = np.fromiter((hash_string(w) for w in vocab.tolist()), dtype=np.uint64, count=len(vocab))
+        pos = np.minimum(np.searchsorted(term_ids, hashes), len(term_ids) - 1)
+        weights = np.where(term_ids[pos] == hashes, term_counts[pos], 0)
+        scores = np.bincount(np.array(owner), weights=weights[inverse], minlength=len(sents))
+    else:
+        scores = np.zeros(len(sents))
 
-    scored = [(sum(freq.get(w.lower(), 0) for w in sent.split()), sent) for sent in sents]
-    top = sorted(scored, key=lambda x: x[0], reverse=True)[:max_sentences]
-    # keep original order
-    ordered = [sent for _, sent in sorted(top, key=lambda x: sents.index(x[1]))]
+    top = np.argsort(-scores, kind="stable")[:max_sentences]
+    # keep original order (duplicate sentences rank at their first occurrence)
+    first = {}
+    for i, s in enumerate(sents):
+        first.setdefault(s, i)
+    ordered = sorted((sents[i] for i in top), key=first.__getitem__)
     return " ".join(ordered)
+
+
+def summarise_many(texts: Iterable[str], max_sentences: int = 3,
+                   n_process: int = ANALYZE_PROCESSES, batch_size: int = ANALYZE_BATCH) -> List[str]:
+    """Summarise a batch of articles in one `nlp.pipe` pass.
+
+    `texts` is consumed lazily, so a generator fed by downloads overlaps
+    parsing with I/O.
+    """
+    docs = load().pipe(((t, t) for t in texts), as_tuples=True, disable=["sentencizer"],
+                     n_process=n_process, batch_size=batch_size)
+    return [_summarise_doc(doc, text, max_sentences) for doc, text in docs]
+
+
+def summarise(text: str, max_sentences: int = 3) -> str:
+    return _summarise_doc(load().make_doc(text), text, max_sentences)
@@ -0,0 +1,218 @@
+"""
+claims.py  – numeric claims and conflicting figures
+
+• `extract` pulls (quantity, unit, year) claims out of full article text with
+  precompiled patterns: decimals, thousands separators, percentages,
+  currencies, million/billion scales and the word that follows as the unit
+• each claim is keyed by its subject – the noun phrase just before the
+  figure (modifiers kept: "Greater Paris" ≠ "Paris"), stemmed and
+  order-free – plus unit and year; a number that names something
+  ("iPhone 15 costs …", "Chapter 3 covers …") is part of a subject, not a figure
+• `ClaimIndex` buckets claims by key, so conflicting values from different
+  sources are found in one pass however many sources a query has; claims are
+  memoised by content hash, so one index serves a whole batch or service session
+"""
+
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib, re, threading
+
+from ..config import CLAIM_CACHE_MAX, CLAIM_SUBJECT_WORDS, CLAIM_TOLERANCE
+from .ranker import question_terms, stem, tokenize
+
+_SENT = re.compile(r"(?<=[.!?;])\s+|\n+")
+_QTY = re.compile(r"""
+    (?<![\w.,])
+    (?P<cur>[$€£¥])?
+    (?P<num>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)
+    (?!\w|[.,]\d)
+    (?:\s*(?P<scale>thousand|million|mn|billion|bn|trillion)\b)?
+    (?:\s*(?P<unit>%|per\s?cent\b|percent\b|°\s?[cf]\b|[^\W\d_][\w/-]*))?
+""", re.I | re.X)
+_YEAR = re.compile(r"(?<![\w.,$€£¥])(1[89]\d\d|20\d\d)(?![\w%]|[.,]\d)")
+_SCALE = {"thousand": 1e3, "million": 1e6, "mn": 1e6, "billion": 1e9, "bn": 1e9, "trillion": 1e12}
+_PERCENT = re.compile(r"%|per\s?cent|percent", re.I)
+_SYMBOLS = {"%", "$", "€", "£", "¥"}
+
+# verbs and hedges that sit between a subject and its figure ("sales rose to about …")
+_FILLER = {"was", "were", "been", "has", "have", "had", "stood", "stands", "reached", "reaches", "rose",
+           "rise", "rises", "risen", "fell", "falls", "grew", "grows", "hit", "hits", "totaled", "totalled",
+           "totals", "increased", "decreased", "dropped", "climbed", "declined", "sold", "delivered",
+           "reported", "recorded", "estimated", "said", "says", "according", "about", "around", "nearly",
+           "almost", "approximately", "roughly", "some", "over", "under", "more", "less", "than", "up",
+           "down", "just", "only", "least", "while", "but", "also", "per", "each", "now", "then", "into",
+           "be", "will", "would", "expected"}
+
+# verbs that follow a name with a number in it ("Model 3 is …", "iPhone 15 costs …"); never a unit
+_VERBS = {"is", "are", "was", "were", "has", "have", "had", "will", "would", "can", "could", "may", "might",
+          "must", "should", "does", "did", "costs", "covers", "covered", "includes", "included", "contains",
+          "offers", "comes", "came", "takes", "took", "makes", "gets", "gives", "begins", "began", "launches",
+          "launched", "arrives", "arrived", "remains", "becomes", "became", "adds", "brings", "supports",
+          "introduces", "introduced", "describes", "described", "explains", "explained", "discusses",
+          "examines", "focuses", "provides", "requires", "allows", "lets", "looks", "goes", "went", "sees",
+          "says", "said", "sells", "ships", "shipped", "features", "uses", "runs"}
+_LABEL_BEFORE = re.compile(r"\b\w*[A-Z]\w*\s*$")      # "iPhone 15", "Chapter 3", "Windows 11"
+
+
+@dataclass(frozen=True)
+class Claim:
+    subject: str        # stemmed content words, sorted
+    value: float        # scale applied: "1.8 million" → 1.8e6
+    unit: str           # "%", "$", a stemmed word ("car") or ""
+    year: str           # nearest year in the sentence, or ""
+    text: str           # the figure as written
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return self.subject, self.unit, self.year
+
+
+def _unit(m: re.Match) -> str:
+    if m.group("cur"):
+        return m.group("cur")
+    u = (m.group("unit") or "").lower()
+    if not u:
+        return ""
+    if _PERCENT.fullmatch(u):
+        return "%"
+    if u.startswith("°"):
+        return "°" + u[-1]
+    return "" if not question_terms(u) or u in _FILLER or u in _VERBS else stem(u)
+
+
+def _is_label(sent: str, m: re.Match) -> bool:
+    """A bare number between a capitalised name and a verb names a thing rather than counting one."""
+    if m.group("cur") or m.group("scale") or not _LABEL_BEFORE.search(sent, 0, m.start()):
+        return False
+    u = (m.group("unit") or "").lower()
+    return not u or u in _VERBS or u in _FILLER
+
+
+def _subject(clause: str, words: int) -> str:
+    # runs of adjacent content words are noun phrases with their modifiers; take the
+    # last one whole, and whole earlier ones until there are `words` terms
+    content = set(question_terms(clause)) - _FILLER - _VERBS
+    runs: List[List[str]] = [[]]
+    for t in tokenize(clause):
+        if t in content:
+            runs[-1].append(t)
+        elif runs[-1]:
+            runs.append([])
+    terms: List[str] = []
+    for run in reversed(runs):
+        if len(terms) >= words:
+            break
+        terms = run + terms
+    return " ".join(sorted({stem(t) for t in terms}))
+
+
+def extract(text: str, words: int = CLAIM_SUBJECT_WORDS) -> List[Claim]:
+    """Every figure in `text` that has a subject, with its unit and year."""
+    claims: List[Claim] = []
+    for sent in _SENT.split(text or ""):
+        if not any(c.isdigit() for c in sent):
+            continue
+        years = [(m.start(), m.group()) for m in _YEAR.finditer(sent)]
+        prev, subject = 0, ""
+        for m in _QTY.finditer(sent):
+            num, scale, unit = m.group("num"), (m.group("scale") or "").lower(), _unit(m)
+            if not scale and unit not in _SYMBOLS and _YEAR.fullmatch(num):
+                prev = m.end("num")
+                continue                            # a year, not a quantity
+            if _is_label(sent, m):
+                continue                            # part of the next figure's subject
+            # a figure with no words of its own shares the one before ("from 10% to 12%")
+            subject = _subject(sent[prev:m.start()], words) or subject
+            end = m.end("unit") if unit and not m.group("cur") else m.end("scale") if scale else m.end("num")
+            prev = end
+            if not subject:
+                continue
+            pos = m.start("num")
+            year = min(((abs(s - pos), y) for s, y in years if s != pos), default=(0, ""))[1]
+            value = float(num.replace(",", "")) * _SCALE.get(scale, 1)
+            claims.append(Claim(subject, value, unit, year, sent[m.start():end]))
+    return claims
+
+
+def _label(key: Tuple[str, str, str]) -> str:
+    subject, unit, year = key
+    return subject + (f" [{', '.join(filter(None, (unit, year)))}]" if unit or year else "")
+
+
+def _agree(a: float, b: float, tolerance: float) -> bool:
+    return abs(a - b) <= tolerance * max(abs(a), abs(b))
+
+
+class ClaimIndex:
+    """Claims of the articles seen this session (by content hash), bucketed by subject key per query."""
+
+    def __init__(self, max_articles: int = CLAIM_CACHE_MAX, tolerance: float = CLAIM_TOLERANCE):
+        self.max_articles = max_articles
+        self.tolerance = tolerance
+        self._claims: "OrderedDict[str, List[Claim]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = defaultdict(int)
+
+    def claims(self, text: str) -> List[Claim]:
+        """`extract(text)`, run once per distinct text."""
+        h = hashlib.sha1((text or "").encode()).hexdigest()
+        with self._lock:
+            hit = self._claims.get(h)
+            if hit is not None:
+                self._claims.move_to_end(h)
+                self.stats["reused"] += 1
+                return hit
+        found = extract(text)
+        with self._lock:
+            self._claims[h] = found
+            while len(self._claims) > self.max_articles:
+                self._claims.popitem(last=False)
+            self.stats["extracted"] += 1
+            self.stats["claims"] += len(found)
+        return found
+
+    def conflicts(self, sources: Iterable[Tuple[str, str, str]]) -> Dict[str, List[str]]:
+        """
+        {"subject [unit, year]": ["figure (name)", …]} for every key that
+        different `(url, name, text)` sources give different values for.
+        Sources are told apart by URL, so two pages sharing a title stay two.
+        A source that gives one key several values ("from 10% to 12%") is left out of it.
+        """
+        by_key: Dict[tuple, Dict[str, List[Claim]]] = defaultdict(dict)
+        names: Dict[str, str] = {}
+        for url, name, text in sources:
+            names[url] = name or url
+            for c in self.claims(text):
+                by_key[c.key].setdefault(url, []).append(c)
+
+        out: Dict[str, List[str]] = {}
+        for key, per_source in by_key.items():
+            if len(per_source) < 2:
+                continue
+            firm = []
+            for source, cs in per_source.items():
+                if all(_agree(c.value, cs[0].value, self.tolerance) for c in cs):
+                    firm.append((cs[0].value, source, cs[0]))
+            firm.sort(key=lambda f: f[0])
+            if len(firm) > 1 and not _agree(firm[0][0], firm[-1][0], self.tolerance):
+                out[_label(key)] = [f"{c.text} ({names[source]})" for _, source, c in firm]
+        with self._lock:
+            self.stats["conflicts"] += len(out)
+        return out
+
+    def summary(self) -> Dict[str, int]:
+        return {**self.stats, "articles": len(self._claims)}
+
+
+_index: Optional[ClaimIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_claim_index() -> ClaimIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ClaimIndex()
+    return _index
@@ -3,6 +3,7 @@ planner.py  – light query-analysis component
 
 • classifies query intent: FACT, RECENT, COMPARE
 • splits on 'and', 'vs', ',' into sub-queries
+• normalises a query into a key shared by equivalent phrasings
 """
 
 from typing import List, Literal
@@ -27,3 +28,10 @@ def split_subqueries(query: str) -> List[str]:
     # crude: split on ' and ', ' vs ', commas
     parts = re.split(r"\band\b|,| vs | versus ", query, flags=re.I)
     return [p.strip() for p in parts if len(p.split()) >= 2]
+
+def normalise(query: str) -> str:
+    """Key for "the same question": intent + sub-queries with case,
+    punctuation, spacing and order folded ("Ford vs Tesla?" == "tesla VS ford")."""
+    parts = re.split(r"\band\b|,| vs | versus ", query, flags=re.I)
+    subs = sorted(filter(None, (" ".join(re.findall(r"\w+", p.lower())) for p in parts)))
+    return f"{detect_intent(query)}:{'|'.join(subs)}"
@@ -0,0 +1,190 @@
+"""
+ranker.py  – relevance ranking and duplicate elimination
+
+• word tokenizer (no substring matches: "art" ≠ "start")
+• BM25 with IDF computed over the candidate set
+• URL canonicalisation (tracking params, fragments, www./m. hosts)
+• MinHash + LSH for near-duplicate snippets and articles
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from collections import Counter
+from functools import lru_cache
+from math import log
+import hashlib, re, urllib.parse
+import numpy as np
+
+_WORD = re.compile(r"\w+", re.U)
+_STOP = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of",
+         "on", "or", "the", "to", "vs", "versus", "was", "what", "when", "where", "which", "who",
+         "with", "how", "why"}
+
+_TRACKING = re.compile(r"^(utm_\w+|gclid|fbclid|dclid|msclkid|mc_cid|mc_eid|igshid|ocid|cmpid|"
+                       r"ref|ref_src|ref_url|src|spm|_ga|yclid)$", re.I)
+_WWW = re.compile(r"^www\d?$")
+_MOBILE = {"m", "mobile", "amp"}                      # en.m.wikipedia.org, m.bbc.co.uk …
+
+
+def tokenize(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+@lru_cache(maxsize=1 << 16)
+def stem(word: str) -> str:
+    # crude plural folding so "cars" matches "car"
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def query_terms(query: str) -> List[str]:
+    return [t for t in dict.fromkeys(tokenize(query)) if t not in _STOP]
+
+
+# the stopwords above are tuned for documents; questions carry a few more
+_QUESTION = {"what", "which", "who", "whom", "whose", "when", "where", "why", "how", "does", "do",
+             "did", "can", "could", "should", "would", "will", "about", "me", "tell", "please",
+             "they", "them", "their", "its", "there", "this", "that", "these", "those"}
+
+
+def question_terms(query: str) -> List[str]:
+    """`query_terms` without question words ("how do …", "tell me about …")."""
+    return [t for t in query_terms(query) if t not in _QUESTION]
+
+
+# ── BM25 ───────────────────────────────────────────────────────────
+def bm25_scores(terms: List[str], docs: List[List[str]], k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """Okapi BM25 of each tokenized doc; IDF comes from `docs` themselves."""
+    n = len(docs)
+    if not n or not terms:
+        return [0.0] * n
+    tfs = [Counter(d) for d in docs]
+    avgdl = sum(map(len, docs)) / n or 1.0
+    df = {t: sum(1 for tf in tfs if t in tf) for t in terms}
+    idf = {t: log(1 + (n - df[t] + 0.5) / (df[t] + 0.5)) for t in terms}
+    scores = []
+    for d, tf in zip(docs, tfs):
+        norm = k1 * (1 - b + b * len(d) / avgdl)
+        scores.append(sum(idf[t] * tf[t] * (k1 + 1) / (tf[t] + norm) for t in terms if tf[t]))
+    return scores
+
+
+# ── URLs ───────────────────────────────────────────────────────────
+def canonical_url(url: str) -> str:
+    """Stable identity for a page: https, bare host, no tracking params / fragment."""
+    try:
+        parts = urllib.parse.urlsplit(url.strip())
+    except ValueError:
+        return url
+    labels = (parts.hostname or "").lower().split(".")
+    if labels and _WWW.match(labels[0]):
+        labels = labels[1:]
+    host = ".".join(l for l in labels if l not in _MOBILE or len(labels) <= 2)
+    if parts.port and parts.port not in (80, 443):
+        host += f":{parts.port}"
+    query = sorted((k, v) for k, v in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+                   if not _TRACKING.match(k))
+    path = parts.path.rstrip("/") or "/"
+    return urllib.parse.urlunsplit(("https", host, path, urllib.parse.urlencode(query), ""))
+
+
+# ── MinHash ────────────────────────────────────────────────────────
+# (SimHash was tried first: on snippet-sized text one changed word flips
+#  ~10 of 64 bits, so MinHash's Jaccard estimate is used instead)
+MINHASH_PERMS = 64
+LSH_ROWS = 4                                    # 16 bands × 4 rows
+NEAR_DUP_JACCARD = 0.7
+
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(20240501)
+_A = _rng.integers(1, int(_PRIME), size=MINHASH_PERMS, dtype=np.uint64)
+_B = _rng.integers(0, int(_PRIME), size=MINHASH_PERMS, dtype=np.uint64)
+
+
+def minhash(tokens: List[str], shingle: int = 3) -> np.ndarray:
+    feats = {" ".join(tokens[i:i + shingle]) for i in range(max(1, len(tokens) - shingle + 1))}
+    h = np.fromiter((int.from_bytes(hashlib.blake2b(f.encode(), digest_size=4).digest(), "big")
+                     for f in feats), dtype=np.uint64, count=len(feats)) % _PRIME
+    return ((np.outer(h, _A) + _B) % _PRIME).min(axis=0)     # one column per permutation
+
+
+def fingerprint(text: str, min_tokens: int = 40) -> Optional[np.ndarray]:
+    """MinHash of an article, or None if it is too short to compare safely."""
+    toks = tokenize(text or "")
+    return minhash(toks) if len(toks) >= min_tokens else None
+
+
+def near_duplicate(a: np.ndarray, b: np.ndarray, threshold: float = NEAR_DUP_JACCARD) -> bool:
+    return float(np.mean(a == b)) >= threshold
+
+
+class NearDupIndex:
+    """MinHash LSH: signatures bucketed per band, candidates verified by Jaccard estimate."""
+
+    def __init__(self, threshold: float = NEAR_DUP_JACCARD):
+        self.threshold = threshold
+        self.buckets: Dict[Tuple[int, bytes], List[Tuple[np.ndarray, object]]] = {}
+
+    @staticmethod
+    def _keys(sig: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        return ((i, sig[i:i + LSH_ROWS].tobytes()) for i in range(0, MINHASH_PERMS, LSH_ROWS))
+
+    def candidates(self, sig: np.ndarray) -> Iterator[object]:
+        """Tags of every indexed signature near `sig`, each once, in band order."""
+        seen = set()
+        for key in self._keys(sig):
+            for other, tag in self.buckets.get(key, ()):
+                if tag not in seen and near_duplicate(sig, other, self.threshold):
+                    seen.add(tag)
+                    yield tag
+
+    def find(self, sig: np.ndarray) -> Optional[object]:
+        return next(self.candidates(sig), None)
+
+    def add(self, sig: np.ndarray, tag: object):
+        for key in self._keys(sig):
+            self.buckets.setdefault(key, []).append((sig, tag))
+
+    def remove(self, sig: np.ndarray, tag: object):
+        for key in self._keys(sig):
+            bucket = [(s, t) for s, t in self.buckets.get(key, ()) if t != tag]
+            if bucket:
+                self.buckets[key] = bucket
+            else:
+                self.buckets.pop(key, None)
+
+
+# ── pipeline helpers ───────────────────────────────────────────────
+def dedupe_hits(hits: List[Dict], limit: Optional[int] = None,
+                url_key: str = "href") -> Tuple[List[Dict], Dict[str, int]]:
+    """Drop hits whose canonical URL or title+snippet was already seen (first one wins).
+
+    Stops after `limit` unique hits, so the drop counts are exactly the
+    duplicates that would otherwise have been fetched.
+    """
+    seen_urls, snippets = set(), NearDupIndex()
+    kept, dropped = [], {"dup_url": 0, "dup_snippet": 0}
+    for h in hits:
+        if limit is not None and len(kept) >= limit:
+            break
+        url = canonical_url(h[url_key]) if h.get(url_key) else None
+        if url is not None and url in seen_urls:
+            dropped["dup_url"] += 1
+            continue
+        toks = tokenize(f"{h.get('title') or ''} {h.get('body') or h.get('summary') or ''}")
+        sig = minhash(toks) if len(toks) >= 8 else None     # too short to fingerprint safely
+        if sig is not None and snippets.find(sig) is not None:
+            dropped["dup_snippet"] += 1
+            continue
+        if url is not None:
+            seen_urls.add(url)
+        if sig is not None:
+            snippets.add(sig, url)
+        kept.append(h)
+    return kept, dropped
+
+
+def rank_hits(hits: List[Dict], query: str, limit: int) -> List[Dict]:
+    """BM25 over title + snippet; ties keep search-engine order."""
+    docs = [tokenize(f"{h.get('title') or ''} {h.get('body') or ''}") for h in hits]
+    scores = bm25_scores(query_terms(query), docs)
+    order = sorted(range(len(hits)), key=lambda i: -scores[i])
+    return [hits[i] for i in order[:limit]]
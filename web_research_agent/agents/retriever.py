@@ -0,0 +1,113 @@
+"""
+retriever.py  – query-focused passages
+
+• articles are split into passages: paragraphs, short ones merged and long
+  ones cut at sentence ends, around PASSAGE_WORDS words each
+• `PassageIndex` keeps BM25 statistics over the passages of every article
+  added so far (all sources of one query, or of a whole batch)
+• `select` keeps an article's best passages for the question and its
+  sub-queries – at most RETRIEVE_TOP_K, within RETRIEVE_TOKENS words – in
+  their original order; only those reach the analyser and, through it, T5
+"""
+
+from collections import Counter
+from math import log
+from typing import Dict, List, Sequence
+import re
+
+from ..config import PASSAGE_WORDS, RETRIEVE_TOKENS, RETRIEVE_TOP_K
+from .ranker import query_terms, stem, tokenize
+
+_SENT_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_passages(text: str, words: int = PASSAGE_WORDS) -> List[str]:
+    """Paragraph-aligned passages of roughly `words` words."""
+    out: List[str] = []
+    cur: List[str] = []
+    n = 0
+    for para in filter(None, (p.strip() for p in (text or "").split("\n"))):
+        pieces = [para] if len(para.split()) <= words * 1.5 else _SENT_END.split(para)
+        for piece in pieces:
+            k = len(piece.split())
+            if cur and n + k > words:
+                out.append(" ".join(cur))
+                cur, n = [], 0
+            cur.append(piece)
+            n += k
+        if n >= words / 2:                          # don't glue a full paragraph onto the next
+            out.append(" ".join(cur))
+            cur, n = [], 0
+    if cur:
+        out.append(" ".join(cur))
+    return out
+
+
+class PassageIndex:
+    """BM25 over passages, with document frequencies from every article added."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.df: Counter = Counter()
+        self.n = 0
+        self.total_len = 0
+        self.stats: Counter = Counter()
+
+    def _add(self, passages: List[str]) -> List[Counter]:
+        tfs = [Counter(map(stem, tokenize(p))) for p in passages]     # `stem` is memoised
+        for tf in tfs:
+            self.df.update(tf.keys())
+            self.total_len += sum(tf.values())
+        self.n += len(tfs)
+        return tfs
+
+    def _score(self, terms: List[str], tf: Counter, avgdl: float) -> float:
+        dl = sum(tf.values())
+        norm = self.k1 * (1 - self.b + self.b * dl / avgdl)
+        s = 0.0
+        for t in terms:
+            if tf[t]:
+                df = self.df[t]
+                s += log(1 + (self.n - df + 0.5) / (df + 0.5)) * tf[t] * (self.k1 + 1) / (tf[t] + norm)
+        return s
+
+    def select(self, text: str, queries: Sequence[str], budget: int = RETRIEVE_TOKENS,
+               top_k: int = RETRIEVE_TOP_K) -> str:
+        """
+        The passages of `text` that best answer any of `queries`, joined by
+        newlines.  Text already within `budget` words is returned unchanged.
+        """
+        passages = split_passages(text)
+        tfs = self._add(passages)
+        sizes = [len(p.split()) for p in passages]
+        self.stats["chars_in"] += len(text or "")
+        self.stats["passages"] += len(passages)
+        if not budget or sum(sizes) <= budget:
+            self.stats["kept"] += len(passages)
+            self.stats["chars_out"] += len(text or "")
+            return text
+        avgdl = self.total_len / self.n or 1.0
+        term_sets = [list(dict.fromkeys(stem(t) for t in query_terms(q))) for q in queries]
+        # a passage counts as relevant to the question or any one sub-query
+        scores = [max((self._score(ts, tf, avgdl) for ts in term_sets), default=0.0) for tf in tfs]
+
+        order = sorted(range(len(passages)), key=lambda i: -scores[i])
+        if not scores[order[0]]:
+            order = list(range(len(passages)))      # nothing matches: keep the lead
+        keep: List[int] = []
+        used = 0
+        for i in order:
+            if len(keep) >= top_k:
+                break
+            if used + sizes[i] <= budget or not keep:
+                keep.append(i)
+                used += sizes[i]
+        out = "\n".join(passages[i] for i in sorted(keep))
+        self.stats["kept"] += len(keep)
+        self.stats["chars_out"] += len(out)
+        return out
+
+    def summary(self) -> Dict[str, int]:
+        return dict(self.stats)
+
@@ -5,43 +5,227 @@ synthesizer.py
 Combine per-article summaries into a concise plain-text answer.
 Uses HuggingFace `t5-small` (≈240 MB, CPU-friendly).
 
-Returns text with numbered citations plus legend.
+T5 only sees 512 tokens, so long inputs are handled map-reduce style:
+every tagged summary is tokenized once, packed into token-budgeted chunks,
+the chunks are summarised in batched `generate` calls, and the partial
+summaries are fused again until one chunk remains.  Nothing is silently
+truncated.
+
+Returns text with numbered citations plus legend.  transformers / torch are
+imported only when a report is long enough to need the model.
 """
 
 from __future__ import annotations
 
-from typing import List, Dict
-from transformers import pipeline
-from tqdm import tqdm
-from ..config import HF_SUMMARY_MODEL
+import threading, time
+from typing import Dict, List, Optional
+
+from ..config import HF_SUMMARY_MODEL, SYNTH_CHUNK_TOKENS, SYNTH_BATCH, SYNTH_QUANTIZE, SYNTH_THREADS
+
+# final answer length, as before
+_MAX_LEN, _MIN_LEN = 200, 60
+
+
+def _pack(pieces: List[List[int]], budget: int) -> List[List[int]]:
+    """Greedily pack token lists into chunks of at most `budget` tokens.
+
+    Pieces are never reordered; a piece longer than `budget` is split.
+    """
+    chunks: List[List[int]] = []
+    cur: List[int] = []
+    for ids in pieces:
+        while len(ids) > budget:                    # oversize piece → own chunks
+            if cur:
+                chunks.append(cur)
+                cur = []
+            chunks.append(ids[:budget])
+            ids = ids[budget:]
+        if len(cur) + len(ids) > budget:
+            chunks.append(cur)
+            cur = []
+        cur = cur + ids
+    if cur:
+        chunks.append(cur)
+    return chunks
+
+
+class SynthesisEngine:
+    """Tokenizer + seq2seq model, loaded once and reused."""
+
+    def __init__(self, model_name: str = HF_SUMMARY_MODEL, quantize: bool = SYNTH_QUANTIZE,
+                 chunk_tokens: int = SYNTH_CHUNK_TOKENS, batch_size: int = SYNTH_BATCH):
+        self.model_name = model_name
+        self.quantize = quantize
+        self.chunk_tokens = chunk_tokens
+        self.batch_size = batch_size
+        self.tokenizer = None
+        self.model = None
+        self._lock = threading.Lock()
+
+    # ── loading ─────────────────────────────────────────────────────
+    def load(self) -> "SynthesisEngine":
+        if self.model is not None:
+            return self
+        with self._lock:
+            if self.model is not None:
+                return self
+            import torch
+            from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+            if SYNTH_THREADS:
+                torch.set_num_threads(SYNTH_THREADS)
+            tok = AutoTokenizer.from_pretrained(self.model_name)
+            model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name).eval()
+            if self.quantize:
+                model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+            params = dict((model.config.task_specific_params or {}).get("summarization", {}))
+            prefix = params.pop("prefix", "")
+            for k in ("max_length", "min_length"):
+                params.pop(k, None)                  # set per call below
+            self._gen_kwargs = {**params, "do_sample": False}
+            self._prefix_ids = tok(prefix, add_special_tokens=False)["input_ids"] if prefix else []
+            self._eos = [tok.eos_token_id] if tok.eos_token_id is not None else []
+            self.tokenizer = tok
+            self.model = model
+        return self
+
+    def warm_up(self) -> float:
+        """Load weights and run one tiny generate; returns seconds spent."""
+        t0 = time.perf_counter()
+        self.load()
+        self._generate([self.tokenizer("warm up", add_special_tokens=False)["input_ids"]], 8, 1)
+        return time.perf_counter() - t0
+
+    # ── inference ───────────────────────────────────────────────────
+    @property
+    def _budget(self) -> int:
+        return self.chunk_tokens - len(self._prefix_ids) - len(self._eos)
+
+    def _generate(self, chunks: List[List[int]], max_len: int, min_len: int) -> List[List[int]]:
+        import torch
+
+        pad = self.tokenizer.pad_token_id or 0
+        out: List[List[int]] = []
+        for b in range(0, len(chunks), self.batch_size):
+            batch = [self._prefix_ids + c + self._eos for c in chunks[b:b + self.batch_size]]
+            width = max(len(x) for x in batch)
+            ids = torch.tensor([x + [pad] * (width - len(x)) for x in batch])
+            mask = torch.tensor([[1] * len(x) + [0] * (width - len(x)) for x in batch])
+            with torch.inference_mode():
+                gen = self.model.generate(input_ids=ids, attention_mask=mask,
+                                          max_length=max_len, min_length=min_len, **self._gen_kwargs)
+            out.extend([t for t in seq.tolist() if t not in (pad, *self._eos)] for seq in gen)
+        return out
+
+    def summarise(self, pieces: List[str], stats: Optional[Dict] = None) -> str:
+        """Map-reduce summary of `pieces`, kept in order."""
+        return self.summarise_batch([pieces], [stats])[0]
+
+    def summarise_batch(self, groups: List[List[str]],
+                        stats: Optional[List[Optional[Dict]]] = None) -> List[str]:
+        """`summarise` for several inputs at once.
+
+        The map-reduce rounds run in lockstep, so chunks from different
+        groups share `generate` batches.
+        """
+        self.load()
+        t0 = time.perf_counter()
+        ids = [self.tokenizer(p, add_special_tokens=False)["input_ids"] if p else [] for p in groups]
+        tokens_in = [sum(map(len, x)) for x in ids]
+        tokens_out, rounds = [0] * len(groups), [0] * len(groups)
+        chunks = {g: _pack(x, self._budget) or [[]] for g, x in enumerate(ids)}
+        done: Dict[int, List[int]] = {}
+        while chunks:
+            # map rounds split one input window between chunks, so each round
+            # shrinks the chunk count and the loop always terminates
+            by_len: Dict[tuple, List[int]] = {}
+            for g, cs in chunks.items():
+                rounds[g] += 1
+                final = len(cs) == 1
+                max_len = _MAX_LEN if final else max(self._budget // len(cs), 16)
+                min_len = _MIN_LEN if final else min(_MIN_LEN // 2, max_len // 2)
+                by_len.setdefault((max_len, min_len), []).append(g)
+            for (max_len, min_len), gs in by_len.items():
+                flat = [c for g in gs for c in chunks[g]]
+                parts = iter(self._generate(flat, max_len, min_len))
+                for g in gs:
+                    out = [next(parts) for _ in chunks[g]]
+                    tokens_out[g] += sum(map(len, out))
+                    if len(chunks[g]) == 1:
+                        done[g] = out[0]
+                        del chunks[g]
+                    else:
+                        chunks[g] = _pack(out, self._budget) or [[]]
+
+        secs = time.perf_counter() - t0
+        for g, st in enumerate(stats or ()):
+            if st is not None:
+                st.update({
+                    "ms": round(secs * 1000),
+                    "tokens_in": tokens_in[g],
+                    "tokens_out": tokens_out[g],
+                    "tok_per_s": round((tokens_in[g] + tokens_out[g]) / secs, 1) if secs else None,
+                    "rounds": rounds[g],
+                    **({"batched": len(groups)} if len(groups) > 1 else {}),
+                })
+        return [self.tokenizer.decode(done[g], skip_special_tokens=True).strip() for g in range(len(groups))]
+
 
 # Lazy global so we download the model only once
-_summary_pipe = None
+_engine: Optional[SynthesisEngine] = None
+
 
+def get_engine() -> SynthesisEngine:
+    global _engine
+    if _engine is None:
+        _engine = SynthesisEngine()
+    return _engine
 
-def _get_pipe():
-    global _summary_pipe
-    if _summary_pipe is None:
-        _summary_pipe = pipeline("summarization", model=HF_SUMMARY_MODEL, device=-1, framework="pt")
-    return _summary_pipe
+
+def warm_up() -> float:
+    """Load and exercise the model ahead of the first query (app / service startup)."""
+    return get_engine().warm_up()
+
+
+def _tag(summaries: List[Dict]) -> List[str]:
+    # tag each summary for later citation
+    return [f"[{i+1}] {item['summary']}" for i, item in enumerate(summaries)]
 
 
-def synthesise(summaries: List[Dict], user_query: str) -> str:
+def _report(merged: str, summaries: List[Dict]) -> str:
+    legend = "\n".join(f"[{i+1}] {item['title']} — {item['url']}" for i, item in enumerate(summaries))
+    return f"{merged}\n\nSources\n-------\n{legend}"
+
+
+def synthesise(summaries: List[Dict], user_query: str, stats: Optional[Dict] = None) -> str:
     """
     summaries: list of {"title", "url", "summary"}
+    stats: optional dict filled with latency / token throughput of the model call
     Returns: plain-text report with inline citations and legend.
     """
     if not summaries:
         return "Sorry, no useful information was found."
 
-    # tag each summary for later citation
-    tagged = [f"[{i+1}] {item['summary']}" for i, item in enumerate(summaries)]
+    tagged = _tag(summaries)
     merged = " ".join(tagged)
 
     # Abstractive fusion via T5-small if text is long
     if len(merged) > 800:
-        merged = _get_pipe()(merged, max_length=200, min_length=60, do_sample=False)[0]["summary_text"]
+        merged = get_engine().summarise(tagged, stats=stats)
 
-    legend = "\n".join(f"[{i+1}] {item['title']} — {item['url']}" for i, item in enumerate(summaries))
+    return _report(merged, summaries)
 
-    return f"{merged}\n\nSources\n-------\n{legend}"
+
+def synthesise_many(batch: List[List[Dict]], stats: Optional[List[Dict]] = None) -> List[str]:
+    """`synthesise` for many queries, with every model call batched together."""
+    tagged = [_tag(s) for s in batch]
+    merged = [" ".join(t) for t in tagged]
+    long = [i for i, m in enumerate(merged) if len(m) > 800]
+    if long:
+        fused = get_engine().summarise_batch([tagged[i] for i in long],
+                                             [stats[i] for i in long] if stats else None)
+        for i, text in zip(long, fused):
+            merged[i] = text
+    return [_report(m, s) if s else "Sorry, no useful information was found."
+            for m, s in zip(merged, batch)]
@@ -8,8 +8,119 @@ DDG_REGION   = os.getenv("DDG_REGION", "wt-wt")
 DDG_SAFE     = os.getenv("DDG_SAFE",   "moderate")
 SEARCH_LIMIT = int(os.getenv("SEARCH_LIMIT", "5"))
 
+# Search endpoints / backends (point these at benchmarks/standin.py to run offline)
+DDG_HTML_URL    = os.getenv("DDG_HTML_URL",  "https://duckduckgo.com/html/")
+WIKI_API_URL    = os.getenv("WIKI_API_URL",  "https://en.wikipedia.org/w/api.php")
+WIKI_PAGE_URL   = os.getenv("WIKI_PAGE_URL", "https://en.wikipedia.org/wiki/")
+SEARCH_BACKENDS = [b.strip() for b in os.getenv("SEARCH_BACKENDS", "ddgs,ddg_html,wikipedia").split(",") if b.strip()]
+
 # HuggingFace summarisation model (extremely small)
 HF_SUMMARY_MODEL = os.getenv("HF_SUMMARY_MODEL", "t5-small")
 
 # Max chars kept per scraped article
 MAX_CHARS = 8_000
+
+# Concurrent scrape stage
+FETCH_WORKERS  = int(os.getenv("FETCH_WORKERS",  "8"))      # global limit
+FETCH_PER_HOST = int(os.getenv("FETCH_PER_HOST", "2"))      # per-host limit
+FETCH_TIMEOUT  = float(os.getenv("FETCH_TIMEOUT",  "10"))   # per request (s)
+FETCH_DEADLINE = float(os.getenv("FETCH_DEADLINE", "20"))   # whole stage (s)
+
+# On-disk HTTP response cache (shared by search / scrape / RSS)
+CACHE_DIR       = os.getenv("CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "web_research_agent"))
+HTTP_CACHE      = os.getenv("HTTP_CACHE", "1") != "0"          # set 0 to bypass
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+HTTP_CACHE_TTL  = {                                           # seconds, per source
+    "search":  int(os.getenv("CACHE_TTL_SEARCH",  "3600")),
+    "wiki":    int(os.getenv("CACHE_TTL_WIKI",    "86400")),
+    "article": int(os.getenv("CACHE_TTL_ARTICLE", "86400")),
+    "rss":     int(os.getenv("CACHE_TTL_RSS",     "600")),
+}
+
+# Streaming article extraction
+SCRAPE_STREAM    = os.getenv("SCRAPE_STREAM", "1") != "0"     # 0 = full-page BS4 parse
+SCRAPE_MAX_BYTES = int(os.getenv("SCRAPE_MAX_BYTES", str(2 * 1024 * 1024)))
+
+# Synthesis engine (T5 map-reduce)
+SYNTH_CHUNK_TOKENS = int(os.getenv("SYNTH_CHUNK_TOKENS", "512"))   # model input window
+SYNTH_BATCH        = int(os.getenv("SYNTH_BATCH", "8"))            # chunks per forward pass
+SYNTH_QUANTIZE     = os.getenv("SYNTH_QUANTIZE", "0") == "1"       # dynamic int8 Linear layers
+SYNTH_THREADS      = int(os.getenv("SYNTH_THREADS", "0"))          # torch intra-op threads (0 = default)
+
+# Warm spaCy + T5 on a background thread when the first query starts (see preload.py)
+PRELOAD = os.getenv("PRELOAD", "0") == "1"
+
+# Extractive analyser (spaCy nlp.pipe)
+ANALYZE_PROCESSES = int(os.getenv("ANALYZE_PROCESSES", "1"))
+ANALYZE_BATCH     = int(os.getenv("ANALYZE_BATCH", "16"))
+
+# Query-focused passage retrieval between scrape and analyse (RETRIEVE_TOKENS=0 keeps whole articles)
+PASSAGE_WORDS   = int(os.getenv("PASSAGE_WORDS", "80"))      # target passage length
+RETRIEVE_TOKENS = int(os.getenv("RETRIEVE_TOKENS", "300"))   # words kept per article
+RETRIEVE_TOP_K  = int(os.getenv("RETRIEVE_TOP_K", "4"))      # passages kept per article
+
+# News feeds (comma-separated NEWS_FEEDS overrides the defaults)
+NEWS_FEEDS = [u.strip() for u in os.getenv("NEWS_FEEDS", ",".join([
+    "https://rss.nytimes.com/services/xml/rss/nyt/World.xml",
+    "https://feeds.bbci.co.uk/news/world/rss.xml",
+    "https://www.aljazeera.com/xml/rss/all.xml",
+])).split(",") if u.strip()]
+NEWS_TTL         = int(os.getenv("NEWS_TTL", "600"))            # index refresh interval (s)
+NEWS_BACKGROUND  = os.getenv("NEWS_BACKGROUND", "0") == "1"     # refresh on a timer thread
+NEWS_MAX_ENTRIES = int(os.getenv("NEWS_MAX_ENTRIES", "5000"))
+
+# Search backends: hedging, deadline, circuit breakers
+SEARCH_DEADLINE   = float(os.getenv("SEARCH_DEADLINE",   "8"))    # per query, all backends (s)
+SEARCH_HEDGE_MS   = int(os.getenv("SEARCH_HEDGE_MS",     "1200")) # start next backend after this
+BREAKER_FAILS     = int(os.getenv("BREAKER_FAILS",       "3"))    # consecutive failures to open
+BREAKER_COOLDOWN  = float(os.getenv("BREAKER_COOLDOWN",  "60"))   # s before a probe is allowed
+SEARCH_INFLIGHT   = int(os.getenv("SEARCH_INFLIGHT",     "4"))    # calls one backend may have running at once
+
+# Streaming pipeline: stop scraping after this many usable summaries (0 = fetch all)
+EARLY_STOP_SUMMARIES = int(os.getenv("EARLY_STOP_SUMMARIES", "0"))
+
+# Tracing (append-only JSONL, rotated)
+TRACE_DIR       = os.getenv("TRACE_DIR", "traces")
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(20 * 1024 * 1024)))   # rotate past this
+TRACE_BACKUPS   = int(os.getenv("TRACE_BACKUPS", "5"))
+TRACE_PROFILE   = os.getenv("TRACE_PROFILE", "")          # "", "cprofile" or "tracemalloc"
+TRACE_SAMPLE    = float(os.getenv("TRACE_SAMPLE", "0.01")) # fraction of traces profiled
+
+# Batch mode (run_research_batch / python -m web_research_agent)
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", str(os.cpu_count() or 1)))   # spaCy processes
+BATCH_SIZE    = int(os.getenv("BATCH_SIZE", "64"))                          # queries per CLI batch
+
+# Research service (python -m web_research_agent.service)
+SERVICE_HOST          = os.getenv("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT          = int(os.getenv("SERVICE_PORT", "8000"))
+SERVICE_WORKERS       = int(os.getenv("SERVICE_WORKERS", "2"))            # pipeline runs at once
+SERVICE_QUEUE         = int(os.getenv("SERVICE_QUEUE", "8"))              # runs waiting; beyond → 429
+SERVICE_QUEUE_TIMEOUT = float(os.getenv("SERVICE_QUEUE_TIMEOUT", "30"))   # max wait for a slot; → 503
+SERVICE_MAX_BODY      = int(os.getenv("SERVICE_MAX_BODY", str(64 * 1024)))  # request body bytes; beyond → 413
+SERVICE_URL           = os.getenv("SERVICE_URL", f"http://{SERVICE_HOST}:{SERVICE_PORT}")   # for app.py
+
+# Local article corpus (SQLite FTS5 under CACHE_DIR): searched next to the web,
+# used instead of a fetch for articles younger than CORPUS_TTL
+CORPUS           = os.getenv("CORPUS", "1") != "0"
+CORPUS_TTL       = int(os.getenv("CORPUS_TTL", str(7 * 86400)))           # s an article counts as fresh
+CORPUS_MAX_BYTES = int(os.getenv("CORPUS_MAX_BYTES", str(500 * 1024 * 1024)))
+CORPUS_HITS      = int(os.getenv("CORPUS_HITS", "5"))                     # local hits per (sub-)query
+CORPUS_ENOUGH    = int(os.getenv("CORPUS_ENOUGH", "3"))                   # full matches within REPORT_TTL[intent] that skip the web (0: never)
+OFFLINE          = os.getenv("OFFLINE", "0") == "1"                       # corpus only, no network at all
+
+# Numeric claims: figures from full article text, compared per subject across sources
+CLAIM_SUBJECT_WORDS = int(os.getenv("CLAIM_SUBJECT_WORDS", "2"))      # at least this many content words (whole noun phrases) key a figure
+CLAIM_TOLERANCE     = float(os.getenv("CLAIM_TOLERANCE", "0.02"))     # relative difference still counted as agreement
+CLAIM_CACHE_MAX     = int(os.getenv("CLAIM_CACHE_MAX", "5000"))       # articles whose claims are kept for the session
+
+# Report cache: finished answers keyed on the normalised question
+REPORT_CACHE      = os.getenv("REPORT_CACHE", "1") != "0"
+REPORT_TTL        = {                                          # seconds, per planner intent
+    "RECENT":  int(os.getenv("REPORT_TTL_RECENT",  "900")),
+    "FACT":    int(os.getenv("REPORT_TTL_FACT",    str(3 * 86400))),
+    "COMPARE": int(os.getenv("REPORT_TTL_COMPARE", "86400")),
+    "OTHER":   int(os.getenv("REPORT_TTL_OTHER",   "86400")),
+}
+REPORT_STALE      = float(os.getenv("REPORT_STALE", "1.0"))    # serve-stale window, as a multiple of the TTL
+REPORT_SIMILARITY = float(os.getenv("REPORT_SIMILARITY", "0.8"))   # trigram Jaccard for near-duplicate queries
+REPORT_CACHE_MAX  = int(os.getenv("REPORT_CACHE_MAX", "10000"))    # rows kept (oldest evicted)
@@ -0,0 +1,218 @@
+"""
+corpus.py
+---------
+Local corpus of every article the agent has scraped.
+
+• SQLite file under CACHE_DIR: cleaned text, title, canonical URL, fetch
+  time and a content hash per article, plus an FTS5 index over title + text
+• `search` answers a question from the corpus (BM25 order, snippets), so
+  local articles are ranked alongside `search_web` hits
+• `get` returns an article fetched less than CORPUS_TTL ago – the pipeline
+  uses it instead of a network fetch
+• `add` is incremental: identical text under another URL is stored once
+  (the URL becomes an alias of the existing article)
+• size-bounded: least-recently-used articles are evicted past CORPUS_MAX_BYTES
+• OFFLINE=1 answers from the corpus alone, whatever the articles' age
+"""
+from __future__ import annotations
+
+import hashlib, os, re, sqlite3, threading, time
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+
+from .config import CACHE_DIR, CORPUS_MAX_BYTES, CORPUS_TTL
+from .agents.ranker import canonical_url, question_terms
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id          INTEGER PRIMARY KEY,
+    url         TEXT UNIQUE,                -- canonical_url(href)
+    href        TEXT,                       -- as fetched, for citations
+    title       TEXT,
+    text        TEXT,
+    hash        TEXT,
+    fetched_at  REAL,
+    accessed_at REAL,
+    size        INTEGER
+);
+CREATE INDEX IF NOT EXISTS articles_hash ON articles(hash);
+CREATE INDEX IF NOT EXISTS articles_lru ON articles(accessed_at);
+CREATE TABLE IF NOT EXISTS aliases (
+    url        TEXT PRIMARY KEY,
+    article_id INTEGER REFERENCES articles(id) ON DELETE CASCADE
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, text, content='articles', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts(rowid, title, text) VALUES (new.id, new.title, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, text ON articles BEGIN
+    INSERT INTO articles_fts(articles_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text);
+    INSERT INTO articles_fts(rowid, title, text) VALUES (new.id, new.title, new.text);
+END;
+"""
+
+_SPACE = re.compile(r"\s+")
+
+
+def content_hash(text: str) -> str:
+    # whitespace and case don't make a different article
+    return hashlib.sha1(_SPACE.sub(" ", text.strip().lower()).encode()).hexdigest()
+
+
+def _match(terms: Sequence[str], op: str) -> str:
+    return f" {op} ".join('"' + t.replace('"', "") + '"' for t in terms)
+
+
+class Corpus:
+    def __init__(self, path: str, ttl: float = CORPUS_TTL, max_bytes: int = CORPUS_MAX_BYTES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(_SCHEMA)
+        self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM articles").fetchone()[0]
+
+    # ── low-level row access ────────────────────────────────────────
+    def _row(self, key: str) -> Optional[tuple]:
+        return self._db.execute(
+            "SELECT id, title, text, fetched_at FROM articles WHERE url=? "
+            "UNION ALL SELECT a.id, a.title, a.text, a.fetched_at FROM aliases x JOIN articles a "
+            "ON a.id = x.article_id WHERE x.url=? LIMIT 1", (key, key)).fetchone()
+
+    def _delete(self, aid: int, size: int):
+        self._db.execute("DELETE FROM articles WHERE id=?", (aid,))
+        self._bytes -= size
+
+    def _evict(self, batch: int = 32):
+        # running byte total; least-recently-used rows a few at a time, never a full scan
+        while self._bytes > self.max_bytes:
+            rows = self._db.execute("SELECT id, size FROM articles ORDER BY accessed_at LIMIT ?", (batch,)).fetchall()
+            if not rows:
+                self._bytes = 0
+                return
+            for aid, size in rows:
+                self._delete(aid, size)
+                self.stats["evicted"] += 1
+                if self._bytes <= self.max_bytes:
+                    return
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM aliases")
+            self._db.execute("DELETE FROM articles")
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    # ── public API ──────────────────────────────────────────────────
+    def get(self, url: str, any_age: bool = False) -> Optional[str]:
+        """Stored text of `url` if it was fetched within the TTL (or at all, with `any_age`)."""
+        max_age = None if any_age else self.ttl
+        now = time.time()
+        with self._lock:
+            row = self._row(canonical_url(url))
+            if row is None or (max_age is not None and now - row[3] > max_age):
+                self.stats["miss"] += 1
+                return None
+            self._db.execute("UPDATE articles SET accessed_at=? WHERE id=?", (now, row[0]))
+            self.stats["hit"] += 1
+        return row[2]
+
+    def add(self, url: str, title: str, text: str) -> str:
+        """Store a freshly scraped article; returns "new", "refreshed", "changed" or "duplicate"."""
+        key, h, now = canonical_url(url), content_hash(text), time.time()
+        with self._lock:
+            row = self._db.execute("SELECT id, hash, size FROM articles WHERE url=?", (key,)).fetchone()
+            size = len(text.encode())
+            if row is not None and row[1] == h:
+                self._db.execute("UPDATE articles SET fetched_at=?, accessed_at=? WHERE id=?", (now, now, row[0]))
+                outcome = "refreshed"
+            else:
+                twin = self._db.execute("SELECT id FROM articles WHERE hash=? AND url<>?", (h, key)).fetchone()
+                if twin is not None:
+                    # same text already indexed under another URL: remember the URL only
+                    if row is not None:
+                        self._delete(row[0], row[2])
+                    self._db.execute("INSERT OR REPLACE INTO aliases VALUES (?, ?)", (key, twin[0]))
+                    self._db.execute("UPDATE articles SET fetched_at=?, accessed_at=? WHERE id=?",
+                                     (now, now, twin[0]))
+                    outcome = "duplicate"
+                elif row is not None:
+                    self._db.execute("UPDATE articles SET href=?, title=?, text=?, hash=?, fetched_at=?, "
+                                     "accessed_at=?, size=? WHERE id=?",
+                                     (url, title, text, h, now, now, size, row[0]))
+                    self._bytes += size - row[2]
+                    outcome = "changed"
+                else:
+                    self._db.execute("DELETE FROM aliases WHERE url=?", (key,))
+                    self._db.execute("INSERT INTO articles (url, href, title, text, hash, fetched_at, accessed_at, "
+                                     "size) VALUES (?,?,?,?,?,?,?,?)",
+                                     (key, url, title, text, h, now, now, size))
+                    self._bytes += size
+                    outcome = "new"
+            self._evict()
+            self.stats[outcome] += 1
+        return outcome
+
+    def search(self, query: str, limit: int = 10, any_age: bool = False) -> List[Dict]:
+        """
+        Stored articles matching `query`, best first, as search hits
+        {title, href, body, local: True, all_terms: bool, age_s}.  Articles holding
+        every term come first; the rest of `limit` is filled by articles holding any.
+        """
+        terms = question_terms(query)
+        if not terms:
+            return []
+        now = time.time()
+        since = 0.0 if any_age else now - self.ttl
+        sql = ("SELECT a.id, a.href, a.title, snippet(articles_fts, 1, '', '', ' … ', 24), a.fetched_at "
+               "FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+               "WHERE articles_fts MATCH ? AND a.fetched_at >= ? AND a.id NOT IN ({}) "
+               "ORDER BY bm25(articles_fts) LIMIT ?")
+        hits: List[Dict] = []
+        seen: List[int] = []
+        with self._lock:
+            for op in ("AND", "OR") if len(terms) > 1 else ("AND",):
+                if len(hits) >= limit:
+                    break
+                rows = self._db.execute(sql.format(",".join("?" * len(seen))),
+                                        (_match(terms, op), since, *seen, limit - len(hits))).fetchall()
+                for aid, url, title, snip, fetched_at in rows:
+                    seen.append(aid)
+                    hits.append({"title": title, "href": url, "body": snip, "local": True, "all_terms": op == "AND",
+                                 "age_s": round(now - fetched_at, 1)})
+            self.stats["searched"] += 1
+            self.stats["search_hits"] += len(hits)
+        return hits
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {**self.stats, "articles": len(self), "bytes": self._bytes}
+
+
+_corpus: Optional[Corpus] = None
+_corpus_lock = threading.Lock()
+
+
+def get_corpus() -> Corpus:
+    global _corpus
+    if _corpus is None:
+        with _corpus_lock:
+            if _corpus is None:
+                _corpus = Corpus(os.path.join(CACHE_DIR, "corpus.sqlite"))
+    return _corpus
+
+
+def corpus_stats() -> Dict:
+    return _corpus.summary() if _corpus is not None else {}
@@ -5,138 +5,579 @@ orchestrator.py
 Main pipeline controller:
 
 0.  Plan – detect intent / split sub-queries
-1.  Search – web + optional RSS
-2.  Scrape  – download & clean pages
-3.  Analyse – extractive summary
-4.  Detect contradictions (numeric)
+1.  Search – local corpus + web (sub-queries in parallel, hedged backends)
+    + optional RSS; the web is skipped when the corpus already covers the question
+2.  Scrape  – download & clean pages (concurrently); fresh corpus copies
+    are used instead, and new pages are added to the corpus
+    Retrieve – keep each page's passages that answer the question (BM25)
+3.  Analyse – extractive summary of those passages, as each page arrives
+4.  Detect contradictions – figures that sources disagree on (full article text)
 5.  Synthesise – fuse summaries into final answer
 
-Every step is logged to a minimal MCP-style JSON trace.
+Every step is logged to a minimal MCP-style JSON trace and timed as a
+span; finished traces are appended to the JSONL sink (see tracing.py).
+
+`stream_research_pipeline` yields a typed `Event` as each stage completes
+(plan → hits → summary … → contradictions → report) and can stop scraping
+early; `run_research_pipeline` simply drains it.  `run_research_batch`
+runs many queries with searches, fetches, summaries and model calls
+shared across the batch.  Both answer from the report cache
+(report_cache.py) when the same – or nearly the same – question was
+answered recently, in milliseconds.
 """
 
 from __future__ import annotations
 
-import json, re, time, uuid, logging
-from pathlib import Path
-from collections import defaultdict
-from math import log
-from typing import Dict, List
+import math, threading, time, logging
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Literal, Optional, Tuple
 
-from .config import SEARCH_LIMIT
-from .tools.search_tool import search_web
+from .config import (SEARCH_LIMIT, FETCH_DEADLINE, FETCH_TIMEOUT, FETCH_WORKERS, EARLY_STOP_SUMMARIES,
+                     BATCH_WORKERS, REPORT_CACHE, REPORT_TTL, PRELOAD, CORPUS, CORPUS_TTL, CORPUS_HITS,
+                     CORPUS_ENOUGH, OFFLINE)
+from .tools.search_tool import search_many, backend_health
+from .tools.fetcher import fetch_many
 from .tools.scraper_tool import fetch_article_text
 from .tools.news_tool import fetch_recent_news
-from .agents.analyzer import summarise
-from .agents.synthesizer import synthesise
+from .tools.http_cache import counted, counting
+from .agents.analyzer import summarise, summarise_many
+from .agents.synthesizer import synthesise, synthesise_many
 from .agents.planner import detect_intent, split_subqueries
+from .agents.ranker import NearDupIndex, canonical_url, dedupe_hits, fingerprint, rank_hits
+from .agents.retriever import PassageIndex
+from .agents.claims import get_claim_index
+from . import preload
+from .corpus import corpus_stats, get_corpus
+from .report_cache import get_report_cache
+from .tracing import Trace, get_sink
 
 LOG = logging.getLogger("WebResearchAgent")
 logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
 
 
-class Trace:
-    """Lightweight Execution trace, MCP-style."""
+EventKind = Literal["plan", "hits", "summary", "contradictions", "report"]
+
 
-    def __init__(self, query: str):
-        self.id = str(uuid.uuid4())
-        self.start = time.time()
-        self.query = query
-        self.events: List[Dict] = []
+@dataclass
+class Event:
+    """One incremental pipeline result (see `stream_research_pipeline`)."""
+    kind: EventKind
+    data: Dict
 
-    def log(self, role: str, kind: str, data: Dict):
-        self.events.append(
-            {
-                "ts": round(time.time() - self.start, 3),
-                "role": role,
-                "type": kind,
-                "data": data,
-            }
-        )
 
-    def save(self, path: Path):
-        path.write_text(json.dumps({"id": self.id, "query": self.query, "events": self.events}, indent=2))
+# ---------------------------------------------------------------------------
+
+
+def _detect_contradictions(summaries: List[Dict], texts: Dict[str, str]) -> Dict[str, List[str]]:
+    """Figures the sources give different values for, from each article's full text (url → text)."""
+    return get_claim_index().conflicts((a["url"], a["title"] or a["url"], texts.get(a["url"]) or a["summary"])
+                                       for a in summaries)
 
 
 # ---------------------------------------------------------------------------
 
 
-def _score_relevance(hit: Dict, query_terms: set[str]) -> float:
-    """Very small BM25-ish score based on term frequency."""
-    body = (hit.get("title", "") + " " + hit.get("body", "")).lower()
-    tf = sum(body.count(t) for t in query_terms)
-    return tf * log(len(body) + 1)
+def _local_search(trace: Trace, questions: List[str], intent: str, offline: bool) -> Tuple[List[Dict], int]:
+    """
+    Corpus hits for the question and its sub-queries, and how many hold every
+    term of one and are fresh enough for `intent` (REPORT_TTL) to stand in for the web.
+    """
+    corpus = get_corpus()
+    window = min(CORPUS_TTL, REPORT_TTL.get(intent, REPORT_TTL["OTHER"]))
+    hits: List[Dict] = []
+    seen = set()
+    with trace.span("corpus") as sp:
+        for q in questions:
+            for h in corpus.search(q, limit=CORPUS_HITS, any_age=offline):
+                if h["href"] not in seen:
+                    seen.add(h["href"])
+                    hits.append(h)
+        full = sum(h["all_terms"] and h["age_s"] <= window for h in hits)
+        sp.set(hits=len(hits), full_matches=full)
+    return hits, full
+
+
+def _corpus_fetch(titles: Dict[str, str], offline: bool) -> Callable[..., Optional[str]]:
+    """`fetch_many` fetcher: a fresh corpus copy if there is one, else the network (then stored)."""
+    corpus = get_corpus()
+
+    def fetch(url: str, timeout: float = FETCH_TIMEOUT) -> Optional[str]:
+        text = corpus.get(url, any_age=offline)
+        if text is not None or offline:
+            return text
+        text = fetch_article_text(url, timeout=timeout)
+        if text:
+            corpus.add(url, titles.get(url, ""), text)
+        return text
+    return fetch
+
+
+def _corpus_delta(before: Dict[str, int]) -> Dict[str, int]:
+    after = corpus_stats()
+    return {k: after.get(k, 0) - before.get(k, 0) for k in ("hit", "miss", "new", "duplicate", "changed", "evicted")}
+
+
+def _select_targets(trace: Trace, user_query: str, search_hits: List[Dict],
+                    news_hits: List[Dict]) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+    """Combined & relevance-ranked (BM25) (url, title) list; duplicates dropped before any fetch."""
+    with trace.span("rank") as sp:
+        ranked = rank_hits(search_hits, user_query, limit=len(search_hits))
+        web, dup_web = dedupe_hits(ranked, limit=SEARCH_LIMIT)
+        news = [{"href": n["link"], "title": n["title"], "body": n["summary"]} for n in news_hits]
+        candidates, dup_news = dedupe_hits(web + news)
+        targets = [(h["href"], h["title"]) for h in candidates if h.get("href")]
+        sp.set(candidates=len(search_hits) + len(news), targets=len(targets))
+    dedupe = {k: dup_web[k] + dup_news[k] for k in dup_web}
+    dedupe["fetches_avoided"] = sum(dedupe.values())
+    return targets, dedupe
+
+
+def _in_rank_order(trace: Trace, targets: List[Tuple[str, str]], fetched: Dict[int, tuple],
+                   dedupe: Dict[str, int]) -> List[Dict]:
+    """Usable summaries in ranking order, not completion order; near-duplicate pages dropped."""
+    article_summaries: List[Dict] = []
+    kept = NearDupIndex()
+    dedupe["dup_article"] = 0
+    for i, (url, title) in enumerate(targets):
+        text, secs, summ, sig = fetched.get(i, (None, None, None, None))
+        twin = kept.find(sig) if sig is not None else None
+        trace.log("tool", "fetch_article", {
+            "url": url,
+            "chars": len(text) if text else 0,
+            "ms": round(secs * 1000) if secs is not None else None,
+            **({"duplicate_of": targets[twin][0]} if twin is not None else {}),
+        })
+        if twin is not None:
+            dedupe["dup_article"] += 1
+        elif sig is not None:
+            kept.add(sig, i)
+        if not summ or twin is not None:
+            continue
+        article_summaries.append({"url": url, "title": title, "summary": summ})
+        trace.log("agent", "summary", {"url": url, "preview": summ[:120]})
+    return article_summaries
+
+
+def _http_event(http: Counter) -> Dict[str, int]:
+    return {k: http.get(k, 0) for k in ("hit", "miss", "revalidated")}
+
 
+def _finish(trace: Trace, report: str, contradict: Dict[str, List[str]], synth_stats: Dict,
+            http: Dict, remember: Optional[bool] = None) -> Dict:
+    """Append the contradiction notes, close the trace and write it to the sink.
+
+    `http` is the run's HTTP cache event; `remember` (the run's use_news)
+    stores the result in the report cache.
+    """
+    if contradict:
+        report += "\n\n⚠️  Possible contradictory figures:\n"
+        for subject, figures in contradict.items():
+            report += f"  • {subject}: {'; '.join(figures[:4])}\n"
+
+    latency_ms = round((time.time() - trace.start) * 1000)
+    trace.log("agent", "final_answer", {"chars": len(report), "ms": latency_ms})
+    trace.log("tool", "http_cache", http)
+
+    # ── append trace to the rotating JSONL sink
+    trace_path = get_sink().write(trace.record())
+
+    result = {"report": report, "trace": trace.export_mcp(), "trace_id": trace.id, "trace_path": str(trace_path),
+              "stages_ms": trace.stage_ms(), "latency_ms": latency_ms, "synth_stats": synth_stats}
+    if remember is not None:
+        get_report_cache().store(trace.query, remember, result)
+    return result
 
-def _detect_contradictions(summaries: List[Dict]) -> Dict[str, List[str]]:
-    """Find identical 3+-digit numbers appearing in >1 source."""
-    seen: defaultdict[str, List[str]] = defaultdict(list)
-    for art in summaries:
-        nums = re.findall(r"\b\d{3,}\b", art["summary"])
-        for num in nums:
-            seen[num].append(art["title"])
-    return {k: v for k, v in seen.items() if len(v) > 1}
+
+# ── report cache ───────────────────────────────────────────────────
+_refreshing: set = set()
+_refresh_lock = threading.Lock()
+
+
+def _refresh(key: str, user_query: str, use_news: bool):
+    try:
+        run_research_pipeline(user_query, use_news=use_news, refresh=True)
+    except Exception as e:
+        LOG.warning("background refresh of %r failed: %s", user_query, e)
+    finally:
+        with _refresh_lock:
+            _refreshing.discard(key)
+
+
+def cached_report(user_query: str, use_news: bool = True, offline: bool = False,
+                  background: bool = True) -> Optional[Dict]:
+    """
+    A `run_research_pipeline`-style result from the report cache, or None.
+
+    The hit gets its own short trace ("cache" span, `report_cache` event naming
+    the trace that produced the report); `"cached"` says how it matched.  A
+    stale hit is still returned, and one background run (per key) refreshes
+    it – unless `offline`, when the stale report is served as it is, or
+    `background=False`, when the caller schedules the refresh itself.
+    """
+    t0 = time.monotonic()
+    hit = get_report_cache().lookup(user_query, use_news)
+    if hit is None:
+        return None
+    ms = (time.monotonic() - t0) * 1000
+    trace = Trace(user_query)
+    trace.log("user", "query", {"text": user_query})
+    trace.record_span("cache", ms, match=hit["match"], stale=hit["stale"])
+    info = {"match": hit["match"], "query": hit["query"], "age_s": hit["age_s"], "stale": hit["stale"],
+            "trace_id": hit["trace_id"]}
+    trace.log("tool", "report_cache", info)
+    if hit["stale"] and background and not offline:
+        with _refresh_lock:
+            fresh = hit["key"] not in _refreshing
+            _refreshing.add(hit["key"])
+        if fresh:
+            threading.Thread(target=_refresh, args=(hit["key"], hit["query"], use_news),
+                             name="report-refresh", daemon=True).start()
+    report = hit["result"]["report"]
+    latency_ms = round((time.time() - trace.start) * 1000)
+    trace.log("agent", "final_answer", {"chars": len(report), "ms": latency_ms})
+    trace_path = get_sink().write(trace.record())
+    return {"report": report, "trace": trace.export_mcp(), "trace_id": trace.id, "trace_path": str(trace_path),
+            "stages_ms": trace.stage_ms(), "latency_ms": latency_ms, "synth_stats": {}, "cached": info}
 
 
 # ---------------------------------------------------------------------------
 
 
-def run_research_pipeline(user_query: str, use_news: bool = True) -> Dict:
+def stream_research_pipeline(user_query: str, use_news: bool = True,
+                             max_summaries: Optional[int] = None,
+                             time_budget: Optional[float] = None, use_cache: Optional[bool] = None,
+                             refresh: bool = False, offline: Optional[bool] = None) -> Iterator[Event]:
     """
-    Execute the end-to-end research pipeline; return
-    {"report": <plain text>, "trace_path": <file str>}
+    Run the pipeline, yielding an `Event` as each stage completes.
+
+    With the report cache on (`use_cache`, default REPORT_CACHE) a cached
+    answer is yielded as the only event; otherwise a run that found sources
+    is cached, unless it stopped early.  `refresh=True` skips the lookup but
+    still stores the result.
+
+    The local corpus (CORPUS) is searched next to the web, and the web search
+    is skipped once CORPUS_ENOUGH articles match every term and are younger
+    than the intent's REPORT_TTL; `offline` (default OFFLINE) answers from the
+    corpus alone and its reports are never stored in the report cache.
+
+    Scraping stops once `max_summaries` usable summaries exist
+    (default EARLY_STOP_SUMMARIES, 0 = no limit) or after `time_budget`
+    seconds (default FETCH_DEADLINE).  Summary events arrive in completion
+    order and carry their `rank`; the final report lists sources in rank order.
     """
+    max_summaries = EARLY_STOP_SUMMARIES if max_summaries is None else max_summaries
+    time_budget = FETCH_DEADLINE if time_budget is None else time_budget
+    use_cache = REPORT_CACHE if use_cache is None else use_cache
+    offline = OFFLINE if offline is None else offline
+    use_corpus = CORPUS or offline
+    if use_cache and not refresh:
+        hit = cached_report(user_query, use_news, offline)
+        if hit is not None:
+            yield Event("report", hit)
+            return
+    if PRELOAD:
+        preload.start()                         # models load while search / fetch wait on the network
+
     trace = Trace(user_query)
     trace.log("user", "query", {"text": user_query})
+    http = Counter()                            # this run's HTTP cache lookups (see http_cache.counting)
+    corpus_before = corpus_stats()
 
     # 0 ── PLAN ───────────────────────────────────────────────────────────
-    intent = detect_intent(user_query)
-    sub_qs = split_subqueries(user_query) or [user_query]
+    with trace.span("plan") as sp:
+        intent = detect_intent(user_query)
+        sub_qs = split_subqueries(user_query) or [user_query]
+        sp.set(sub_queries=len(sub_qs))
     trace.log("agent", "plan", {"intent": intent, "sub_queries": sub_qs})
+    yield Event("plan", {"intent": intent, "sub_queries": sub_qs})
 
     # 1 ── SEARCH ────────────────────────────────────────────────────────
-    search_hits: List[Dict] = []
-    for sub in sub_qs:
-        search_hits.extend(search_web(sub, limit=SEARCH_LIMIT))
-    trace.log("tool", "search_web", {"hits": len(search_hits)})
+    questions = [user_query] + [q for q in sub_qs if q != user_query]
+    local_hits, full = _local_search(trace, questions, intent, offline) if use_corpus else ([], 0)
+    if offline or 0 < CORPUS_ENOUGH <= full:
+        search_hits: List[Dict] = []
+        trace.log("tool", "search_web", {"skipped": "offline" if offline else "corpus", "local_hits": len(local_hits)})
+    else:
+        # all sub-queries at once, each hedged across backends
+        with trace.span("search") as sp, counting(http):
+            per_sub = search_many(sub_qs, limit=SEARCH_LIMIT)
+            search_hits = [h for hits in per_sub for h in hits]
+            sp.set(queries=len(sub_qs), hits=len(search_hits))
+        trace.log("tool", "search_web", {
+            "hits": len(search_hits),
+            "local_hits": len(local_hits),
+            "per_query": [len(h) for h in per_sub],
+            "backends": {name: h["state"] for name, h in backend_health().items()},
+        })
+    search_hits = local_hits + search_hits
 
     # optional news
     news_hits: List[Dict] = []
-    if use_news:
-        news_hits = fetch_recent_news(user_query, max_items=5)
+    if use_news and not offline:
+        with trace.span("news") as sp:
+            news_hits = fetch_recent_news(user_query, max_items=5)
+            sp.set(hits=len(news_hits))
         trace.log("tool", "news_rss", {"hits": len(news_hits)})
 
-    # combined & relevance-ranked
-    q_terms = set(user_query.lower().split())
-    ranked = sorted(search_hits, key=lambda h: _score_relevance(h, q_terms), reverse=True)[:SEARCH_LIMIT]
-
-    urls = [h["href"] for h in ranked if h.get("href")] + [n["link"] for n in news_hits]
-    titles = [h["title"] for h in ranked] + [n["title"] for n in news_hits]
+    targets, dedupe = _select_targets(trace, user_query, search_hits, news_hits)
+    yield Event("hits", {"hits": [{"rank": i, "url": u, "title": t} for i, (u, t) in enumerate(targets)]})
 
     # 2–3 ── SCRAPE + ANALYSE ────────────────────────────────────────────
-    article_summaries: List[Dict] = []
-    for url, title in zip(urls, titles):
-        text = fetch_article_text(url)
-        trace.log("tool", "fetch_article", {"url": url, "chars": len(text) if text else 0})
-        if not text:
-            continue
-        summ = summarise(text)
-        article_summaries.append({"url": url, "title": title, "summary": summ})
-        trace.log("agent", "summary", {"url": url, "preview": summ[:120]})
+    # pages download concurrently; each is summarised as soon as it lands,
+    # unless a higher-ranked page with the same content already was
+    fetched: Dict[int, tuple] = {}
+    prints = NearDupIndex()
+    passages = PassageIndex()
+    fetch = counted(_corpus_fetch(dict(targets), offline) if use_corpus else fetch_article_text, http)
+    summaries_avoided, good = 0, 0
+    early_stop = None
+    with trace.span("scrape", urls=len(targets)) as scrape:
+        for i, text, secs in fetch_many([url for url, _ in targets], fetch=fetch, deadline=time_budget):
+            # fetches run on worker threads, so their spans are recorded after the fact
+            trace.record_span("fetch", secs * 1000, rank=i, chars=len(text) if text else 0, ok=bool(text))
+            scrape.incr("chars", len(text) if text else 0)
+            sig = fingerprint(text)
+            twin = prints.find(sig) if sig is not None else None
+            summ = None
+            if text and (twin is None or twin > i):
+                with trace.span("summarise", rank=i, chars=len(text)) as sp:
+                    focus = passages.select(text, questions)
+                    summ = summarise(focus)
+                    sp.set(passage_chars=len(focus), summary_chars=len(summ or ""))
+            elif text:
+                summaries_avoided += 1
+            if sig is not None:
+                prints.add(sig, i)
+            fetched[i] = (text, secs, summ, sig)
+            if summ:
+                good += 1
+                url, title = targets[i]
+                with scrape.paused():           # time spent by the consumer is not ours
+                    yield Event("summary", {"rank": i, "url": url, "title": title, "summary": summ})
+                if max_summaries and good >= max_summaries:
+                    early_stop = "max_summaries"
+                    break                       # closes fetch_many → pending fetches cancelled
+        scrape.set(fetched=len(fetched), summaries=good)
+    if early_stop is None and len(fetched) < len(targets):
+        early_stop = "time_budget"
+
+    article_summaries = _in_rank_order(trace, targets, fetched, dedupe)
+    dedupe["summaries_avoided"] = summaries_avoided
+    trace.log("agent", "dedupe", dedupe)
+    trace.log("agent", "retrieve", passages.summary())
+    if use_corpus:
+        trace.log("tool", "corpus", _corpus_delta(corpus_before))
+    if early_stop:
+        trace.log("agent", "early_stop", {"reason": early_stop, "fetched": len(fetched), "of": len(targets)})
 
     # 4 ── CONTRADICTION SCAN ────────────────────────────────────────────
-    contradict = _detect_contradictions(article_summaries)
+    with trace.span("contradictions") as sp:
+        texts = {targets[i][0]: f[0] for i, f in fetched.items() if f[0]}
+        contradict = _detect_contradictions(article_summaries, texts)
+        sp.set(conflicts=len(contradict))
+    yield Event("contradictions", {"figures": contradict})
 
     # 5 ── SYNTHESISE ────────────────────────────────────────────────────
-    report = synthesise(article_summaries, user_query)
-    if contradict:
-        report += "\n\n⚠️  Possible contradictory figures:\n"
-        for num, srcs in contradict.items():
-            report += f"  • {num} mentioned by: {', '.join(srcs[:3])}\n"
+    synth_stats: Dict = {}
+    with trace.span("synthesise", summaries=len(article_summaries)) as sp:
+        report = synthesise(article_summaries, user_query, stats=synth_stats)
+        sp.set(chars=len(report), **{k: v for k, v in synth_stats.items() if k != "ms"})
+    if synth_stats:
+        trace.log("agent", "synthesise", synth_stats)
+    # a run cut short (early_stop) is not the full answer other callers ask for
+    remember = use_news if use_cache and article_summaries and not offline and not early_stop else None
+    yield Event("report", _finish(trace, report, contradict, synth_stats, _http_event(http), remember))
+
+
+def run_research_pipeline(user_query: str, use_news: bool = True, **kw) -> Dict:
+    """
+    Execute the end-to-end research pipeline; return
+    {"report": <plain text>, "trace": <MCP-style events>, "trace_id": <str>,
+     "trace_path": <JSONL sink>, "stages_ms": <top-level span durations>,
+     "latency_ms": <int>, "synth_stats": <model latency / tokens per s>}
+    plus "cached": {"match", "age_s", "stale", "trace_id", …} when served from the report cache.
+    """
+    for event in stream_research_pipeline(user_query, use_news=use_news, **kw):
+        if event.kind == "report":
+            return event.data
+    raise RuntimeError("pipeline ended without a report")
+
 
-    trace.log("agent", "final_answer", {"chars": len(report)})
+# ---------------------------------------------------------------------------
 
-    # ── save trace
-    trace_path = Path(f"execution_trace_{trace.id}.json")
-    trace.save(trace_path)
 
-    return {"report": report, "trace_path": str(trace_path)}
+def run_research_batch(queries: List[str], use_news: bool = True, workers: int = BATCH_WORKERS,
+                       time_budget: Optional[float] = None, use_cache: Optional[bool] = None,
+                       offline: Optional[bool] = None) -> List[Dict]:
+    """
+    Research many questions at once; one `run_research_pipeline`-style result
+    per query (plus its "query"), in input order.
+
+    Shared across the batch:
+    • every distinct sub-query is searched once, all concurrently
+    • every canonical URL is fetched once, through one fetch pool
+    • every page is summarised once (near-duplicates reuse a summary) by a
+      `workers`-process spaCy pipe that is fed while downloads continue;
+      its passages are chosen for every question that asked for it
+    • T5 fusion runs as batched `generate` calls across all queries
+    Shared stages appear on each query's trace as spans with `shared=<n>`.
+    Questions the report cache can answer are left out of the batch; the
+    sub-queries of questions the local corpus covers are not searched.
+    """
+    use_cache = REPORT_CACHE if use_cache is None else use_cache
+    offline = OFFLINE if offline is None else offline
+    hits = [cached_report(q, use_news, offline) if use_cache else None for q in queries]
+    todo = [q for q, hit in zip(queries, hits) if hit is None]
+    fresh = iter(_research_batch(todo, use_news, workers, time_budget, use_cache, offline))
+    return [{"query": q, **hit} if hit is not None else next(fresh) for q, hit in zip(queries, hits)]
+
+
+def _research_batch(queries: List[str], use_news: bool, workers: int, time_budget: Optional[float],
+                    use_cache: bool, offline: bool = False) -> List[Dict]:
+    n = len(queries)
+    if not n:
+        return []
+    if PRELOAD:
+        preload.start()
+    traces = [Trace(q) for q in queries]
+    http = Counter()
+    corpus_before = corpus_stats()
+    use_corpus = CORPUS or offline
+
+    # 0 ── PLAN ───────────────────────────────────────────────────────────
+    plans: List[List[str]] = []
+    intents: List[str] = []
+    for trace, q in zip(traces, queries):
+        trace.log("user", "query", {"text": q})
+        with trace.span("plan") as sp:
+            intent = detect_intent(q)
+            sub_qs = split_subqueries(q) or [q]
+            sp.set(sub_queries=len(sub_qs))
+        trace.log("agent", "plan", {"intent": intent, "sub_queries": sub_qs})
+        plans.append(sub_qs)
+        intents.append(intent)
+
+    # 1 ── SEARCH ────────────────────────────────────────────────────────
+    local: List[Tuple[List[Dict], bool]] = []   # per query: corpus hits, covered without the web
+    for trace, q, sub_qs, intent in zip(traces, queries, plans, intents):
+        local_hits, full = (_local_search(trace, [q] + [sq for sq in sub_qs if sq != q], intent, offline)
+                            if use_corpus else ([], 0))
+        local.append((local_hits, offline or 0 < CORPUS_ENOUGH <= full))
+    unique_qs = list(dict.fromkeys(sq for sub_qs, (_, covered) in zip(plans, local) if not covered
+                                   for sq in sub_qs))
+    t0 = time.monotonic()
+    with counting(http):
+        found = dict(zip(unique_qs, search_many(unique_qs, limit=SEARCH_LIMIT)))
+    search_ms = (time.monotonic() - t0) * 1000
+    states = {name: h["state"] for name, h in backend_health().items()}
+
+    all_targets, dedupes = [], []
+    for trace, q, sub_qs, (local_hits, covered) in zip(traces, queries, plans, local):
+        if covered:
+            search_hits: List[Dict] = []
+            trace.log("tool", "search_web", {"skipped": "offline" if offline else "corpus",
+                                             "local_hits": len(local_hits)})
+        else:
+            per_sub = [found[sq] for sq in sub_qs]
+            search_hits = [h for hits in per_sub for h in hits]
+            trace.record_span("search", search_ms, queries=len(sub_qs), hits=len(search_hits), shared=n)
+            trace.log("tool", "search_web", {"hits": len(search_hits), "local_hits": len(local_hits),
+                                             "per_query": [len(h) for h in per_sub], "backends": states})
+        search_hits = local_hits + search_hits
+        news_hits: List[Dict] = []
+        if use_news and not offline:
+            with trace.span("news") as sp:
+                news_hits = fetch_recent_news(q, max_items=5)
+                sp.set(hits=len(news_hits))
+            trace.log("tool", "news_rss", {"hits": len(news_hits)})
+        targets, dedupe = _select_targets(trace, q, search_hits, news_hits)
+        all_targets.append(targets)
+        dedupes.append(dedupe)
+
+    # 2–3 ── SCRAPE + ANALYSE ────────────────────────────────────────────
+    # one fetch per canonical URL, whichever queries asked for it
+    url_ids: Dict[str, int] = {}
+    unique_urls: List[str] = []
+    askers: List[List[str]] = []                # url id → every question / sub-query that wants it
+    titles: Dict[str, str] = {}
+    for q, sub_qs, targets in zip(queries, plans, all_targets):
+        titles.update(targets)
+        for url, _ in targets:
+            key = canonical_url(url)
+            if key not in url_ids:
+                url_ids[key] = len(unique_urls)
+                unique_urls.append(url)
+                askers.append([])
+            askers[url_ids[key]].extend(x for x in [q, *sub_qs] if x not in askers[url_ids[key]])
+    if time_budget is None:                     # enough for every wave of fetches to time out
+        time_budget = FETCH_DEADLINE + FETCH_TIMEOUT * math.ceil(len(unique_urls) / FETCH_WORKERS)
+
+    pages: Dict[int, tuple] = {}                # url id → (text, secs, sig)
+    reuse: Dict[int, int] = {}                  # url id → id of the near-duplicate page summarised
+    prints = NearDupIndex()
+    passages = PassageIndex()
+    order: List[int] = []
+    fetch = counted(_corpus_fetch(titles, offline) if use_corpus else fetch_article_text, http)
+
+    def _arrivals() -> Iterator[str]:
+        for j, text, secs in fetch_many(unique_urls, fetch=fetch, deadline=time_budget):
+            sig = fingerprint(text)
+            pages[j] = (text, secs, sig)
+            if not text:
+                continue
+            twin = prints.find(sig) if sig is not None else None
+            if twin is not None:
+                reuse[j] = twin
+                continue
+            if sig is not None:
+                prints.add(sig, j)
+            order.append(j)
+            yield passages.select(text, askers[j])
+
+    t0 = time.monotonic()
+    summs = summarise_many(_arrivals(), n_process=workers)
+    summaries = dict(zip(order, summs))
+    scrape_ms = (time.monotonic() - t0) * 1000
+    batch = {"queries": n, "urls": sum(map(len, all_targets)), "fetched": len(unique_urls),
+             "summarised": len(order), "summaries_reused": len(reuse)}
+    corpus_delta = _corpus_delta(corpus_before) if use_corpus else None
+
+    per_query: List[List[Dict]] = []
+    contradictions: List[Dict[str, List[str]]] = []
+    for trace, targets, dedupe in zip(traces, all_targets, dedupes):
+        fetched: Dict[int, tuple] = {}
+        for i, (url, _) in enumerate(targets):
+            j = url_ids[canonical_url(url)]
+            if j in pages:
+                text, secs, sig = pages[j]
+                fetched[i] = (text, secs, summaries.get(reuse.get(j, j)) if text else None, sig)
+        trace.record_span("scrape", scrape_ms, urls=len(targets), fetched=len(fetched), shared=n)
+        article_summaries = _in_rank_order(trace, targets, fetched, dedupe)
+        trace.log("agent", "dedupe", dedupe)
+        # passages are selected once per page for every question that asked for it
+        trace.log("agent", "retrieve", {**passages.summary(), "shared": n})
+        trace.log("agent", "batch", batch)
+        if corpus_delta is not None:
+            trace.log("tool", "corpus", corpus_delta)
+        with trace.span("contradictions") as sp:
+            texts = {targets[i][0]: f[0] for i, f in fetched.items() if f[0]}
+            contradictions.append(_detect_contradictions(article_summaries, texts))
+            sp.set(conflicts=len(contradictions[-1]))
+        per_query.append(article_summaries)
+
+    # 5 ── SYNTHESISE ────────────────────────────────────────────────────
+    stats: List[Dict] = [{} for _ in queries]
+    t0 = time.monotonic()
+    reports = synthesise_many(per_query, stats=stats)
+    synth_ms = (time.monotonic() - t0) * 1000
+
+    results = []
+    for trace, q, arts, report, contradict, st in zip(traces, queries, per_query, reports, contradictions, stats):
+        trace.record_span("synthesise", synth_ms, summaries=len(arts), chars=len(report), shared=n)
+        if st:
+            trace.log("agent", "synthesise", st)
+        remember = use_news if use_cache and arts and not offline else None
+        results.append({"query": q, **_finish(trace, report, contradict, st, {**_http_event(http), "shared": n},
+                                              remember)})
+    return results
@@ -0,0 +1,55 @@
+"""
+preload.py
+----------
+Cold start.  Nothing heavy is imported with the package:
+
+• spaCy – on the first summary (`analyzer.load`), without torch
+• transformers – on the first synthesis long enough to need T5
+• duckduckgo_search – on the first library search
+• feedparser – on the first news lookup
+
+`start()` warms spaCy and T5 on a daemon thread so a process can load
+models while its first search and fetch are still on the network.  It is
+opt-in: PRELOAD=1 makes each pipeline run call it (a no-op after the first);
+the service warms up synchronously before opening its port instead.
+"""
+from __future__ import annotations
+
+import logging, threading, time
+from typing import Optional
+
+LOG = logging.getLogger("WebResearchAgent.preload")
+
+_thread: Optional[threading.Thread] = None
+_start_lock = threading.Lock()
+
+
+def _warm(t5: bool):
+    t0 = time.perf_counter()
+    from .agents import analyzer
+    analyzer.load()
+    LOG.info("spaCy ready in %.2f s", time.perf_counter() - t0)
+    if t5:
+        from .agents.synthesizer import warm_up
+        try:
+            LOG.info("T5 ready in %.2f s", warm_up())
+        except Exception as e:                               # first long synthesis will retry
+            LOG.warning("T5 preload failed (%s)", e)
+
+
+def start(t5: bool = True) -> threading.Thread:
+    """Warm the models in the background (once per process)."""
+    global _thread
+    with _start_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_warm, args=(t5,), name="preload", daemon=True)
+            _thread.start()
+    return _thread
+
+
+def wait(timeout: Optional[float] = None) -> bool:
+    """Block until the preloader is done; False if it is still running (or never started)."""
+    if _thread is None:
+        return False
+    _thread.join(timeout)
+    return not _thread.is_alive()
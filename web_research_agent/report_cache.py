@@ -0,0 +1,208 @@
+"""
+report_cache.py
+---------------
+Finished reports, keyed on what the question means rather than how it was typed.
+
+• key = use_news + the question's content terms (case, stopwords, plurals
+  and word order folded): "Tesla sales 2024?" == "sales of tesla in 2024"
+• no exact key → near-duplicate lookup: MinHash LSH over character trigrams,
+  confirmed by exact trigram Jaccard ≥ REPORT_SIMILARITY and the same
+  Jaccard over whole terms (one added word – "vice president" – is a
+  different question); every number must match exactly ("GDP 2023" never
+  answers "GDP 2024")
+• questions with no content terms ("What is it?") are never cached
+• TTL per planner intent (REPORT_TTL: minutes for RECENT, days for FACT) –
+  the shorter of the stored question's and the asking one's; for a further
+  REPORT_STALE × TTL the stale report is still served, and the caller
+  refreshes it in the background
+• SQLite file under CACHE_DIR, one row per key, holding the report and the
+  id of the trace that produced it; oldest rows evicted past REPORT_CACHE_MAX
+"""
+from __future__ import annotations
+
+import json, os, sqlite3, threading, time
+from collections import Counter
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from .config import CACHE_DIR, REPORT_CACHE_MAX, REPORT_SIMILARITY, REPORT_STALE, REPORT_TTL
+from .agents.planner import detect_intent
+from .agents.ranker import NearDupIndex, minhash, question_terms, stem
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    key         TEXT PRIMARY KEY,
+    intent      TEXT,
+    terms       TEXT,
+    query       TEXT,
+    result      TEXT,
+    trace_id    TEXT,
+    created_at  REAL,
+    accessed_at REAL
+);
+CREATE INDEX IF NOT EXISTS reports_lru ON reports(accessed_at);
+"""
+
+def query_key(query: str, use_news: bool = True) -> Tuple[str, str, str]:
+    """(key, intent, folded terms) for `query`; the intent only sets the TTL."""
+    terms = " ".join(sorted({stem(t) for t in question_terms(query)}))
+    return f"news={int(use_news)}|{terms}", detect_intent(query), terms
+
+
+def _trigrams(terms: str) -> Set[str]:
+    s = f" {terms} "
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+def _numbers(terms: str) -> Set[str]:
+    return {t for t in terms.split() if any(c.isdigit() for c in t)}
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class ReportCache:
+    def __init__(self, path: str, ttl: Optional[Dict[str, float]] = None,
+                 similarity: float = REPORT_SIMILARITY, stale: float = REPORT_STALE,
+                 max_rows: int = REPORT_CACHE_MAX):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.ttl = {**REPORT_TTL, **(ttl or {})}
+        self.similarity = similarity
+        self.stale = stale
+        self.max_rows = max_rows
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        # near-duplicate index over the rows on disk, kept in step with them
+        self._near = NearDupIndex(threshold=similarity)
+        for key, terms in self._db.execute("SELECT key, terms FROM reports").fetchall():
+            self._index(key, terms)
+
+    @staticmethod
+    def _signature(terms: str):
+        return minhash(sorted(_trigrams(terms)), shingle=1)
+
+    def _index(self, key: str, terms: str):
+        if terms:
+            self._near.add(self._signature(terms), key)
+
+    def _unindex(self, key: str, terms: str):
+        if terms:
+            self._near.remove(self._signature(terms), key)
+
+    def _ttl(self, intent: str) -> float:
+        return self.ttl.get(intent, self.ttl.get("OTHER", 0))
+
+    # ── low-level row access ────────────────────────────────────────
+    def _load(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT intent, terms, result, trace_id, created_at FROM reports WHERE key=?", (key,)
+            ).fetchone()
+
+    def _near_keys(self, key: str, terms: str) -> Iterator[str]:
+        """Every LSH candidate that passes the checks (same use_news, numbers, trigram and term Jaccard)."""
+        news, grams, numbers, words = key.split("|", 1)[0], _trigrams(terms), _numbers(terms), set(terms.split())
+        with self._lock:
+            found = list(self._near.candidates(self._signature(terms)))
+        for other in found:
+            other_news, other_terms = other.split("|", 1)
+            if other == key or other_news != news or _numbers(other_terms) != numbers:
+                continue
+            if (_jaccard(_trigrams(other_terms), grams) >= self.similarity
+                    and _jaccard(set(other_terms.split()), words) >= self.similarity):
+                yield other
+
+    def _evict(self):
+        n = self._db.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+        if n > self.max_rows:
+            gone = self._db.execute("SELECT key, terms FROM reports ORDER BY accessed_at LIMIT ?",
+                                    (n - self.max_rows,)).fetchall()
+            self._db.executemany("DELETE FROM reports WHERE key=?", [(k,) for k, _ in gone])
+            for k, terms in gone:
+                self._unindex(k, terms)
+            self.stats["evicted"] += len(gone)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM reports")
+            self._near = NearDupIndex(threshold=self.similarity)
+
+    # ── public API ──────────────────────────────────────────────────
+    def lookup(self, query: str, use_news: bool = True) -> Optional[Dict]:
+        """
+        The cached answer to `query`, or None.  Returns
+        {"key", "query", "result", "trace_id", "age_s", "match": "exact"|"near", "stale": bool}.
+        A question with no content terms is never looked up.
+        """
+        key, intent, terms = query_key(query, use_news)
+        if not terms:
+            return None
+        match, row = "exact", self._load(key)
+        if row is None:
+            match = "near"
+            for near in self._near_keys(key, terms):
+                row = self._load(near)
+                if row is not None:             # a row evicted since the candidate list was taken is skipped
+                    key = near
+                    break
+        now = time.time()
+        ttl = min(self._ttl(row[0]), self._ttl(intent)) if row else 0
+        if row is None or now - row[4] > ttl * (1 + self.stale):
+            with self._lock:
+                self.stats["miss"] += 1
+            return None
+        stale = now - row[4] > ttl
+        with self._lock:
+            self.stats["near_hit" if match == "near" else "hit"] += 1
+            if stale:
+                self.stats["stale"] += 1
+            self._db.execute("UPDATE reports SET accessed_at=? WHERE key=?", (now, key))
+        result = json.loads(row[2])
+        return {"key": key, "query": result.pop("query", query), "result": result, "trace_id": row[3],
+                "age_s": round(now - row[4], 1), "match": match, "stale": stale}
+
+    def store(self, query: str, use_news: bool, result: Dict):
+        """Keep `result["report"]` with the id of the trace that produced it (not for term-less questions)."""
+        key, intent, terms = query_key(query, use_news)
+        if not terms:
+            return
+        trace_id = result.get("trace_id") or result.get("trace", {}).get("id")
+        body = {"query": query, "report": result["report"], "latency_ms": result.get("latency_ms"),
+                "stages_ms": result.get("stages_ms", {}), "trace_path": result.get("trace_path")}
+        now = time.time()
+        with self._lock:
+            known = self._db.execute("SELECT 1 FROM reports WHERE key=?", (key,)).fetchone()
+            self._db.execute("INSERT OR REPLACE INTO reports VALUES (?,?,?,?,?,?,?,?)",
+                             (key, intent, terms, query, json.dumps(body, ensure_ascii=False), trace_id, now, now))
+            if not known:
+                self._index(key, terms)
+            self._evict()
+            self.stats["stored"] += 1
+
+    def summary(self) -> Dict:
+        with self._lock:
+            s = dict(self.stats)
+        looked = s.get("hit", 0) + s.get("near_hit", 0) + s.get("miss", 0)
+        s["hit_ratio"] = round((s.get("hit", 0) + s.get("near_hit", 0)) / looked, 3) if looked else 0.0
+        return s
+
+
+_cache: Optional[ReportCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_report_cache() -> ReportCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ReportCache(os.path.join(CACHE_DIR, "reports.sqlite"))
+    return _cache
+
+
+def report_cache_stats() -> Dict:
+    return _cache.summary() if _cache is not None else {}
@@ -0,0 +1,380 @@
+"""
+service.py
+==========
+
+Long-running research service (asyncio, stdlib only).
+
+    python -m web_research_agent.service [--host 127.0.0.1] [--port 8000]
+
+    POST /research   {"query": …, "use_news": true}  → report JSON
+    GET  /research?q=…&news=0                        → report JSON
+    GET  /stream?q=…&news=0    one JSON event per line (plan, hits, summary …, report)
+    GET  /metrics              queue depth, counters, stage p50/p95, cache / backend health
+    GET  /healthz
+
+• spaCy and T5 are loaded once, before the port opens
+• questions the report cache can answer are served straight away, without
+  taking a worker or a queue slot; the lookup runs off the event loop.  A
+  stale answer also queues one refresh run, admitted like any other run
+• identical in-flight questions (same `planner.normalise` key) share one run;
+  late joiners of a stream get the events so far replayed
+• runs execute on SERVICE_WORKERS threads; up to SERVICE_QUEUE more wait
+  for a slot.  A full queue answers 429, a wait past SERVICE_QUEUE_TIMEOUT 503
+  (both with Retry-After), so overload is refused instead of slowing everyone
+• request bodies over SERVICE_MAX_BODY are refused with 413 before being read
+"""
+
+from __future__ import annotations
+
+import argparse, asyncio, functools, json, logging, time, urllib.parse
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Deque, Dict, List, Optional, Tuple
+
+from . import orchestrator
+from .config import (SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_QUEUE, SERVICE_QUEUE_TIMEOUT,
+                     SERVICE_MAX_BODY, REPORT_CACHE)
+from .agents.claims import get_claim_index
+from .agents.planner import normalise
+from .corpus import corpus_stats
+from .report_cache import report_cache_stats
+from .tools.http_cache import cache_stats
+from .tools.search_tool import backend_health
+from .tracing import stage_latency
+
+LOG = logging.getLogger("WebResearchAgent.service")
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error",
+            503: "Service Unavailable"}
+
+
+class Overloaded(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class TooLarge(Exception):
+    """Content-Length past SERVICE_MAX_BODY (answered 413 without reading the body)."""
+
+
+class _Run:
+    """One pipeline run, shared by every request for the same question."""
+
+    def __init__(self, key: str, query: str, use_news: bool):
+        self.key = key
+        self.query = query
+        self.use_news = use_news
+        self.events: List[Dict] = []
+        self.subscribers: List[asyncio.Queue] = []
+        self.done: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def push(self, event: Optional[Dict]):
+        # loop thread only; None closes every subscriber
+        if event is not None:
+            self.events.append(event)
+        for q in self.subscribers:
+            q.put_nowait(event)
+
+    def subscribe(self) -> asyncio.Queue:
+        q: asyncio.Queue = asyncio.Queue()
+        for ev in self.events:
+            q.put_nowait(ev)
+        if self.done.done():
+            q.put_nowait(None)
+        else:
+            self.subscribers.append(q)
+        return q
+
+
+class ResearchService:
+    def __init__(self, workers: int = SERVICE_WORKERS, queue: int = SERVICE_QUEUE,
+                 queue_timeout: float = SERVICE_QUEUE_TIMEOUT, warm: bool = True,
+                 use_cache: bool = REPORT_CACHE):
+        self.workers = workers
+        self.queue_max = queue
+        self.queue_timeout = queue_timeout
+        self.warm = warm
+        self.use_cache = use_cache
+        self.ready = False
+        self.waiting = 0
+        self.running = 0
+        self.stats: Counter = Counter()
+        self.recent: Deque[Dict] = deque(maxlen=500)         # per-run stage timings
+        self._inflight: Dict[str, _Run] = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="research")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # ── lifecycle ───────────────────────────────────────────────────
+    async def start(self, host: str = SERVICE_HOST, port: int = SERVICE_PORT) -> "ResearchService":
+        self._slots = asyncio.Semaphore(self.workers)
+        if self.warm:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._warm_up)
+        self.ready = True
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self
+
+    @staticmethod
+    def _warm_up():
+        t0 = time.perf_counter()
+        from .agents import analyzer
+        from .agents.synthesizer import warm_up
+        analyzer.load()
+        try:
+            warm_up()
+        except Exception as e:                                       # still serve short reports
+            LOG.warning("T5 warm-up failed (%s); it will load on first use", e)
+        LOG.info("models warm in %.1f s", time.perf_counter() - t0)
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ── runs ────────────────────────────────────────────────────────
+    async def research(self, query: str, use_news: bool = True) -> _Run:
+        """The run answering `query`: a cached, an in-flight, or a newly admitted one."""
+        key = f"{normalise(query)}|news={int(use_news)}"
+        run = self._inflight.get(key)
+        if run is not None:
+            self.stats["coalesced"] += 1
+            return run
+        if self.use_cache:
+            # SQLite and the trace sink block, so not on the loop thread (nor on a research worker)
+            hit = await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(orchestrator.cached_report, query, use_news, background=False))
+            if hit is not None:
+                self.stats["cached"] += 1
+                if hit["cached"]["stale"]:
+                    self._refresh(hit["cached"]["query"], use_news)
+                run = _Run(key, query, use_news)
+                run.push({"kind": "report", "data": hit})
+                run.done.set_result(hit)
+                return run
+            run = self._inflight.get(key)               # admitted while we looked
+            if run is not None:
+                self.stats["coalesced"] += 1
+                return run
+        try:
+            return self._admit(key, query, use_news)
+        except Overloaded:
+            self.stats["rejected_429"] += 1
+            raise
+
+    def _refresh(self, query: str, use_news: bool):
+        """Re-run a stale cached question through the queue, once per key; skipped when full."""
+        key = f"refresh|{normalise(query)}|news={int(use_news)}"
+        if key in self._inflight:
+            return
+        try:
+            self._admit(key, query, use_news)
+            self.stats["refreshed"] += 1
+        except Overloaded:
+            self.stats["refresh_skipped"] += 1
+
+    def _admit(self, key: str, query: str, use_news: bool) -> _Run:
+        if self.waiting + self.running >= self.workers + self.queue_max:
+            raise Overloaded(429, "admission queue full")
+        run = self._inflight[key] = _Run(key, query, use_news)
+        self.waiting += 1                               # counted now, so a burst cannot overshoot
+        asyncio.create_task(self._execute(run))
+        return run
+
+    async def _execute(self, run: _Run):
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.waiting -= 1
+            self.stats["rejected_503"] += 1
+            self._inflight.pop(run.key, None)
+            run.done.set_exception(Overloaded(503, "timed out waiting for a worker"))
+            run.done.exception()                        # reported to the clients, not the loop
+            run.push(None)
+            return
+        self.waiting -= 1
+        self.running += 1
+        self.stats["admitted"] += 1
+        try:
+            report = await loop.run_in_executor(self._executor, self._drive, run, loop, self.use_cache)
+            self._record(report)
+            self.stats["completed"] += 1
+            run.done.set_result(report)
+        except Exception as e:
+            LOG.exception("run failed: %s", run.query)
+            self.stats["failed"] += 1
+            run.push({"kind": "error", "data": {"error": str(e)}})
+            run.done.set_exception(e)
+            run.done.exception()
+        finally:
+            self.running -= 1
+            self._slots.release()
+            self._inflight.pop(run.key, None)
+            run.push(None)
+
+    @staticmethod
+    def _drive(run: _Run, loop: asyncio.AbstractEventLoop, use_cache: bool) -> Dict:
+        # worker thread: stream the pipeline, handing each event to the loop;
+        # the cache was already consulted in `research`, so only store
+        report = None
+        for event in orchestrator.stream_research_pipeline(run.query, use_news=run.use_news,
+                                                           use_cache=use_cache, refresh=True):
+            ev = asdict(event)
+            loop.call_soon_threadsafe(run.push, ev)
+            if event.kind == "report":
+                report = event.data
+        if report is None:
+            raise RuntimeError("pipeline ended without a report")
+        return report
+
+    def _record(self, report: Dict):
+        self.recent.append({"ms": report["latency_ms"],
+                            "spans": [{"name": k, "ms": v} for k, v in report.get("stages_ms", {}).items()]})
+
+    def metrics(self) -> Dict:
+        recent = list(self.recent)
+        stages = stage_latency(recent)
+        total = stages.pop("total", None)
+        return {
+            "ready": self.ready,
+            "queue_depth": self.waiting,
+            "running": self.running,
+            "inflight": len(self._inflight),
+            "workers": self.workers,
+            "queue_max": self.queue_max,
+            **{k: self.stats[k] for k in ("admitted", "coalesced", "cached", "refreshed", "refresh_skipped",
+                                          "completed", "failed", "rejected_429", "rejected_503")},
+            "latency": total or {},
+            "stages": stages,
+            "report_cache": report_cache_stats(),
+            "http_cache": cache_stats(),
+            "corpus": corpus_stats(),
+            "claims": get_claim_index().summary(),
+            "backends": backend_health(),
+        }
+
+    # ── HTTP ────────────────────────────────────────────────────────
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, path, params, body = await self._read_request(reader)
+            await self._route(method, path, params, body, writer)
+        except TooLarge as e:
+            await self._send(writer, 413, {"error": str(e)})
+        except (ValueError, asyncio.IncompleteReadError):
+            await self._send(writer, 400, {"error": "malformed request"})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader) -> Tuple[str, str, Dict[str, str], bytes]:
+        line = (await reader.readline()).decode("latin-1").split()
+        if len(line) < 2:
+            raise ValueError("bad request line")
+        headers = {}
+        while True:
+            h = (await reader.readline()).decode("latin-1").strip()
+            if not h:
+                break
+            k, _, v = h.partition(":")
+            headers[k.strip().lower()] = v.strip()
+        n = int(headers.get("content-length") or 0)
+        if n < 0:
+            raise ValueError("bad Content-Length")
+        if n > SERVICE_MAX_BODY:
+            raise TooLarge(f"request body over {SERVICE_MAX_BODY} bytes")
+        body = await reader.readexactly(n) if n else b""
+        url = urllib.parse.urlsplit(line[1])
+        return line[0].upper(), url.path, dict(urllib.parse.parse_qsl(url.query)), body
+
+    async def _route(self, method: str, path: str, params: Dict[str, str], body: bytes, writer):
+        if path == "/healthz":
+            return await self._send(writer, 200 if self.ready else 503, {"ready": self.ready})
+        if path == "/metrics":
+            return await self._send(writer, 200, self.metrics())
+        if path not in ("/research", "/stream"):
+            return await self._send(writer, 404, {"error": "not found"})
+        if method == "POST":
+            payload = json.loads(body or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("body must be a JSON object")
+            params = {**params, **payload}
+        elif method != "GET":
+            return await self._send(writer, 405, {"error": "use GET or POST"})
+        query = str(params.get("query") or params.get("q") or "").strip()
+        if not query:
+            return await self._send(writer, 400, {"error": "missing query"})
+        use_news = str(params.get("use_news", params.get("news", "1"))).lower() not in ("0", "false", "no")
+
+        try:
+            run = await self.research(query, use_news)
+            if path == "/research":
+                return await self._send(writer, 200, await asyncio.shield(run.done))
+            await self._stream(run, writer)
+        except Overloaded as e:
+            await self._send(writer, e.status, {"error": str(e)}, {"Retry-After": "5"})
+        except Exception as e:
+            await self._send(writer, 500, {"error": str(e)})
+
+    async def _stream(self, run: _Run, writer):
+        q = run.subscribe()
+        first = await q.get()
+        if first is None and run.done.exception() is not None:
+            raise run.done.exception()                # refused before any output
+        self._head(writer, 200, "application/x-ndjson")
+        ev = first
+        while ev is not None:
+            writer.write(json.dumps(ev, ensure_ascii=False).encode() + b"\n")
+            await writer.drain()
+            ev = await q.get()
+
+    @staticmethod
+    def _head(writer, status: int, ctype: str, extra: Optional[Dict[str, str]] = None, length: int = None):
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", f"Content-Type: {ctype}", "Connection: close"]
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        lines += [f"{k}: {v}" for k, v in (extra or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def _send(self, writer, status: int, payload: Dict, extra: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        self._head(writer, status, "application/json", extra, len(body))
+        writer.write(body)
+        await writer.drain()
+
+
+async def _main(args):
+    service = await ResearchService(workers=args.workers, queue=args.queue).start(args.host, args.port)
+    LOG.info("serving on http://%s:%d", args.host, service.port)
+    await service.serve_forever()
+
+
+def main():
+    ap = argparse.ArgumentParser(prog="python -m web_research_agent.service")
+    ap.add_argument("--host", default=SERVICE_HOST)
+    ap.add_argument("--port", type=int, default=SERVICE_PORT)
+    ap.add_argument("--workers", type=int, default=SERVICE_WORKERS)
+    ap.add_argument("--queue", type=int, default=SERVICE_QUEUE)
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+breaker.py
+----------
+Per-backend circuit breaker with health stats.
+
+closed    → calls pass; BREAKER_FAILS consecutive failures (or one 429) open it
+open      → calls are skipped until BREAKER_COOLDOWN has passed
+half-open → exactly one probe is let through; success closes, failure re-opens
+"""
+import threading, time
+from typing import Dict, Optional
+
+from ..config import BREAKER_FAILS, BREAKER_COOLDOWN
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    resp = getattr(exc, "response", None)
+    if getattr(resp, "status_code", None) == 429:
+        return True
+    return "ratelimit" in type(exc).__name__.lower()     # duckduckgo_search.RatelimitException
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, fails: int = BREAKER_FAILS, cooldown: float = BREAKER_COOLDOWN):
+        self.name = name
+        self.fails = fails
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.opened_at = 0.0
+        self.consecutive = 0
+        self.stats = {"calls": 0, "ok": 0, "empty": 0, "failed": 0, "rate_limited": 0,
+                      "skipped": 0, "latency_ms": 0.0, "last_error": None}
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half-open"
+            if self.state == "half-open" and not self._probing:
+                self._probing = True
+                return True
+            self.stats["skipped"] += 1
+            return False
+
+    def record(self, seconds: float, error: Optional[BaseException] = None, empty: bool = False):
+        with self._lock:
+            self._probing = False
+            st = self.stats
+            st["calls"] += 1
+            # exponentially-weighted latency
+            st["latency_ms"] = round(0.8 * st["latency_ms"] + 0.2 * seconds * 1000, 1) if st["calls"] > 1 \
+                else round(seconds * 1000, 1)
+            if error is None:
+                st["empty" if empty else "ok"] += 1
+                self.consecutive = 0
+                self.state = "closed"
+                return
+            st["failed"] += 1
+            st["last_error"] = f"{type(error).__name__}: {error}"[:200]
+            self.consecutive += 1
+            limited = is_rate_limited(error)
+            if limited:
+                st["rate_limited"] += 1
+            if limited or self.state == "half-open" or self.consecutive >= self.fails:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def health(self) -> Dict:
+        with self._lock:
+            return {"state": self.state, **self.stats}
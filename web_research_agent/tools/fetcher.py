@@ -0,0 +1,66 @@
+"""
+fetcher.py
+----------
+Concurrent page fetcher for the scrape stage.
+
+• thread pool sized by FETCH_WORKERS (global concurrency limit)
+• at most FETCH_PER_HOST requests in flight per host
+• one deadline for the whole stage; late pages are dropped
+• yields (index, text, seconds) in *completion* order so callers can
+  start analysing the first page while the rest are still downloading
+"""
+import time, threading, urllib.parse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from ..config import FETCH_WORKERS, FETCH_PER_HOST, FETCH_TIMEOUT, FETCH_DEADLINE
+from .scraper_tool import fetch_article_text
+
+
+def _host(url: str) -> str:
+    return urllib.parse.urlsplit(url).netloc.lower()
+
+
+def fetch_many(
+    urls: List[str],
+    fetch: Callable[..., Optional[str]] = fetch_article_text,
+    workers: int = FETCH_WORKERS,
+    per_host: int = FETCH_PER_HOST,
+    deadline: float = FETCH_DEADLINE,
+) -> Iterator[Tuple[int, Optional[str], float]]:
+    """Fetch `urls` concurrently; yield (index, text, seconds) as each completes."""
+    if not urls:
+        return
+    stop_at = time.monotonic() + deadline
+    host_locks = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+    for u in urls:                                  # create up front (no races)
+        host_locks[_host(u)]
+
+    def _one(url: str) -> Tuple[Optional[str], float]:
+        with host_locks[_host(url)]:
+            t0 = time.monotonic()
+            remaining = stop_at - t0
+            if remaining <= 0:
+                return None, 0.0
+            text = fetch(url, timeout=min(FETCH_TIMEOUT, remaining))
+            return text, time.monotonic() - t0
+
+    pool = ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls))), thread_name_prefix="fetch")
+    try:
+        pending = {pool.submit(_one, u): i for i, u in enumerate(urls)}
+        while pending:
+            remaining = stop_at - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for fut in done:
+                i = pending.pop(fut)
+                try:
+                    text, secs = fut.result()
+                except Exception:
+                    text, secs = None, 0.0
+                yield i, text, secs
+    finally:
+        # don't block on stragglers past the deadline
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,310 @@
+"""
+http_cache.py
+-------------
+Persistent HTTP response cache shared by search, scrape and RSS tools.
+
+• SQLite file under CACHE_DIR (one row per URL)
+• per-source TTL (HTTP_CACHE_TTL); fresh entries never touch the network
+• stale entries are revalidated with If-None-Match / If-Modified-Since
+• size-bounded: least-recently-used rows are evicted past HTTP_CACHE_MAX_BYTES
+• HTTP_CACHE=0 (or `bypass=True`) skips it entirely
+• `counting(counter)` also tallies the lookups made in its context (and in
+  pool tasks started with a copy of it) into `counter` – one per pipeline run
+"""
+from __future__ import annotations
+
+import contextvars, functools, json, os, sqlite3, threading, time, urllib.parse
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+import requests
+
+from ..config import CACHE_DIR, FETCH_TIMEOUT, HTTP_CACHE, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_TTL
+from .session import get_session
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key           TEXT PRIMARY KEY,
+    status        INTEGER,
+    headers       TEXT,
+    body          BLOB,
+    etag          TEXT,
+    last_modified TEXT,
+    expires_at    REAL,
+    accessed_at   REAL,
+    size          INTEGER
+);
+CREATE INDEX IF NOT EXISTS responses_lru ON responses(accessed_at);
+"""
+
+_run_stats: contextvars.ContextVar[Optional[Counter]] = contextvars.ContextVar("http_cache_run", default=None)
+
+
+@contextmanager
+def counting(counter: Counter) -> Iterator[Counter]:
+    """Also count this context's cache hits / misses / revalidations into `counter`."""
+    token = _run_stats.set(counter)
+    try:
+        yield counter
+    finally:
+        _run_stats.reset(token)
+
+
+def counted(fn: Callable, counter: Counter) -> Callable:
+    """`fn` wrapped to run under `counting(counter)` – for functions handed to worker threads."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kw):
+        with counting(counter):
+            return fn(*args, **kw)
+    return wrapper
+
+
+class CachedResponse:
+    """The slice of `requests.Response` the tools use."""
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes, from_cache: bool):
+        self.url = url
+        self.status_code = status_code
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.content = content
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        enc = requests.utils.get_encoding_from_headers(self.headers) or "utf-8"
+        return self.content.decode(enc, errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for {self.url}", response=self)
+
+
+def cache_key(url: str, params: Optional[Dict] = None) -> str:
+    if params:
+        url += ("&" if "?" in url else "?") + urllib.parse.urlencode(sorted(params.items()))
+    return url
+
+
+class HTTPCache:
+    def __init__(self, path: str, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _count(self, kind: str):
+        run = _run_stats.get()
+        with self._lock:
+            self.stats[kind] += 1
+            if run is not None:
+                run[kind] += 1
+
+    # ── low-level row access ────────────────────────────────────────
+    def _load(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT status, headers, body, etag, last_modified, expires_at FROM responses WHERE key=?",
+                (key,),
+            ).fetchone()
+
+    def _touch(self, key: str, expires_at: Optional[float] = None):
+        now = time.time()
+        with self._lock:
+            if expires_at is None:
+                self._db.execute("UPDATE responses SET accessed_at=? WHERE key=?", (now, key))
+            else:
+                self._db.execute("UPDATE responses SET accessed_at=?, expires_at=? WHERE key=?", (now, expires_at, key))
+
+    def _store(self, key: str, status: int, headers: Dict[str, str], body: bytes, ttl: float):
+        now = time.time()
+        headers = requests.structures.CaseInsensitiveDict(headers)      # servers may send "etag:" lowercase
+        hdrs = {k: v for k, v in headers.items() if k.lower() in ("content-type", "etag", "last-modified")}
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE key=?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?,?,?,?,?,?,?,?,?)",
+                (key, status, json.dumps(hdrs), body, headers.get("ETag"), headers.get("Last-Modified"),
+                 now + ttl, now, len(body)),
+            )
+            self._bytes += len(body) - (old[0] if old else 0)
+            self._evict()
+
+    def _evict(self, batch: int = 32):
+        # running byte total; least-recently-used rows a few at a time, never a full scan
+        while self._bytes > self.max_bytes:
+            rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at LIMIT ?",
+                                    (batch,)).fetchall()
+            if not rows:
+                self._bytes = 0
+                return
+            for key, size in rows:
+                self._db.execute("DELETE FROM responses WHERE key=?", (key,))
+                self._bytes -= size
+                self.stats["evicted"] += 1
+                if self._bytes <= self.max_bytes:
+                    return
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._bytes = 0
+
+    # ── public API ──────────────────────────────────────────────────
+    def get(self, url: str, source: str, params: Optional[Dict] = None,
+            timeout: float = FETCH_TIMEOUT, headers: Optional[Dict] = None) -> CachedResponse:
+        key = cache_key(url, params)
+        ttl = HTTP_CACHE_TTL.get(source, 0)
+        row = self._load(key)
+        now = time.time()
+
+        if row and row[5] > now:
+            self._count("hit")
+            self._touch(key)
+            return CachedResponse(key, row[0], json.loads(row[1]), row[2], from_cache=True)
+
+        req_headers = dict(headers or {})
+        if row:
+            if row[3]:
+                req_headers["If-None-Match"] = row[3]
+            if row[4]:
+                req_headers["If-Modified-Since"] = row[4]
+
+        resp = get_session().get(url, params=params, headers=req_headers, timeout=timeout)
+        if row and resp.status_code == 304:
+            self._count("revalidated")
+            self._touch(key, expires_at=now + ttl)
+            return CachedResponse(key, row[0], json.loads(row[1]), row[2], from_cache=True)
+
+        self._count("miss")
+        if resp.status_code == 200 and "no-store" not in resp.headers.get("Cache-Control", ""):
+            self._store(key, 200, resp.headers, resp.content, ttl)
+        return CachedResponse(key, resp.status_code, dict(resp.headers), resp.content, from_cache=False)
+
+    def stream(self, url: str, source: str, accept: Callable[[Dict], bool], sink: Callable[[bytes], bool],
+               timeout: float = FETCH_TIMEOUT, max_bytes: int = 0, chunk_size: int = 16_384) -> Optional[int]:
+        """
+        Stream a body into `sink` chunk by chunk.  `accept(headers)` vetoes the
+        response before any body is read; `sink` returns False to stop early.
+        Only the bytes actually consumed are stored — re-feeding that prefix
+        reproduces the same early exit.  Those rows live under their own
+        "stream:" keys, so `get` never serves a truncated body.  Returns the
+        HTTP status, or None if `accept` refused the response.
+        """
+        key = "stream:" + cache_key(url)
+        row = self._load(key)
+        now = time.time()
+
+        def _replay(row) -> Optional[int]:
+            hdrs = requests.structures.CaseInsensitiveDict(json.loads(row[1]))
+            if not accept(hdrs):
+                return None
+            body = row[2]
+            for i in range(0, len(body), chunk_size):
+                if not sink(body[i:i + chunk_size]):
+                    break
+            return row[0]
+
+        if row and row[5] > now:
+            self._count("hit")
+            self._touch(key)
+            return _replay(row)
+
+        req_headers = {}
+        if row:
+            if row[3]:
+                req_headers["If-None-Match"] = row[3]
+            if row[4]:
+                req_headers["If-Modified-Since"] = row[4]
+
+        with get_session().get(url, headers=req_headers, timeout=timeout, stream=True) as resp:
+            if row and resp.status_code == 304:
+                self._count("revalidated")
+                self._touch(key, expires_at=now + HTTP_CACHE_TTL.get(source, 0))
+                return _replay(row)
+            self._count("miss")
+            resp.raise_for_status()
+            if not accept(resp.headers):
+                return None
+            body = _pump(resp, sink, max_bytes, chunk_size)
+            if "no-store" not in resp.headers.get("Cache-Control", ""):
+                self._store(key, resp.status_code, resp.headers, body, HTTP_CACHE_TTL.get(source, 0))
+            return resp.status_code
+
+    def memo(self, key: str, source: str, fn: Callable[[], object]):
+        """Cache a JSON-serialisable result under a synthetic key (non-HTTP backends)."""
+        row = self._load(key)
+        if row and row[5] > time.time():
+            self._count("hit")
+            self._touch(key)
+            return json.loads(row[2])
+        self._count("miss")
+        value = fn()
+        if value:
+            self._store(key, 200, {}, json.dumps(value).encode(), HTTP_CACHE_TTL.get(source, 0))
+        return value
+
+
+def _pump(resp, sink: Callable[[bytes], bool], max_bytes: int, chunk_size: int) -> bytes:
+    """Feed `resp` into `sink` until it says stop or `max_bytes` is reached."""
+    seen = bytearray()
+    for chunk in resp.iter_content(chunk_size):
+        if max_bytes and len(seen) + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - len(seen)]
+        seen += chunk
+        if not sink(chunk) or (max_bytes and len(seen) >= max_bytes):
+            break
+    return bytes(seen)
+
+
+_cache: Optional[HTTPCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> HTTPCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = HTTPCache(os.path.join(CACHE_DIR, "http_cache.sqlite"))
+    return _cache
+
+
+def cache_stats() -> Dict[str, int]:
+    return dict(_cache.stats) if _cache is not None else {}
+
+
+def cached_get(url: str, source: str, params: Optional[Dict] = None, timeout: float = FETCH_TIMEOUT,
+               headers: Optional[Dict] = None, bypass: bool = False):
+    """GET through the shared cache (or straight to the network if disabled)."""
+    if bypass or not HTTP_CACHE:
+        return get_session().get(url, params=params, headers=headers, timeout=timeout)
+    return get_cache().get(url, source, params=params, timeout=timeout, headers=headers)
+
+
+def cached_call(key: str, source: str, fn: Callable[[], object], bypass: bool = False):
+    """Memoise a non-HTTP lookup (e.g. the DDG library) in the same cache."""
+    if bypass or not HTTP_CACHE:
+        return fn()
+    return get_cache().memo(key, source, fn)
+
+
+def cached_stream(url: str, source: str, accept: Callable[[Dict], bool], sink: Callable[[bytes], bool],
+                  timeout: float = FETCH_TIMEOUT, max_bytes: int = 0, bypass: bool = False) -> Optional[int]:
+    """Streaming counterpart of `cached_get` (see `HTTPCache.stream`)."""
+    if bypass or not HTTP_CACHE:
+        with get_session().get(url, timeout=timeout, stream=True) as resp:
+            resp.raise_for_status()
+            if not accept(resp.headers):
+                return None
+            _pump(resp, sink, max_bytes, 16_384)
+            return resp.status_code
+    return get_cache().stream(url, source, accept, sink, timeout=timeout, max_bytes=max_bytes)
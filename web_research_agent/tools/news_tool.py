@@ -1,26 +1,181 @@
-"""Very small RSS news search via feedparser (open-source)."""
-from typing import List, Dict
-import feedparser
+"""
+Small RSS news search via feedparser (open-source).
+
+Feeds are pulled in parallel into an in-memory inverted index
+(token → entry ids, deduplicated by link) and queries are term lookups
+ranked by overlap, then recency.  The index refreshes lazily once it is
+older than NEWS_TTL – in the background, so only the very first query
+waits for downloads – or on a timer thread with NEWS_BACKGROUND=1.
+Conditional GETs come from the shared HTTP cache.
+"""
+import calendar, re, threading, time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
+
+from ..config import NEWS_FEEDS, NEWS_TTL, NEWS_BACKGROUND, NEWS_MAX_ENTRIES
+from .http_cache import cached_get
+from ..agents.ranker import stem
+
+_WORD = re.compile(r"[a-z0-9]+")
+# generic words that say nothing about the topic of a news query
+_STOP = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "is", "it",
+         "of", "on", "or", "the", "to", "was", "what", "when", "where", "who", "why", "with",
+         "latest", "news", "today", "current", "recent", "update", "updates"}
+
+
+def _terms(text: str) -> Set[str]:
+    return {stem(w) for w in _WORD.findall(text.lower()) if w not in _STOP and len(w) > 1}
+
+
+def _parse_feed(url: str):
+    # download through the shared cache, then let feedparser parse the bytes
+    import feedparser                           # first news lookup only
+
+    try:
+        resp = cached_get(url, "rss")
+        resp.raise_for_status()
+        return feedparser.parse(resp.content)
+    except Exception:
+        return feedparser.parse(b"")
+
+
+def _published(entry) -> float:
+    for key in ("published_parsed", "updated_parsed"):
+        if entry.get(key):
+            return float(calendar.timegm(entry[key]))
+    return 0.0                                  # undated: never ranked as fresh, trimmed first
+
+
+class NewsIndex:
+    def __init__(self, feeds: Optional[List[str]] = None, ttl: float = NEWS_TTL,
+                 max_entries: int = NEWS_MAX_ENTRIES):
+        self.feeds = list(feeds if feeds is not None else NEWS_FEEDS)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: Dict[int, Dict] = {}
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        self.refreshed_at = 0.0
+        self._by_key: Dict[str, int] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self._timer: Optional[threading.Thread] = None
+
+    # ── ingestion ───────────────────────────────────────────────────
+    def refresh(self, wait: bool = False) -> int:
+        """Fetch every feed in parallel and merge new entries; returns how many were added."""
+        if not self._refreshing.acquire(blocking=wait):
+            return 0                                    # another refresh is running
+        try:
+            if wait and time.time() - self.refreshed_at <= self.ttl:
+                return 0                                # someone else just did it
+            with ThreadPoolExecutor(max_workers=max(1, len(self.feeds)), thread_name_prefix="rss") as pool:
+                feeds = list(pool.map(_parse_feed, self.feeds))
+            added = 0
+            with self._lock:
+                for feed in feeds:
+                    for entry in feed.entries:
+                        added += self._add(entry)
+                self._trim()
+                self.refreshed_at = time.time()
+            return added
+        finally:
+            self._refreshing.release()
+
+    def _add(self, entry) -> int:
+        key = (entry.get("link") or entry.get("title") or "").strip().lower()
+        if not key or key in self._by_key:
+            return 0
+        eid = self._next_id
+        self._next_id += 1
+        summary = entry.get("summary", "")
+        terms = _terms(entry.get("title", "") + " " + summary)
+        self.entries[eid] = {
+            "title": entry.get("title"),
+            "link": entry.get("link"),
+            "summary": summary[:200],
+            "published": _published(entry),
+            "_key": key,
+            "_terms": terms,                    # from the full summary, so _trim can unpost exactly
+        }
+        self._by_key[key] = eid
+        for t in terms:
+            self.postings[t].add(eid)
+        return 1
+
+    def _trim(self):
+        if len(self.entries) <= self.max_entries:
+            return
+        oldest = sorted(self.entries, key=lambda i: self.entries[i]["published"])
+        for eid in oldest[:len(self.entries) - self.max_entries]:
+            e = self.entries.pop(eid)
+            del self._by_key[e["_key"]]
+            for t in e["_terms"]:
+                self.postings[t].discard(eid)
+                if not self.postings[t]:
+                    del self.postings[t]
+
+    # ── freshness ───────────────────────────────────────────────────
+    def ensure_fresh(self):
+        """Block only on a cold index; a stale one is refreshed in the background."""
+        if not self.refreshed_at:
+            self.refresh(wait=True)
+        elif time.time() - self.refreshed_at > self.ttl and not self._refreshing.locked():
+            threading.Thread(target=self.refresh, name="rss-refresh", daemon=True).start()
+
+    def start_background_refresh(self, interval: Optional[float] = None):
+        """Keep the index warm from a daemon thread."""
+        if self._timer is not None:
+            return
+        interval = interval or self.ttl
+
+        def _loop():
+            while True:
+                try:
+                    self.refresh()
+                except Exception:
+                    pass
+                time.sleep(interval)
+
+        self._timer = threading.Thread(target=_loop, name="rss-timer", daemon=True)
+        self._timer.start()
+
+    # ── query ───────────────────────────────────────────────────────
+    def search(self, topic: str, max_items: int = 10) -> List[Dict]:
+        q = _terms(topic)
+        if not q:
+            return []
+        need = (len(q) + 1) // 2                        # at least half the query terms
+        with self._lock:
+            overlap: Dict[int, int] = defaultdict(int)
+            for t in q:
+                for eid in self.postings.get(t, ()):
+                    overlap[eid] += 1
+            hits = [(n, self.entries[eid]) for eid, n in overlap.items() if n >= need]
+        now = time.time()
+        # overlap first; recency (0..1, one-day half-life) breaks ties
+        hits.sort(key=lambda h: h[0] + 0.5 ** (max(0.0, now - h[1]["published"]) / 86_400) * 0.99,
+                  reverse=True)
+        return [{"title": e["title"], "link": e["link"], "summary": e["summary"]} for _, e in hits[:max_items]]
+
+
+_index: Optional[NewsIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_news_index() -> NewsIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = NewsIndex()
+                if NEWS_BACKGROUND:
+                    _index.start_background_refresh()
+    return _index
 
-RSS = [
-    "https://rss.nytimes.com/services/xml/rss/nyt/World.xml",
-    "https://feeds.bbci.co.uk/news/world/rss.xml",
-    "https://www.aljazeera.com/xml/rss/all.xml"
-]
 
 def fetch_recent_news(topic: str, max_items: int = 10) -> List[Dict]:
-    topic_l = topic.lower()
-    hits: List[Dict] = []
-    for url in RSS:
-        feed = feedparser.parse(url)
-        for entry in feed.entries:
-            blob = (entry.get("title", "") + entry.get("summary", "")).lower()
-            if topic_l in blob:
-                hits.append({
-                    "title": entry.get("title"),
-                    "link":  entry.get("link"),
-                    "summary": entry.get("summary", "")[:200]
-                })
-            if len(hits) >= max_items:
-                return hits
-    return hits
+    index = get_news_index()
+    index.ensure_fresh()
+    return index.search(topic, max_items=max_items)
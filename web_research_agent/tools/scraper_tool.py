@@ -3,26 +3,171 @@ scraper_tool.py
 ---------------
 Pure-BS4 scraper (no newspaper3k, no lxml).
 
-• GETs the URL
+• GETs the URL over the shared keep-alive session (via the HTTP cache)
 • extracts <p> text via html.parser
 • truncates to MAX_CHARS
+
+Streaming mode (SCRAPE_STREAM, default on) never builds a tree: the body is
+read in chunks, fed to a SAX-style `html.parser.HTMLParser`, and reading stops
+as soon as MAX_CHARS of paragraph text is collected or SCRAPE_MAX_BYTES is hit.
+Non-HTML responses are rejected before any parsing.  Output matches the BS4
+path for well-formed pages.
 """
-from typing import Optional
+import codecs
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
 import requests
-from bs4 import BeautifulSoup
-from ..config import MAX_CHARS
+from ..config import MAX_CHARS, FETCH_TIMEOUT, SCRAPE_STREAM, SCRAPE_MAX_BYTES
+from .http_cache import cached_get, cached_stream
+
+_HTML_TYPES = ("text/html", "application/xhtml+xml")
+# elements html.parser/BS4 treat as self-closing – never pushed on the stack
+_VOID = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+         "meta", "param", "source", "track", "wbr", "basefont", "bgsound",
+         "command", "frame", "image", "isindex", "keygen", "menuitem", "nextid", "spacer"}
+_SKIP = {"script", "style", "template", "rt", "rp"}   # strings BS4's get_text() ignores
+
+
+def _truncate(text: str) -> str:
+    if len(text) > MAX_CHARS:
+        text = text[:MAX_CHARS] + "...[truncated]"
+    return text
+
+
+def extract_paragraphs(html: str) -> str:
+    """Reference extractor: full BS4 tree, every <p>, then truncate."""
+    from bs4 import BeautifulSoup               # only on the SCRAPE_STREAM=0 path
+
+    soup = BeautifulSoup(html, "html.parser")
+    paragraphs = [p.get_text(" ", strip=True) for p in soup.find_all("p")]
+    return _truncate("\n".join(paragraphs))
+
+
+class _ParagraphParser(HTMLParser):
+    """
+    Incremental <p> collector mirroring `p.get_text(" ", strip=True)`.
+
+    Paragraph slots are reserved at the start tag so nested <p> come out in
+    document order, exactly like `soup.find_all("p")`.
+    """
+
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.slots: List[Optional[str]] = []   # finished paragraph text, by start order
+        self._stack: List[str] = []            # open element names
+        self._open: Dict[int, tuple] = {}      # stack depth → (slot, parts) for open <p>
+        self._buf: List[str] = []              # current text node (may span feeds)
+        self._skip = 0
+        self._done_upto = 0                    # slots[:_done_upto] all finished
+        self._chars = -1                       # len("\n".join(slots[:_done_upto]))
+
+    # ── text nodes ──────────────────────────────────────────────────
+    def _flush(self):
+        if not self._buf:
+            return
+        s = "".join(self._buf).strip()
+        self._buf = []
+        if s and not self._skip:
+            for _, parts in self._open.values():
+                parts.append(s)
+
+    def handle_data(self, data):
+        if self._open:
+            self._buf.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    # ── elements ────────────────────────────────────────────────────
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if tag in _VOID:
+            return
+        self._stack.append(tag)
+        if tag in _SKIP:
+            self._skip += 1
+        if tag == "p":
+            self.slots.append(None)
+            self._open[len(self._stack)] = (len(self.slots) - 1, [])
+
+    def handle_startendtag(self, tag, attrs):
+        # BS4 opens and immediately closes `<p/>`-style tags
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if tag not in self._stack:
+            return                              # stray close tag: BS4 ignores it
+        while self._stack:
+            if self._pop() == tag:
+                break
+
+    def _pop(self) -> str:
+        depth = len(self._stack)
+        tag = self._stack.pop()
+        if tag in _SKIP:
+            self._skip -= 1
+        if depth in self._open:
+            slot, parts = self._open.pop(depth)
+            self.slots[slot] = " ".join(parts)
+            self._advance()
+        return tag
+
+    def _advance(self):
+        while self._done_upto < len(self.slots) and self.slots[self._done_upto] is not None:
+            self._chars += len(self.slots[self._done_upto]) + 1
+            self._done_upto += 1
+
+    # ── driver ──────────────────────────────────────────────────────
+    @property
+    def full(self) -> bool:
+        return self._chars > self.max_chars
+
+    def finish(self) -> str:
+        self.close()
+        self._flush()
+        while self._stack:
+            self._pop()
+        return _truncate("\n".join(self.slots))
+
+
+def _is_html(headers) -> bool:
+    ctype = (headers.get("Content-Type") or "").split(";")[0].strip().lower()
+    return not ctype or ctype in _HTML_TYPES
+
+
+def _stream_article_text(url: str, timeout: float) -> Optional[str]:
+    parser = _ParagraphParser(MAX_CHARS)
+    state = {}
+
+    def accept(headers) -> bool:
+        if not _is_html(headers):
+            return False
+        enc = requests.utils.get_encoding_from_headers(headers) or "utf-8"
+        state["decode"] = codecs.getincrementaldecoder(enc)(errors="replace").decode
+        return True
+
+    def sink(chunk: bytes) -> bool:
+        parser.feed(state["decode"](chunk))
+        return not parser.full
+
+    if cached_stream(url, "article", accept, sink, timeout=timeout, max_bytes=SCRAPE_MAX_BYTES) is None:
+        return None
+    parser.feed(state["decode"](b"", final=True))
+    return parser.finish()
 
-_HEADERS = {"User-Agent": "Mozilla/5.0 (WebResearchAgent/1.0)"}
 
-def fetch_article_text(url: str) -> Optional[str]:
+def fetch_article_text(url: str, timeout: float = FETCH_TIMEOUT) -> Optional[str]:
     try:
-        resp = requests.get(url, headers=_HEADERS, timeout=10)
+        if SCRAPE_STREAM:
+            return _stream_article_text(url, timeout)
+        resp = cached_get(url, "article", timeout=timeout)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
-        paragraphs = [p.get_text(" ", strip=True) for p in soup.find_all("p")]
-        text = "\n".join(paragraphs)
-        if len(text) > MAX_CHARS:
-            text = text[:MAX_CHARS] + "...[truncated]"
-        return text
+        if not _is_html(resp.headers):
+            return None
+        return extract_paragraphs(resp.text)
     except Exception:
         return None
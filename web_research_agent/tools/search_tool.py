@@ -6,28 +6,44 @@ search_tool.py  – robust, key-free web search
 2. DuckDuckGo HTML scrape (requests + bs4) if the library fails OR 0 hits.
 3. Wikipedia search API last-ditch fallback.
 
+All three go through the shared HTTP cache (see http_cache.py).
+
+Backends are *hedged*: the next one starts after SEARCH_HEDGE_MS (or at once
+if the current one fails / is empty) and the first non-empty answer wins,
+all inside one SEARCH_DEADLINE.  Each backend sits behind a circuit breaker,
+so a rate-limited DDG is skipped instead of costing a timeout per query.
+Every call gets its own timeout (at most what is left of the deadline); a
+call that overruns it counts as a failure, and a backend with
+SEARCH_INFLIGHT calls still running is skipped, so calls that hang past
+their timeout cannot tie up the whole worker pool.
+`search_many` runs every sub-query concurrently.
+
 Returns a list of dicts: {title, href, body}
 """
 
-from typing import List, Dict
-import urllib.parse, requests, bs4
-from ..config import SEARCH_LIMIT, DDG_SAFE
+from typing import Callable, List, Dict, Optional, Tuple
+import contextvars, importlib.util, threading, time, urllib.parse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from ..config import (SEARCH_LIMIT, DDG_SAFE, SEARCH_DEADLINE, SEARCH_HEDGE_MS, SEARCH_BACKENDS,
+                      SEARCH_INFLIGHT, DDG_HTML_URL, WIKI_API_URL, WIKI_PAGE_URL)
+from .breaker import CircuitBreaker
+from .http_cache import cached_get, cached_call
 
 # ──────────────────────────────────────────────────────────────
 # 1️⃣  Preferred: use duckduckgo-search library
-try:
-    from duckduckgo_search import DDGS          # pip install duckduckgo-search
-    _HAS_DDGS = True
-except Exception:
-    _HAS_DDGS = False
+# (imported on first use; finding the package is enough to offer the backend)
+_HAS_DDGS = importlib.util.find_spec("duckduckgo_search") is not None   # pip install duckduckgo-search
 
 
-def _lib_search(q: str, n: int) -> List[Dict]:
-    out: List[Dict] = []
-    with DDGS() as ddgs:
-        for r in ddgs.text(q, safesearch=DDG_SAFE, max_results=n):
-            out.append({k: r.get(k) for k in ("title", "href", "body")})
-    return out
+def _lib_search(q: str, n: int, timeout: float = 10) -> List[Dict]:
+    def _run() -> List[Dict]:
+        from duckduckgo_search import DDGS
+        out: List[Dict] = []
+        with DDGS(timeout=timeout) as ddgs:
+            for r in ddgs.text(q, safesearch=DDG_SAFE, max_results=n):
+                out.append({k: r.get(k) for k in ("title", "href", "body")})
+        return out
+    return cached_call(f"ddgs:text?{urllib.parse.urlencode({'q': q, 'n': n})}", "search", _run)
 
 
 # ──────────────────────────────────────────────────────────────
@@ -39,15 +55,21 @@ _UA = {
 
 
 def _clean(href: str) -> str:
-    # strip DDG redirect wrapper
+    # strip DDG redirect wrapper (//duckduckgo.com/l/?uddg=<url>&rut=…)
     if "uddg=" in href:
+        target = urllib.parse.parse_qs(urllib.parse.urlsplit(href).query).get("uddg")
+        if target:
+            return target[0]
         href = href.split("uddg=", 1)[-1]
     return urllib.parse.unquote(href)
 
 
-def _html_search(q: str, n: int) -> List[Dict]:
-    url = f"https://duckduckgo.com/html/?q={urllib.parse.quote_plus(q)}"
-    html = requests.get(url, headers=_UA, timeout=10).text
+def _html_search(q: str, n: int, timeout: float = 10) -> List[Dict]:
+    url = f"{DDG_HTML_URL}?q={urllib.parse.quote_plus(q)}"
+    resp = cached_get(url, "search", headers=_UA, timeout=timeout)
+    resp.raise_for_status()
+    html = resp.text
+    import bs4
     soup = bs4.BeautifulSoup(html, "html.parser")
 
     hits: List[Dict] = []
@@ -70,7 +92,7 @@ def _html_search(q: str, n: int) -> List[Dict]:
 
 # ──────────────────────────────────────────────────────────────
 # 3️⃣  Wikipedia API fallback (guaranteed non-empty for factual queries)
-def _wiki_search(q: str, n: int) -> List[Dict]:
+def _wiki_search(q: str, n: int, timeout: float = 10) -> List[Dict]:
     params = {
         "action": "query",
         "list": "search",
@@ -78,38 +100,128 @@ def _wiki_search(q: str, n: int) -> List[Dict]:
         "srlimit": str(n),
         "format": "json",
     }
-    j = requests.get("https://en.wikipedia.org/w/api.php", params=params, timeout=10).json()
+    resp = cached_get(WIKI_API_URL, "wiki", params=params, timeout=timeout)
+    resp.raise_for_status()
+    j = resp.json()
+    import bs4
     hits: List[Dict] = []
     for item in j.get("query", {}).get("search", []):
         title = item["title"]
         snippet = bs4.BeautifulSoup(item["snippet"], "html.parser").get_text(" ", strip=True)
-        href = "https://en.wikipedia.org/wiki/" + urllib.parse.quote(title.replace(" ", "_"))
+        href = WIKI_PAGE_URL + urllib.parse.quote(title.replace(" ", "_"))
         hits.append({"title": title, "href": href, "body": snippet})
     return hits[:n]
 
 
 # ──────────────────────────────────────────────────────────────
-def search_web(query: str, limit: int = SEARCH_LIMIT) -> List[Dict]:
-    """Return up to `limit` results via library → HTML → Wikipedia."""
-    # 1 library
-    if _HAS_DDGS:
-        try:
-            res = _lib_search(query, limit)
-            if res:
-                return res
-        except Exception:
-            pass
+# Hedged dispatch
+
+Backend = Tuple[str, Callable[..., List[Dict]]]
+
+_AVAILABLE: Dict[str, Callable[..., List[Dict]]] = {
+    **({"ddgs": _lib_search} if _HAS_DDGS else {}),
+    "ddg_html": _html_search,
+    "wikipedia": _wiki_search,
+}
+BACKENDS: List[Backend] = [(name, _AVAILABLE[name]) for name in SEARCH_BACKENDS if name in _AVAILABLE]
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_inflight: Dict[str, int] = {}                  # backend → calls still running (hung ones included)
+_lock = threading.Lock()
+_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="search")
+
+
+def _breaker(name: str) -> CircuitBreaker:
+    br = _breakers.get(name)
+    if br is None:
+        with _lock:
+            br = _breakers.get(name)
+            if br is None:
+                br = _breakers[name] = CircuitBreaker(name)
+    return br
 
-    # 2 HTML
-    try:
-        res = _html_search(query, limit)
-        if res:
-            return res
-    except Exception:
-        pass
 
-    # 3 Wikipedia
+def _reserve(name: str) -> bool:
+    with _lock:
+        if _inflight.get(name, 0) >= SEARCH_INFLIGHT:
+            return False
+        _inflight[name] = _inflight.get(name, 0) + 1
+        return True
+
+
+def _release(name: str):
+    with _lock:
+        _inflight[name] -= 1
+
+
+def backend_health() -> Dict[str, Dict]:
+    """Breaker state + call stats for every backend seen so far."""
+    return {name: {**br.health(), "inflight": _inflight.get(name, 0)} for name, br in list(_breakers.items())}
+
+
+def _call(name: str, fn, query: str, limit: int, stop_at: float) -> Optional[List[Dict]]:
+    t0 = time.monotonic()
+    timeout = max(0.5, min(10.0, stop_at - t0))
     try:
-        return _wiki_search(query, limit)
-    except Exception:
-        return []
+        res = fn(query, limit, timeout=timeout)
+    except Exception as e:                      # recorded, never raised
+        _breaker(name).record(time.monotonic() - t0, error=e)
+        return None
+    finally:
+        _release(name)
+    secs = time.monotonic() - t0
+    if secs > timeout + 1.0:                    # answered, but long after the caller gave up
+        _breaker(name).record(secs, error=TimeoutError(f"call took {secs:.1f} s (timeout {timeout:.1f} s)"))
+        return None
+    _breaker(name).record(secs, empty=not res)
+    return res
+
+
+def search_web(query: str, limit: int = SEARCH_LIMIT, backends: Optional[List[Backend]] = None,
+               deadline: float = SEARCH_DEADLINE, hedge_ms: int = SEARCH_HEDGE_MS) -> List[Dict]:
+    """Return up to `limit` results, hedging library → HTML → Wikipedia."""
+    queue = list(backends if backends is not None else BACKENDS)
+    stop_at = time.monotonic() + deadline
+    pending: Dict = {}
+
+    def launch() -> bool:
+        while queue:
+            name, fn = queue.pop(0)
+            if not _reserve(name):
+                continue                            # SEARCH_INFLIGHT earlier calls still running
+            if not _breaker(name).allow():
+                _release(name)
+                continue
+            ctx = contextvars.copy_context()        # keeps the caller's per-run cache counter
+            pending[_pool.submit(ctx.run, _call, name, fn, query, limit, stop_at)] = name
+            return True
+        return False
+
+    launch()
+    while pending or queue:
+        remaining = stop_at - time.monotonic()
+        if remaining <= 0:
+            break
+        if not pending:
+            if not launch():
+                break
+            continue
+        done, _ = wait(pending, timeout=min(hedge_ms / 1000, remaining), return_when=FIRST_COMPLETED)
+        for fut in done:
+            pending.pop(fut)
+            res = fut.result()
+            if res:
+                return res[:limit]
+        launch()                                # hedge delay passed, or a backend came back empty
+    return []
+
+
+def search_many(queries: List[str], limit: int = SEARCH_LIMIT, **kw) -> List[List[Dict]]:
+    """`search_web` for every query at once; results keep the input order."""
+    if len(queries) <= 1:
+        return [search_web(q, limit, **kw) for q in queries]
+    # more threads than the backend pool would only queue
+    with ThreadPoolExecutor(max_workers=min(len(queries), _pool._max_workers),
+                            thread_name_prefix="subquery") as pool:
+        return list(pool.map(lambda q, ctx: ctx.run(search_web, q, limit, **kw),
+                             queries, [contextvars.copy_context() for _ in queries]))
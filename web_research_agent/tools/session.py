@@ -0,0 +1,31 @@
+"""
+session.py
+----------
+One shared keep-alive `requests.Session` for every tool.
+
+Connections are pooled per host, so repeated GETs to the same site
+skip the TCP/TLS handshake.
+"""
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from ..config import FETCH_WORKERS
+
+_HEADERS = {"User-Agent": "Mozilla/5.0 (WebResearchAgent/1.0)"}
+
+_session = None
+_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=FETCH_WORKERS * 2, pool_maxsize=FETCH_WORKERS)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                s.headers.update(_HEADERS)
+                _session = s
+    return _session
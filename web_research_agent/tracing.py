@@ -0,0 +1,241 @@
+"""
+tracing.py
+==========
+
+Execution traces with timed spans.
+
+• `Trace.span("search")` – nested spans with monotonic durations and
+  free-form attributes (hits, chars, counts …)
+• `Trace.log(...)` – the original MCP-style event list, still exported
+  by `Trace.export_mcp()`
+• `JsonlSink` – one JSON line per trace, appended to TRACE_DIR/traces.jsonl
+  and rotated past TRACE_MAX_BYTES (TRACE_BACKUPS old files kept)
+• TRACE_PROFILE=cprofile|tracemalloc profiles top-level spans of a sampled
+  TRACE_SAMPLE fraction of traces
+• `stage_latency()` – p50 / p95 per span name across many traces
+"""
+
+from __future__ import annotations
+
+import cProfile, io, json, math, os, pstats, random, threading, time, tracemalloc, uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .config import TRACE_DIR, TRACE_MAX_BYTES, TRACE_BACKUPS, TRACE_PROFILE, TRACE_SAMPLE
+
+
+class Span:
+    def __init__(self, name: str, span_id: int, parent: Optional[int], attrs: Dict):
+        self.name = name
+        self.id = span_id
+        self.parent = parent
+        self.attrs = attrs
+        self.t0 = time.monotonic()
+        self.ms: Optional[float] = None
+        self._paused = 0.0
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def incr(self, key: str, n: int = 1):
+        self.attrs[key] = self.attrs.get(key, 0) + n
+
+    @contextmanager
+    def paused(self):
+        """Exclude the enclosed time (e.g. a generator `yield`) from the duration."""
+        t = time.monotonic()
+        try:
+            yield
+        finally:
+            self._paused += time.monotonic() - t
+
+    def end(self):
+        self.ms = round((time.monotonic() - self.t0 - self._paused) * 1000, 3)
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "id": self.id, "parent": self.parent, "ms": self.ms, **self.attrs}
+
+
+class Trace:
+    """Lightweight Execution trace, MCP-style events plus timed spans."""
+
+    def __init__(self, query: str, profile: str = TRACE_PROFILE, sample: float = TRACE_SAMPLE):
+        self.id = str(uuid.uuid4())
+        self.start = time.time()
+        self.query = query
+        self.events: List[Dict] = []
+        self.spans: List[Span] = []
+        self._stack: List[Span] = []
+        self._t0 = time.monotonic()
+        self.profile = profile if profile and random.random() < sample else ""
+
+    # ── MCP-style events ────────────────────────────────────────────
+    def log(self, role: str, kind: str, data: Dict):
+        self.events.append(
+            {
+                "ts": round(time.time() - self.start, 3),
+                "role": role,
+                "type": kind,
+                "data": data,
+            }
+        )
+
+    def export_mcp(self) -> Dict:
+        return {"id": self.id, "query": self.query, "events": self.events}
+
+    def save(self, path: Path):
+        path.write_text(json.dumps(self.export_mcp(), indent=2))
+
+    # ── spans ───────────────────────────────────────────────────────
+    def _open(self, name: str, attrs: Dict) -> Span:
+        parent = self._stack[-1].id if self._stack else None
+        sp = Span(name, len(self.spans), parent, attrs)
+        self.spans.append(sp)
+        return sp
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        sp = self._open(name, attrs)
+        top = not self._stack
+        self._stack.append(sp)
+        prof = _start_profile(self.profile) if top else None
+        try:
+            yield sp
+        finally:
+            if prof is not None:
+                sp.set(profile=_stop_profile(*prof))
+            self._stack.pop()
+            sp.end()
+
+    def record_span(self, name: str, ms: float, **attrs) -> Span:
+        """Add an already-measured span (e.g. timed on a worker thread) under the current one."""
+        sp = self._open(name, attrs)
+        sp.ms = round(ms, 3)
+        return sp
+
+    def stage_ms(self) -> Dict[str, float]:
+        """Duration of every top-level span."""
+        return {s.name: s.ms for s in self.spans if s.parent is None and s.ms is not None}
+
+    def record(self) -> Dict:
+        return {
+            "id": self.id,
+            "query": self.query,
+            "start": self.start,
+            "ms": round((time.monotonic() - self._t0) * 1000, 3),
+            "spans": [s.to_dict() for s in self.spans],
+            "events": self.events,
+        }
+
+
+# ── profiling hooks ────────────────────────────────────────────────
+def _start_profile(kind: str):
+    if kind == "cprofile":
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:                     # another profiler is active on this thread
+            return None
+        return kind, prof
+    if kind == "tracemalloc":
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        return kind, (started, tracemalloc.get_traced_memory()[0])
+    return None
+
+
+def _stop_profile(kind: str, state) -> Dict:
+    if kind == "cprofile":
+        state.disable()
+        buf = io.StringIO()
+        pstats.Stats(state, stream=buf).sort_stats("cumulative").print_stats(15)
+        return {"cprofile": buf.getvalue()}
+    started, base = state
+    current, peak = tracemalloc.get_traced_memory()
+    if started:
+        tracemalloc.stop()
+    return {"alloc_kb": round((current - base) / 1024, 1), "peak_kb": round((peak - base) / 1024, 1)}
+
+
+# ── JSONL sink ─────────────────────────────────────────────────────
+class JsonlSink:
+    def __init__(self, directory: str = TRACE_DIR, max_bytes: int = TRACE_MAX_BYTES,
+                 backups: int = TRACE_BACKUPS, name: str = "traces"):
+        self.dir = Path(directory)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.name = name
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self.dir / f"{self.name}.jsonl"
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            src = self.dir / f"{self.name}.{i}.jsonl"
+            if src.exists():
+                src.replace(self.dir / f"{self.name}.{i + 1}.jsonl")
+        if self.backups:
+            self.path.replace(self.dir / f"{self.name}.1.jsonl")
+        else:
+            self.path.unlink()
+
+    def write(self, record: Dict) -> Path:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            if self.path.exists() and self.path.stat().st_size + len(line) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line)
+        return self.path
+
+    def files(self) -> List[Path]:
+        """Current file plus rotated backups, oldest first."""
+        olds = [self.dir / f"{self.name}.{i}.jsonl" for i in range(self.backups, 0, -1)]
+        return [p for p in olds + [self.path] if p.exists()]
+
+
+_sink: Optional[JsonlSink] = None
+
+
+def get_sink() -> JsonlSink:
+    global _sink
+    if _sink is None:
+        _sink = JsonlSink()
+    return _sink
+
+
+# ── aggregation ────────────────────────────────────────────────────
+def load_traces(paths: Iterable[os.PathLike]) -> Iterator[Dict]:
+    for p in paths:
+        with open(p, encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def percentile(sorted_vals: List[float], q: float) -> float:
+    # nearest-rank percentile
+    k = max(0, math.ceil(q * len(sorted_vals)) - 1)
+    return sorted_vals[k]
+
+
+def stage_latency(records: Iterable[Dict]) -> Dict[str, Dict]:
+    """{span name: {count, p50_ms, p95_ms, max_ms}} plus "total" for whole traces."""
+    samples: Dict[str, List[float]] = {}
+    for rec in records:
+        samples.setdefault("total", []).append(rec["ms"])
+        for sp in rec.get("spans", ()):
+            if sp.get("ms") is not None:
+                samples.setdefault(sp["name"], []).append(sp["ms"])
+    out = {}
+    for name, vals in samples.items():
+        vals.sort()
+        out[name] = {"count": len(vals), "p50_ms": percentile(vals, 0.50),
+                     "p95_ms": percentile(vals, 0.95), "max_ms": vals[-1]}
+    return out